@@ -0,0 +1 @@
+"""Benchmarks reprodutíveis dos solucionadores sobre labirintos sintéticos"""
@@ -0,0 +1,193 @@
+from typing import Callable, Dict
+import numpy as np
+from src.maze import Maze
+from src.utils import TERRAIN_CODES, START_CODE, END_CODE, WALL_CODE
+
+FREE_CODE = TERRAIN_CODES['0']
+
+def _with_endpoints(terrain: np.ndarray, start, end) -> Maze:
+    """Marca S e E na matriz de terreno e cria o Maze sem percorrê-la de novo"""
+    terrain[start] = START_CODE
+    terrain[end] = END_CODE
+    return Maze.from_terrain(terrain, points=(start, end), write_through=True)
+
+def _staircase(rows: int, cols: int, rng: np.random.Generator):
+    """Células de uma escada sorteada de (0, 0) a (rows-1, cols-1), só descendo ou indo à direita"""
+    down = rng.permutation(np.repeat((1, 0), (rows - 1, cols - 1)))
+    return (np.concatenate(([0], np.cumsum(down))),
+            np.concatenate(([0], np.cumsum(1 - down))))
+
+def random_obstacles(rows: int, cols: int, seed: int = 0, density: float = 0.3) -> Maze:
+    """
+    Obstáculos espalhados ao acaso, com S e E em cantos opostos.
+
+    Uma escada sorteada de passos para baixo e para a direita, de S a E, é
+    mantida livre, então sempre existe solução.
+
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        density: Fração das células que viram obstáculo
+
+    Returns:
+        Maze: Labirinto gerado
+    """
+    rng = np.random.default_rng(seed)
+    terrain = np.where(rng.random((rows, cols)) < density, WALL_CODE, FREE_CODE).astype(np.uint8)
+    terrain[_staircase(rows, cols, rng)] = FREE_CODE
+    return _with_endpoints(terrain, (0, 0), (rows - 1, cols - 1))
+
+def backtracker_corridors(rows: int, cols: int, seed: int = 0) -> Maze:
+    """
+    Labirinto perfeito de corredores de uma célula (recursive backtracker).
+
+    As células do labirinto ficam nas posições ímpares e as paredes entre
+    elas são abertas por uma busca em profundidade com pilha explícita. Os
+    vizinhos de cada célula, já na ordem sorteada, são calculados de uma vez
+    com NumPy; o laço só empilha e desempilha, e as paredes abertas (entre
+    cada célula e a que a alcançou) são gravadas em uma única atribuição.
+
+    Args:
+        rows: Número de linhas (mínimo 3)
+        cols: Número de colunas (mínimo 3)
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Maze: Labirinto com S na primeira célula e E na última
+    """
+    rng = np.random.default_rng(seed)
+    height, width = (rows - 1) // 2, (cols - 1) // 2
+    n_cells = height * width
+
+    # Vizinhos (cima, baixo, esquerda, direita) de cada célula, -1 fora da grade
+    cell_rows, cell_cols = np.divmod(np.arange(n_cells), width)
+    neighbors = np.stack([
+        np.where(cell_rows > 0, np.arange(n_cells) - width, -1),
+        np.where(cell_rows < height - 1, np.arange(n_cells) + width, -1),
+        np.where(cell_cols > 0, np.arange(n_cells) - 1, -1),
+        np.where(cell_cols < width - 1, np.arange(n_cells) + 1, -1),
+    ], axis=1)
+    orders = rng.permuted(np.tile(np.arange(4), (n_cells, 1)), axis=1)
+    shuffled = memoryview(np.take_along_axis(neighbors, orders, axis=1).astype(np.int64).ravel())
+
+    parent_array = np.full(n_cells, -1, dtype=np.int64)
+    parent = memoryview(parent_array)
+    visited = bytearray(n_cells)
+    tried = bytearray(n_cells)
+    visited[0] = 1
+    stack = [0]
+    while stack:
+        cell = stack[-1]
+        k = tried[cell]
+        if k == 4:
+            stack.pop()
+            continue
+        tried[cell] = k + 1
+        neighbor = shuffled[4 * cell + k]
+        if neighbor >= 0 and not visited[neighbor]:
+            visited[neighbor] = 1
+            parent[neighbor] = cell
+            stack.append(neighbor)
+
+    terrain = np.full((rows, cols), WALL_CODE, dtype=np.uint8)
+    terrain[1:2 * height:2, 1:2 * width:2] = FREE_CODE
+    # A parede aberta fica no meio do caminho entre a célula e seu pai
+    children = np.flatnonzero(parent_array >= 0)
+    parents = parent_array[children]
+    terrain[cell_rows[children] + cell_rows[parents] + 1,
+            cell_cols[children] + cell_cols[parents] + 1] = FREE_CODE
+    return _with_endpoints(terrain, (1, 1), (2 * height - 1, 2 * width - 1))
+
+def rooms_and_doors(rows: int, cols: int, seed: int = 0, room_size: int = 8) -> Maze:
+    """
+    Salas quadradas separadas por paredes, com uma porta em cada parede.
+
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        room_size: Distância entre paredes (a sala tem room_size - 1 células)
+
+    Returns:
+        Maze: Labirinto com S e E em cantos opostos
+    """
+    rng = np.random.default_rng(seed)
+    terrain = np.full((rows, cols), FREE_CODE, dtype=np.uint8)
+    wall_rows = np.arange(room_size, rows - 1, room_size)
+    wall_cols = np.arange(room_size, cols - 1, room_size)
+    terrain[wall_rows, :] = WALL_CODE
+    terrain[:, wall_cols] = WALL_CODE
+
+    def doors(walls: np.ndarray, length: int):
+        """Posição da porta em cada trecho de parede entre duas paredes cruzadas"""
+        starts = np.concatenate(([0], np.arange(room_size + 1, length, room_size)))
+        spans = np.minimum(starts + room_size - (starts > 0), length) - starts
+        offsets = rng.integers(0, 1 << 30, size=(len(walls), len(starts))) % spans
+        return np.repeat(walls, len(starts)), (starts + offsets).ravel()
+
+    door_rows, door_cols = doors(wall_rows, cols)
+    terrain[door_rows, door_cols] = FREE_CODE
+    door_cols, door_rows = doors(wall_cols, rows)
+    terrain[door_rows, door_cols] = FREE_CODE
+    return _with_endpoints(terrain, (0, 0), (rows - 1, cols - 1))
+
+def weighted_noise(rows: int, cols: int, seed: int = 0, scale: int = 16) -> Maze:
+    """
+    Terreno de pesos variados a partir de ruído suave (value noise).
+
+    Um grid grosseiro de valores aleatórios é interpolado bilinearmente e
+    quantizado em '0'-'3', com obstáculos nos picos. Os obstáculos sobre uma
+    escada sorteada de S a E viram terreno '3', então sempre existe solução.
+
+    Args:
+        rows: Número de linhas
+        cols: Número de colunas
+        seed: Semente do gerador aleatório
+        scale: Tamanho (em células) de cada quadrado do grid grosseiro
+
+    Returns:
+        Maze: Labirinto com S e E em cantos opostos
+    """
+    rng = np.random.default_rng(seed)
+    coarse = rng.random((rows // scale + 2, cols // scale + 2))
+    y = np.arange(rows) / scale
+    x = np.arange(cols) / scale
+    y0, x0 = y.astype(np.int64), x.astype(np.int64)
+    fy, fx = (y - y0)[:, None], (x - x0)[None, :]
+    top = coarse[y0][:, x0] * (1 - fx) + coarse[y0][:, x0 + 1] * fx
+    bottom = coarse[y0 + 1][:, x0] * (1 - fx) + coarse[y0 + 1][:, x0 + 1] * fx
+    noise = top * (1 - fy) + bottom * fy
+
+    levels = np.array([TERRAIN_CODES[symbol] for symbol in '0123#'], dtype=np.uint8)
+    terrain = levels[np.digitize(noise, (0.35, 0.5, 0.62, 0.75))]
+    route = _staircase(rows, cols, rng)
+    terrain[route] = np.minimum(terrain[route], TERRAIN_CODES['3'])
+    return _with_endpoints(terrain, (0, 0), (rows - 1, cols - 1))
+
+# Famílias de labirintos disponíveis no benchmark
+GENERATORS: Dict[str, Callable[..., Maze]] = {
+    'random': random_obstacles,
+    'corridors': backtracker_corridors,
+    'rooms': rooms_and_doors,
+    'noise': weighted_noise,
+}
+
+def generate(family: str, size: int, seed: int = 0) -> Maze:
+    """
+    Gera um labirinto quadrado de uma família.
+
+    Args:
+        family: Nome em GENERATORS
+        size: Número de linhas e de colunas
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Maze: Labirinto gerado
+
+    Raises:
+        ValueError: Se a família não existir
+    """
+    if family not in GENERATORS:
+        raise ValueError(f"Família de labirinto desconhecida: '{family}'")
+    return GENERATORS[family](size, size, seed)
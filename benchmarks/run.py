@@ -0,0 +1,201 @@
+"""
+Executa os benchmarks e compara com a linha de base gravada em JSON.
+
+Uso:
+    python -m benchmarks.run                      # tamanhos 10, 64 e 256
+    python -m benchmarks.run --sizes 1024 4096    # mapas grandes
+    python -m benchmarks.run --update-baseline    # regrava a linha de base
+
+Para cada família de labirinto, tamanho e solucionador são medidos o tempo
+de parede (melhor de --repeat execuções, cada uma com um Maze novo, ou seja,
+incluindo o pré-processamento), os nós expandidos e o pico de memória
+(tracemalloc, em uma execução à parte). Tudo roda offline e com semente fixa.
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from src.maze import Maze
+from src.astar import astar
+from src.jps import jps
+from src.hpa import HierarchicalPathfinder
+from src.maze_io import save_binary_maze, load_binary_maze
+from src.stats import SearchStats
+from .generators import GENERATORS, generate
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_CACHE_DIR = os.path.join(BENCHMARK_DIR, '.cache')
+DEFAULT_SIZES = (10, 64, 256)
+
+Solver = Callable[[Maze, Optional[SearchStats]], Optional[list]]
+
+# Solucionadores medidos; todos recebem (maze, stats)
+SOLVERS: Dict[str, Solver] = {
+    'astar': lambda maze, stats: astar(maze, stats=stats),
+    'astar-bidirectional': lambda maze, stats: astar(maze, stats=stats, bidirectional=True),
+    'jps': lambda maze, stats: jps(maze, stats=stats),
+    'jps+': lambda maze, stats: jps(maze, plus=True, stats=stats),
+    'hpa': lambda maze, stats: HierarchicalPathfinder(maze).find_path(stats=stats),
+}
+
+def load_case(family: str, size: int, seed: int, cache_dir: Optional[str]) -> Maze:
+    """
+    Gera o labirinto de um caso, reaproveitando a cópia binária em cache_dir.
+
+    Os geradores são determinísticos, então o arquivo só evita refazer
+    labirintos grandes (o de corredores 4096x4096 leva alguns segundos).
+    """
+    if cache_dir is None:
+        return generate(family, size, seed)
+    path = os.path.join(cache_dir, f'{family}-{size}-{seed}.maze')
+    if os.path.exists(path):
+        return load_binary_maze(path)
+    maze = generate(family, size, seed)
+    os.makedirs(cache_dir, exist_ok=True)
+    save_binary_maze(maze, path)
+    return maze
+
+def measure(maze: Maze, solver: Solver, repeat: int) -> Dict[str, object]:
+    """
+    Mede um solucionador em um labirinto.
+
+    Returns:
+        Dict[str, object]: time (s), expansions, peak_memory (bytes) e cost
+    """
+    def fresh() -> Maze:
+        copy = Maze.from_terrain(maze.terrain.copy(), maze.cell_weights, (maze.start_pos, maze.end_pos))
+        copy.movement_weights = dict(maze.movement_weights)
+        return copy
+
+    best = math.inf
+    for _ in range(repeat):
+        instance = fresh()
+        started = time.perf_counter()
+        solver(instance, None)
+        best = min(best, time.perf_counter() - started)
+
+    instance = fresh()
+    stats = SearchStats()
+    tracemalloc.start()
+    try:
+        path = solver(instance, stats)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'time': best,
+        'expansions': stats.nodes_expanded,
+        'peak_memory': peak,
+        'cost': None if path is None else instance.path_cost(path),
+    }
+
+def run_benchmarks(families: List[str], sizes: List[int], solvers: List[str],
+                   seed: int = 0, repeat: int = 3, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                   report: Callable[[str, Dict[str, object]], None] = lambda key, result: None
+                   ) -> Dict[str, Dict[str, object]]:
+    """
+    Executa todas as combinações de família, tamanho e solucionador.
+
+    Returns:
+        Dict[str, Dict[str, object]]: Resultados por chave 'família/tamanho/solucionador'
+    """
+    results = {}
+    for family in families:
+        for size in sizes:
+            maze = load_case(family, size, seed, cache_dir)
+            for name in solvers:
+                key = f'{family}/{size}/{name}'
+                results[key] = measure(maze, SOLVERS[name], repeat)
+                report(key, results[key])
+    return results
+
+def compare(results: Dict[str, Dict[str, object]], baseline: Dict[str, Dict[str, object]],
+            time_threshold: float = 0.25, memory_threshold: float = 0.10,
+            expansion_threshold: float = 0.0, time_floor: float = 0.005) -> List[str]:
+    """
+    Compara resultados com a linha de base.
+
+    Tempo, memória e expansões podem crescer até a fração indicada; o custo
+    do caminho precisa ser o mesmo. Aumentos de tempo menores que time_floor
+    segundos são tolerados, pois casos de poucos milissegundos oscilam mais
+    que o limite relativo. Casos ausentes da linha de base são ignorados.
+
+    Returns:
+        List[str]: Uma descrição por regressão encontrada
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if (result['cost'] is None) != (base['cost'] is None) or (
+                result['cost'] is not None and not math.isclose(result['cost'], base['cost'], rel_tol=1e-9)):
+            regressions.append(f"{key}: custo {result['cost']} (linha de base {base['cost']})")
+        for field, threshold in (('time', time_threshold), ('peak_memory', memory_threshold),
+                                 ('expansions', expansion_threshold)):
+            if field == 'time' and result[field] - base[field] < time_floor:
+                continue
+            if result[field] > base[field] * (1 + threshold):
+                regressions.append(f"{key}: {field} {result[field]:.6g} "
+                                   f"(linha de base {base[field]:.6g}, limite +{threshold:.0%})")
+    return regressions
+
+def _print_result(key: str, result: Dict[str, object]):
+    cost = '-' if result['cost'] is None else f"{result['cost']:.2f}"
+    print(f"{key:<36} {result['time'] * 1000:>10.2f} ms {result['expansions']:>10} exp "
+          f"{result['peak_memory'] / 1024:>10.1f} KiB  custo {cost}", flush=True)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks dos solucionadores do PathFinder")
+    parser.add_argument('--families', nargs='+', default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--solvers', nargs='+', default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="grava os resultados na linha de base em vez de comparar")
+    parser.add_argument('--time-threshold', type=float, default=0.25)
+    parser.add_argument('--memory-threshold', type=float, default=0.10)
+    parser.add_argument('--expansion-threshold', type=float, default=0.0)
+    parser.add_argument('--time-floor', type=float, default=0.005,
+                        help="aumento de tempo (s) sempre tolerado")
+    parser.add_argument('--no-cache', action='store_true', help="não guarda os labirintos gerados")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.families, args.sizes, args.solvers, args.seed, args.repeat,
+                             None if args.no_cache else DEFAULT_CACHE_DIR, _print_result)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(dict(sorted(baseline.items())), file, indent=2)
+            file.write('\n')
+        print(f"Linha de base atualizada: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Linha de base {args.baseline} não encontrada; use --update-baseline")
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.time_threshold,
+                          args.memory_threshold, args.expansion_threshold, args.time_floor)
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}")
+    if not regressions:
+        print("Sem regressões em relação à linha de base")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
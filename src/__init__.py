@@ -1,5 +1,31 @@
 from .maze import Maze
-from .astar import astar
-from .utils import validate_maze, find_points, manhattan_distance
+from .astar import astar, astar_iter, astar_search
+from .ara import ara_star, ara_star_iter, AnytimeSolution
+from .jps import jps, JumpPointSearch
+from .batch import astar_many, solve_mazes
+from .components import ComponentIndex, label_components
+from .landmarks import Landmarks, select_landmarks, get_landmarks, save_landmarks, load_landmarks, landmarks_path
+from .contraction import (
+    ContractionHierarchy, build_contraction_hierarchy, get_contraction_hierarchy, contraction_path,
+    save_contraction_hierarchy, load_contraction_hierarchy, hierarchy_file
+)
+from .distance_field import DistanceField, DistanceFieldCache, build_distance_field, distance_field_path
+from .hpa import HierarchicalPathfinder
+from .dstar_lite import DStarLite
+from .solution_cache import SolutionCache, solution_key
+from .maze_io import load_maze, save_binary_maze, load_binary_maze, convert_text_maze
+from .stats import SearchStats, SearchCancelled, SearchBudgetExceeded, SearchResult
+from .utils import validate_maze, find_points, manhattan_distance, encode_maze
 
-__all__ = ['Maze', 'astar', 'validate_maze', 'find_points', 'manhattan_distance'] 
\ No newline at end of file
+__all__ = [
+    'Maze', 'astar', 'astar_iter', 'astar_search', 'ara_star', 'ara_star_iter', 'AnytimeSolution', 'jps', 'JumpPointSearch', 'astar_many', 'solve_mazes',
+    'ComponentIndex', 'label_components',
+    'Landmarks', 'select_landmarks', 'get_landmarks', 'save_landmarks', 'load_landmarks', 'landmarks_path',
+    'ContractionHierarchy', 'build_contraction_hierarchy', 'get_contraction_hierarchy', 'contraction_path',
+    'save_contraction_hierarchy', 'load_contraction_hierarchy', 'hierarchy_file',
+    'DistanceField', 'DistanceFieldCache', 'build_distance_field', 'distance_field_path',
+    'HierarchicalPathfinder', 'DStarLite', 'SolutionCache', 'solution_key',
+    'load_maze', 'save_binary_maze', 'load_binary_maze', 'convert_text_maze',
+    'SearchStats', 'SearchCancelled', 'SearchBudgetExceeded', 'SearchResult',
+    'validate_maze', 'find_points', 'manhattan_distance', 'encode_maze',
+]
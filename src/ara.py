@@ -0,0 +1,194 @@
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+import heapq
+import time
+import numpy as np
+from .maze import Maze
+from .astar import _check_position, _reconstruct_path
+from .heuristics import HeuristicSpec, make_heuristic
+from .stats import SearchStats, ProgressCallback, PROGRESS_INTERVAL, report_progress
+
+Position = Tuple[int, int]
+
+# Estado de cada célula em uma iteração do ARA*
+_NEW, _OPEN, _CLOSED, _INCONS = 0, 1, 2, 3
+
+class AnytimeSolution(NamedTuple):
+    """Caminho publicado por ara_star_iter ao final de cada iteração"""
+    path: List[Position]
+    cost: float
+    weight: float  # Fator de inflação usado na iteração
+    bound: float  # Limite de subotimalidade: cost <= bound * custo ótimo
+    expanded: int  # Expansões acumuladas desde o início
+    elapsed: float  # Segundos desde o início da busca
+
+def ara_star_iter(maze: Maze, heuristic: HeuristicSpec = None,
+                  start: Optional[Position] = None, goal: Optional[Position] = None,
+                  initial_weight: float = 3.0, weight_step: float = 0.5,
+                  deadline: Optional[float] = None,
+                  stats: Optional[SearchStats] = None,
+                  progress: Optional[ProgressCallback] = None) -> Iterator[AnytimeSolution]:
+    """
+    Busca anytime ARA* (Anytime Repairing A*), um caminho por iteração.
+
+    A primeira iteração é um Weighted A* com initial_weight e devolve um
+    caminho rapidamente. Cada iteração seguinte reduz a inflação em
+    weight_step e reaproveita os custos já calculados: só as células cujo
+    custo melhorou (a fronteira e a lista de inconsistentes) voltam para a
+    fila, em vez de recomeçar a busca. Cada caminho publicado traz o limite
+    de subotimalidade atual, min(inflação, custo / menor g + h da fronteira);
+    a última iteração, com inflação 1, devolve o caminho ótimo com limite 1.
+
+    Args:
+        maze: Instância da classe Maze
+        heuristic: Mesmas opções de astar (o limite vale para heurísticas
+                   consistentes, como a padrão)
+        start: Posição inicial (padrão: maze.start_pos)
+        goal: Posição final (padrão: maze.end_pos)
+        initial_weight: Inflação da primeira iteração (>= 1)
+        weight_step: Redução da inflação a cada iteração (> 0)
+        deadline: Segundos, a partir da chamada, para melhorar o caminho. O
+                  primeiro caminho é sempre concluído; depois do prazo a
+                  iteração em andamento é abandonada e nada mais é publicado
+        stats: Se informado, recebe nodes_expanded, heap_pushes e total_time
+        progress: Mesma função de progresso de astar
+
+    Yields:
+        AnytimeSolution: Caminhos de custo não crescente e limite decrescente
+                         (nada, se não houver solução)
+
+    Raises:
+        ValueError: Se os parâmetros de inflação forem inválidos
+        SearchCancelled: Se a função de progresso cancelar a busca
+    """
+    if not initial_weight >= 1:
+        raise ValueError(f"O fator de inflação deve ser >= 1, recebido {initial_weight}")
+    if not weight_step > 0:
+        raise ValueError(f"O passo de inflação deve ser > 0, recebido {weight_step}")
+    start_pos = maze.start_pos if start is None else _check_position(maze, start)
+    end_pos = maze.end_pos if goal is None else _check_position(maze, goal)
+
+    clock = time.perf_counter
+    started = clock()
+    stop_at = None if deadline is None else started + deadline
+    cols = maze.cols
+    n_cells = maze.rows * cols
+    source = start_pos[0] * cols + start_pos[1]
+    target = end_pos[0] * cols + end_pos[1]
+
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    g_array = np.full(n_cells, np.inf)
+    h_array = np.zeros(n_cells)
+    parent_array = np.full(n_cells, -1, dtype=np.int64)
+    state_array = np.zeros(n_cells, dtype=np.uint8)
+    g_cost, h_values = memoryview(g_array), memoryview(h_array)
+    parent, state = memoryview(parent_array), memoryview(state_array)
+
+    h_func = make_heuristic(maze, heuristic, end_pos)
+    h_values[source] = h_func(source)
+    g_cost[source] = 0.0
+    state[source] = _OPEN
+    weight = float(initial_weight)
+    open_set = [(weight * h_values[source], h_values[source], source)]
+    expanded = pushes = 0
+    solved = False
+
+    try:
+        if not maze.connected(start_pos, end_pos):
+            return
+
+        while True:
+            # Expande até que nenhuma célula da fila possa melhorar o objetivo
+            while open_set:
+                f, _, current = open_set[0]
+                if state[current] != _OPEN:
+                    heapq.heappop(open_set)  # Entrada obsoleta
+                    continue
+                if g_cost[target] <= f:
+                    break
+                if solved and stop_at is not None and not expanded % 64 and clock() > stop_at:
+                    return
+                heapq.heappop(open_set)
+                state[current] = _CLOSED
+                expanded += 1
+                if progress is not None and not expanded % PROGRESS_INTERVAL:
+                    report_progress(progress, expanded, len(open_set))
+                current_g = g_cost[current]
+                begin, end = indptr[current], indptr[current + 1]
+
+                for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+                    new_g = current_g + cost
+                    old_g = g_cost[neighbor]
+                    if new_g < old_g:
+                        if old_g == np.inf:
+                            h_values[neighbor] = h_func(neighbor)
+                        g_cost[neighbor] = new_g
+                        parent[neighbor] = current
+                        if state[neighbor] == _CLOSED:
+                            # Já expandida nesta iteração: fica para a próxima
+                            state[neighbor] = _INCONS
+                        elif state[neighbor] != _INCONS:
+                            state[neighbor] = _OPEN
+                            h = h_values[neighbor]
+                            heapq.heappush(open_set, (new_g + weight * h, h, neighbor))
+                            pushes += 1
+
+            if g_cost[target] == np.inf:
+                return
+
+            # Os pais podem ter melhorado depois de o objetivo ser alcançado,
+            # então o custo real do caminho pode ser menor que g do objetivo
+            path = _reconstruct_path(parent, target, cols)
+            cost = maze.path_cost(path)
+
+            # Limite: nenhum caminho custa menos que o menor g + h pendente
+            pending = np.flatnonzero((state_array == _OPEN) | (state_array == _INCONS))
+            lower = float(np.min(g_array[pending] + h_array[pending])) if pending.size else np.inf
+            if cost <= lower:
+                bound = 1.0
+            else:
+                bound = max(1.0, min(weight, cost / lower)) if lower > 0 else weight
+            solved = True
+            yield AnytimeSolution(path, cost, weight, bound, expanded, clock() - started)
+            if bound <= 1.0 or weight <= 1.0:
+                return
+            if stop_at is not None and clock() > stop_at:
+                return
+
+            # Próxima iteração: fronteira e inconsistentes com a nova inflação
+            weight = max(1.0, min(weight - weight_step, bound))
+            state_array[state_array == _CLOSED] = _NEW
+            state_array[pending] = _OPEN
+            f_values = g_array[pending] + weight * h_array[pending]
+            open_set = list(zip(f_values.tolist(), h_array[pending].tolist(), pending.tolist()))
+            heapq.heapify(open_set)
+    finally:
+        if stats is not None:
+            stats.nodes_expanded = expanded
+            stats.heap_pushes = pushes + 1
+            stats.total_time = clock() - started
+
+def ara_star(maze: Maze, heuristic: HeuristicSpec = None,
+             start: Optional[Position] = None, goal: Optional[Position] = None,
+             initial_weight: float = 3.0, weight_step: float = 0.5,
+             deadline: Optional[float] = None,
+             stats: Optional[SearchStats] = None,
+             progress: Optional[ProgressCallback] = None) -> Optional[AnytimeSolution]:
+    """
+    Executa ARA* e devolve o melhor caminho obtido dentro do prazo.
+
+    Sem deadline, executa até a iteração ótima. Os parâmetros são os de
+    ara_star_iter.
+
+    Returns:
+        Optional[AnytimeSolution]: Último caminho publicado (com o limite de
+                                   subotimalidade), ou None sem solução
+    """
+    best = None
+    for best in ara_star_iter(maze, heuristic, start, goal, initial_weight,
+                              weight_step, deadline, stats, progress):
+        pass
+    return best
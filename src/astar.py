@@ -1,97 +1,777 @@
-from typing import List, Tuple, Dict, Set, Optional
+from typing import Callable, Generator, List, NamedTuple, Tuple, Optional
+import functools
 import heapq
-from .utils import manhattan_distance
+import sys
+import time
+import numpy as np
 from .maze import Maze
+from .heuristics import CONSISTENT_HEURISTICS, DEFAULT_HEURISTIC, HeuristicSpec, make_heuristic
+from .stats import (
+    SearchStats, ProgressCallback, PROGRESS_INTERVAL, report_progress,
+    SearchBudgetExceeded, SearchResult, FOUND, NO_PATH, BUDGET_EXCEEDED
+)
+from .solution_cache import SolutionCache, solution_key
 
-class Node:
-    def __init__(self, pos: Tuple[int, int], g_cost: float, h_cost: float, parent: Optional['Node'] = None):
-        self.pos = pos
-        self.g_cost = g_cost  # Custo do caminho do início até este nó
-        self.h_cost = h_cost  # Custo estimado deste nó até o objetivo
-        self.parent = parent  # Nó pai para reconstruir o caminho
-        
-    @property
-    def f_cost(self) -> float:
-        """Custo total do nó (g_cost + h_cost)"""
-        return self.g_cost + self.h_cost
-    
-    def __lt__(self, other: 'Node') -> bool:
-        """Comparação para ordenação na fila de prioridade"""
-        if abs(self.f_cost - other.f_cost) < 1e-10:  # Comparação com tolerância para números flutuantes
-            return self.h_cost < other.h_cost  # Desempata pelo h_cost
-        return self.f_cost < other.f_cost
-
-def astar(maze: Maze) -> Optional[List[Tuple[int, int]]]:
+# Filas de prioridade aceitas por astar (parâmetro queue)
+QUEUES = ('auto', 'heap', 'buckets')
+
+# Maior número de baldes da fila de Dial; acima disso astar usa heapq
+MAX_BUCKETS = 1 << 16
+
+# Tolerância ao calcular o balde de f * escala, para que valores que
+# deveriam ser inteiros não caiam no balde anterior por arredondamento
+_BUCKET_EPS = 1e-6
+
+def _reconstruct_path(parent, goal: int, cols: int) -> List[Tuple[int, int]]:
+    """
+    Reconstrói o caminho seguindo o array de pais a partir do objetivo.
+
+    Args:
+        parent: Array (ou memoryview) com o índice do pai de cada célula (-1 na raiz)
+        goal: Índice plano da célula final
+        cols: Número de colunas do labirinto
+
+    Returns:
+        List[Tuple[int, int]]: Caminho do início até o objetivo
+    """
+    path = []
+    idx = goal
+    while idx != -1:
+        path.append(divmod(idx, cols))
+        idx = parent[idx]
+    return path[::-1]
+
+def _closest_path(maze: Maze, parent, closed, start: int,
+                  end_pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    Caminho parcial até a célula fechada mais próxima do objetivo.
+
+    A proximidade é a distância octile com os pesos de movimento, sem
+    depender da heurística da busca (que pode ser nula ou inflada).
+    """
+    cols = maze.cols
+    cells = np.flatnonzero(np.asarray(closed))
+    if not cells.size:
+        return [divmod(start, cols)]
+    dr = np.abs(cells // cols - end_pos[0])
+    dc = np.abs(cells % cols - end_pos[1])
+    distance = (maze.movement_weights['orthogonal'] * np.abs(dr - dc)
+                + maze.movement_weights['diagonal'] * np.minimum(dr, dc))
+    return _reconstruct_path(parent, int(cells[np.argmin(distance)]), cols)
+
+def _closest_reachable_path(maze: Maze, start_pos: Tuple[int, int],
+                            end_pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    Caminho parcial quando o objetivo está em outro componente.
+
+    Escolhe a célula do componente do início mais próxima do objetivo (pelo
+    mesmo critério de _closest_path) e busca o caminho até ela.
+    """
+    cells = maze.get_components().cells(start_pos)
+    if not cells.size:
+        return [start_pos]
+    dr = np.abs(cells // maze.cols - end_pos[0])
+    dc = np.abs(cells % maze.cols - end_pos[1])
+    distance = (maze.movement_weights['orthogonal'] * np.abs(dr - dc)
+                + maze.movement_weights['diagonal'] * np.minimum(dr, dc))
+    closest = divmod(int(cells[np.argmin(distance)]), maze.cols)
+    return astar(maze, start=start_pos, goal=closest)
+
+def _bucket_layout(maze: Maze, heuristic: HeuristicSpec,
+                   weight: float) -> Optional[Tuple[int, int]]:
+    """
+    Escala e número de baldes da fila de Dial, ou None se ela não se aplica.
+
+    A fila exige custos de aresta inteiros depois de multiplicados por um
+    fator (Maze.integer_cost_scale), heurística consistente e nenhuma
+    inflação. Como f nunca diminui ao longo de uma aresta e cresce no máximo
+    duas vezes o maior custo, as entradas da fila cabem em um anel de
+    2 * maior custo * escala baldes.
+    """
+    if weight != 1 or callable(heuristic):
+        return None
+    if (DEFAULT_HEURISTIC if heuristic is None else heuristic) not in CONSISTENT_HEURISTICS:
+        return None
+    scale = maze.integer_cost_scale()
+    if scale is None:
+        return None
+    max_weight = max((value for value in maze.cell_weights.values() if value < np.inf), default=0.0)
+    max_cost = max(maze.movement_weights.values()) * max_weight
+    span = int(2 * max_cost * scale) + 2
+    return (scale, span) if span <= MAX_BUCKETS else None
+
+def _select_queue(maze: Maze, heuristic: HeuristicSpec, weight: float,
+                  queue: str) -> Optional[Tuple[int, int]]:
+    """
+    Escolhe a fila de astar: o layout de _bucket_layout, ou None para heapq.
+
+    Raises:
+        ValueError: Se queue for desconhecida ou 'buckets' não puder ser usada
+    """
+    if queue not in QUEUES:
+        raise ValueError(f"Fila desconhecida '{queue}'. Opções: {', '.join(QUEUES)}")
+    if queue == 'heap':
+        return None
+    layout = _bucket_layout(maze, heuristic, weight)
+    if layout is None and queue == 'buckets':
+        raise ValueError("A fila de baldes exige custos inteiros em alguma escala, "
+                         "heurística consistente e weight igual a 1")
+    return layout
+
+class _BucketQueue:
+    """
+    Fila de baldes de Dial com entradas (f, h, índice), usada por _astar_steps.
+
+    Retira as células na mesma ordem que o laço de _astar_buckets, para que
+    a busca instrumentada encontre os mesmos caminhos.
+    """
+
+    def __init__(self, scale: int, span: int, f_start: float):
+        self.scale, self.span = scale, span
+        self.buckets = [[] for _ in range(span)]
+        self.base = int(f_start * scale + _BUCKET_EPS)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, entry: Tuple[float, float, int]):
+        key = int(entry[0] * self.scale + _BUCKET_EPS)
+        self.buckets[(key if key > self.base else self.base) % self.span].append(entry)
+        self.size += 1
+
+    def pop(self) -> Tuple[float, float, int]:
+        bucket = self.buckets[self.base % self.span]
+        while not bucket:
+            self.base += 1
+            bucket = self.buckets[self.base % self.span]
+        self.size -= 1
+        return bucket.pop()
+
+def _astar_buckets(maze: Maze, h_func: Callable[[int], float], start: int, goal: int,
+                   scale: int, span: int,
+                   progress: Optional[ProgressCallback]) -> Optional[List[Tuple[int, int]]]:
+    """
+    Laço de astar com a fila de baldes de Dial no lugar do heap.
+
+    A fila é um anel de listas indexado por floor(f * scale): inserir é um
+    append e retirar é um pop do balde atual, em O(1) em vez de O(log n).
+    Dentro de um balde a ordem é LIFO, mas o resultado continua ótimo: com
+    todos os custos múltiplos de 1/scale, uma célula com g acima do ótimo
+    tem f pelo menos 1/scale acima do de um antecessor ótimo ainda na
+    fronteira e fica em um balde posterior. Com heurística consistente, toda
+    célula retirada já tem o custo ótimo e nenhuma é reaberta.
+    """
+    cols = maze.cols
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    g_cost, parent, closed = _search_arrays(maze.rows * cols)
+    buckets = [[] for _ in range(span)]
+    base = int(h_func(start) * scale + _BUCKET_EPS)  # Balde (absoluto) sendo esvaziado
+    bucket = buckets[base % span]
+    bucket.append(start)
+    g_cost[start] = 0.0
+    size = 1  # Entradas na fila, incluindo as obsoletas
+    expanded = 0
+
+    while size:
+        while not bucket:
+            base += 1
+            bucket = buckets[base % span]
+        current = bucket.pop()
+        size -= 1
+
+        # Entrada obsoleta: a célula já foi expandida com um custo melhor
+        if closed[current]:
+            continue
+
+        if current == goal:
+            return _reconstruct_path(parent, goal, cols)
+
+        closed[current] = True
+        expanded += 1
+        if progress is not None and not expanded % PROGRESS_INTERVAL:
+            report_progress(progress, expanded, size)
+        current_g = g_cost[current]
+        begin, end = indptr[current], indptr[current + 1]
+
+        for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+            new_g = current_g + cost
+            if new_g < g_cost[neighbor] and not closed[neighbor]:
+                g_cost[neighbor] = new_g
+                parent[neighbor] = current
+                key = int((new_g + h_func(neighbor)) * scale + _BUCKET_EPS)
+                # Por segurança contra arredondamento, nunca antes do balde atual
+                buckets[(key if key > base else base) % span].append(neighbor)
+                size += 1
+
+    return None
+
+def _search_arrays(n_cells: int):
+    """
+    Aloca o estado de uma busca: g_cost, pai e fechados.
+
+    As memoryviews devolvem escalares Python e evitam criar escalares NumPy a
+    cada acesso dentro do laço principal.
+    """
+    g_cost = np.full(n_cells, np.inf)
+    parent = np.full(n_cells, -1, dtype=np.int64)
+    closed = np.zeros(n_cells, dtype=np.bool_)
+    return memoryview(g_cost), memoryview(parent), memoryview(closed)
+
+class Expansion(NamedTuple):
+    """Evento de astar_iter: uma célula retirada da fila e expandida"""
+    pos: Tuple[int, int]
+    g_cost: float
+    f_cost: float
+    open_size: int  # Entradas na fila depois de inserir os vizinhos
+    expanded: int  # Expansões até aqui, incluindo esta
+
+class SearchRun:
+    """
+    Busca A* passo a passo, devolvida por astar_iter.
+
+    Iterar produz um evento Expansion por célula expandida. Quando a
+    iteração termina, path guarda o caminho (ou None) e stats os contadores;
+    se a iteração for interrompida com close(), stats reflete o que foi feito.
+    """
+
+    def __init__(self, steps: Generator[Expansion, None, tuple], stats: SearchStats):
+        self._steps = steps
+        self.stats = stats
+        self.path: Optional[List[Tuple[int, int]]] = None
+        self.done = False
+        self._closest = None
+
+    def __iter__(self) -> 'SearchRun':
+        return self
+
+    def __next__(self) -> Expansion:
+        try:
+            return next(self._steps)
+        except StopIteration as stop:
+            self.path, self._closest = stop.value
+            self.done = True
+            raise StopIteration
+
+    def run(self) -> Optional[List[Tuple[int, int]]]:
+        """Executa o restante da busca e devolve o caminho"""
+        for _ in self:
+            pass
+        return self.path
+
+    def close(self):
+        """Interrompe a busca, preenchendo stats com o que foi feito"""
+        self._steps.close()
+
+    def partial_path(self) -> Optional[List[Tuple[int, int]]]:
+        """
+        Caminho do início até a célula expandida mais próxima do objetivo.
+
+        Disponível quando a busca termina (None antes disso); se há solução,
+        é o próprio caminho.
+        """
+        if self.path is not None or self._closest is None:
+            return self.path
+        return self._closest()
+
+def astar_iter(maze: Maze, heuristic: HeuristicSpec = None,
+               start: Optional[Tuple[int, int]] = None,
+               goal: Optional[Tuple[int, int]] = None,
+               stats: Optional[SearchStats] = None,
+               progress: Optional[ProgressCallback] = None,
+               weight: float = 1.0,
+               max_expansions: Optional[int] = None,
+               deadline: Optional[float] = None,
+               queue: str = 'auto') -> SearchRun:
+    """
+    A* passo a passo e instrumentado: os mesmos caminhos de astar.
+
+    Além de nodes_expanded, preenche os contadores detalhados de
+    SearchStats (inserções, entradas obsoletas, reaberturas, pico da fila,
+    memória estimada e tempo em vizinhos versus avaliação de custos).
+
+    Args:
+        maze: Instância da classe Maze
+        heuristic: Mesmas opções de astar
+        start: Posição inicial (padrão: maze.start_pos)
+        goal: Posição final (padrão: maze.end_pos)
+        stats: Instância a preencher (padrão: uma nova, em SearchRun.stats)
+        progress: Mesma função de progresso de astar
+        weight: Fator de inflação da heurística, como em astar
+        max_expansions: Limite de expansões, como em astar
+        deadline: Prazo em segundos, contado a partir desta chamada
+        queue: Fila de prioridade, como em astar
+
+    Returns:
+        SearchRun: Iterador de eventos Expansion, com path e stats ao final
+
+    Raises:
+        ValueError: Se queue for inválida (ver astar)
+        SearchBudgetExceeded: Durante a iteração, se um limite for atingido
+    """
+    start_pos = maze.start_pos if start is None else _check_position(maze, start)
+    end_pos = maze.end_pos if goal is None else _check_position(maze, goal)
+    stats = SearchStats() if stats is None else stats
+    layout = _select_queue(maze, heuristic, weight, queue)
+    steps = _astar_steps(maze, heuristic, start_pos, end_pos, stats, progress, weight,
+                         max_expansions, _stop_time(deadline), layout)
+    return SearchRun(steps, stats)
+
+def _stop_time(deadline: Optional[float]) -> Optional[float]:
+    """Instante (time.perf_counter) em que um prazo relativo termina"""
+    return None if deadline is None else time.perf_counter() + deadline
+
+def _astar_steps(maze: Maze, heuristic: HeuristicSpec, start_pos: Tuple[int, int],
+                 end_pos: Tuple[int, int], stats: SearchStats,
+                 progress: Optional[ProgressCallback], weight: float = 1.0,
+                 max_expansions: Optional[int] = None, stop_at: Optional[float] = None,
+                 layout: Optional[Tuple[int, int]] = None
+                 ) -> Generator[Expansion, None, tuple]:
+    """
+    Laço de astar com contadores, eventos e limites.
+
+    Com layout (escala, baldes), usa _BucketQueue no lugar do heap. O valor
+    de retorno é (caminho, função que calcula o caminho parcial).
+    Fica separado do laço de astar para que buscas sem stats nem limites
+    não paguem pelos contadores nem pelas medições de tempo.
+    """
+    clock = time.perf_counter
+    started = clock()
+    cols = maze.cols
+    n_cells = maze.rows * cols
+    start = start_pos[0] * cols + start_pos[1]
+    goal = end_pos[0] * cols + end_pos[1]
+
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    g_cost, parent, closed = _search_arrays(n_cells)
+
+    h_func = _inflate(make_heuristic(maze, heuristic, end_pos), weight)
+    reopen = weight == 1  # Weighted A* não reabre células fechadas
+    h_start = h_func(start)
+    g_cost[start] = 0.0
+    if layout is None:
+        open_set = [(h_start, h_start, start)]
+        push = functools.partial(heapq.heappush, open_set)
+        pop = functools.partial(heapq.heappop, open_set)
+    else:
+        open_set = _BucketQueue(*layout, h_start)
+        push, pop = open_set.push, open_set.pop
+        push((h_start, h_start, start))
+        reopen = False  # Com os baldes, células fechadas já têm o custo ótimo
+    expanded = stale = reopened = 0
+    pushes = peak = 1  # A entrada do início
+    neighbor_time = cost_time = 0.0
+    path = None
+
+    try:
+        if not maze.connected(start_pos, end_pos):
+            return None, lambda: _closest_reachable_path(maze, start_pos, end_pos)
+
+        while open_set:
+            f, _, current = pop()
+
+            if closed[current]:
+                stale += 1
+                continue
+
+            if current == goal:
+                path = _reconstruct_path(parent, goal, cols)
+                break
+
+            before_neighbors = clock()
+            if expanded == max_expansions or (stop_at is not None and before_neighbors > stop_at):
+                reason = 'max_expansions' if expanded == max_expansions else 'deadline'
+                raise SearchBudgetExceeded(
+                    f"Limite da busca atingido ({reason}) após {expanded} expansões", reason,
+                    _closest_path(maze, parent, closed, start, end_pos), stats
+                )
+
+            closed[current] = True
+            expanded += 1
+            if progress is not None and not expanded % PROGRESS_INTERVAL:
+                report_progress(progress, expanded, len(open_set))
+            current_g = g_cost[current]
+
+            begin, end = indptr[current], indptr[current + 1]
+            edges = zip(indices[begin:end], edge_costs[begin:end])
+            before_costs = clock()
+            for neighbor, cost in edges:
+                new_g = current_g + cost
+
+                if new_g < g_cost[neighbor]:
+                    if closed[neighbor]:
+                        if not reopen:
+                            continue
+                        reopened += 1
+                        closed[neighbor] = False
+                    g_cost[neighbor] = new_g
+                    parent[neighbor] = current
+                    h = h_func(neighbor)
+                    push((new_g + h, h, neighbor))
+                    pushes += 1
+            after_costs = clock()
+            neighbor_time += before_costs - before_neighbors
+            cost_time += after_costs - before_costs
+
+            if len(open_set) > peak:
+                peak = len(open_set)
+            yield Expansion(divmod(current, cols), current_g, f, len(open_set), expanded)
+    finally:
+        # Cada entrada da fila: ponteiro na lista, tupla, dois floats e um int
+        entry = sys.getsizeof((0.0, 0.0, 0)) + 2 * sys.getsizeof(0.0) + sys.getsizeof(n_cells) + 8
+        stats.nodes_expanded = expanded
+        stats.heap_pushes = pushes
+        stats.stale_pops = stale
+        stats.reopenings = reopened
+        stats.peak_open_size = peak
+        stats.peak_memory = n_cells * (8 + 8 + 1) + peak * entry
+        stats.neighbor_time = neighbor_time
+        stats.cost_time = cost_time
+        stats.total_time = clock() - started
+
+    return path, lambda: _closest_path(maze, parent, closed, start, end_pos)
+
+def _check_position(maze: Maze, pos: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Valida uma posição de consulta.
+
+    Raises:
+        ValueError: Se a posição estiver fora do labirinto
+    """
+    row, col = pos
+    if not (0 <= row < maze.rows and 0 <= col < maze.cols):
+        raise ValueError(f"Posição ({row}, {col}) fora do labirinto {maze.rows}x{maze.cols}")
+    return int(row), int(col)
+
+def _inflate(h_func: Callable[[int], float], weight: float) -> Callable[[int], float]:
+    """
+    Multiplica a heurística pelo fator de inflação de Weighted A*.
+
+    Raises:
+        ValueError: Se weight for menor que 1
+    """
+    if not weight >= 1:
+        raise ValueError(f"O fator de inflação deve ser >= 1, recebido {weight}")
+    if weight == 1:
+        return h_func
+    return lambda idx: weight * h_func(idx)
+
+def astar(maze: Maze, heuristic: HeuristicSpec = None,
+          stats: Optional[SearchStats] = None,
+          bidirectional: bool = False,
+          start: Optional[Tuple[int, int]] = None,
+          goal: Optional[Tuple[int, int]] = None,
+          cache: Optional[SolutionCache] = None,
+          progress: Optional[ProgressCallback] = None,
+          weight: float = 1.0,
+          max_expansions: Optional[int] = None,
+          deadline: Optional[float] = None,
+          queue: str = 'auto') -> Optional[List[Tuple[int, int]]]:
     """
     Implementa o algoritmo A* para encontrar o menor caminho no labirinto.
-    
+
+    As células são identificadas por índices planos (linha * colunas + coluna)
+    e o estado da busca vive em arrays NumPy pré-alocados (g_cost, pai e
+    fechados). A fila de prioridade guarda apenas tuplas (f, h, índice); quando
+    um custo melhor é encontrado uma nova entrada é inserida e as antigas são
+    descartadas ao serem retiradas (remoção preguiçosa), sem alterar objetos
+    que já estão no heap.
+
+    Empates de f são desfeitos pelo menor h e depois pelo menor índice, com f
+    comparado exatamente; com heurísticas inconsistentes, uma célula fechada
+    é reaberta se um caminho melhor até ela aparecer. Por isso, quando há
+    vários caminhos de custo mínimo, o devolvido pode ser outro que o da
+    antiga fila de objetos Node (que comparava f com tolerância de 1e-10 e
+    nunca reabria células), sempre com o mesmo custo.
+
     Args:
         maze: Instância da classe Maze representando o labirinto
-        
+        heuristic: Heurística a usar: nome ('manhattan', 'octile', 'euclidean',
+                   'zero'/'dijkstra'), função (posição, objetivo) -> float ou
+                   None para a octile escalada pelo menor peso de célula, a mais
+                   justa que continua admissível com movimentos diagonais
+        stats: Se informado, recebe os contadores da busca (no A*
+               unidirecional, também os detalhados de astar_iter)
+        bidirectional: Se True, busca simultaneamente a partir do início e do
+                       fim (ver _bidirectional_astar)
+        start: Posição inicial (padrão: maze.start_pos)
+        goal: Posição final (padrão: maze.end_pos)
+        cache: Se informado, a consulta é procurada no cache de soluções e o
+               resultado é guardado nele (em acertos nada é expandido e stats
+               não é alterado); heurísticas definidas por função não usam o cache
+        progress: Função chamada a cada PROGRESS_INTERVAL expansões com
+                  (expandidos, tamanho da fronteira); devolver False cancela
+        weight: Fator de inflação da heurística (Weighted A*): a fila é
+                ordenada por g + weight * h e células fechadas não são
+                reabertas. Com heurística consistente (como a padrão), o
+                custo do caminho é no máximo weight vezes o ótimo, em troca
+                de bem menos expansões; 1 é o A* ótimo
+        max_expansions: Número máximo de células expandidas
+        deadline: Prazo em segundos (tempo de parede) para a busca. Com um
+                  dos limites, a busca usa o laço instrumentado; ver também
+                  astar_search, que devolve um SearchResult em vez de lançar
+        queue: Fila de prioridade: 'heap' (heapq), 'buckets' (baldes de
+               Dial, ver _astar_buckets) ou 'auto', que usa os baldes quando
+               os custos de aresta são inteiros em alguma escala, a
+               heurística é consistente e weight é 1 (o caso dos pesos
+               padrão) e heapq nos demais. Os caminhos têm o mesmo custo,
+               mas empates podem ser desfeitos de outra forma; a busca
+               bidirecional usa sempre heapq
+
     Returns:
         Optional[List[Tuple[int, int]]]: Lista de posições representando o caminho,
                                         ou None se não houver solução
+
+    Raises:
+        SearchCancelled: Se a função de progresso cancelar a busca
+        SearchBudgetExceeded: Se max_expansions ou deadline for atingido (traz
+                              o caminho parcial e os contadores até ali)
+        ValueError: Se weight for menor que 1, se houver limites na busca
+                    bidirecional, ou se queue for desconhecida ou 'buckets'
+                    não puder ser usada
     """
-    # Inicializa as estruturas de dados
-    open_set: List[Node] = []  # Fila de prioridade para nós a serem explorados
-    closed_set: Set[Tuple[int, int]] = set()  # Conjunto de nós já explorados
-    node_dict: Dict[Tuple[int, int], Node] = {}  # Dicionário para acessar nós por posição
-    
-    # Cria o nó inicial
-    start_node = Node(
-        pos=maze.start_pos,
-        g_cost=0.0,
-        h_cost=manhattan_distance(maze.start_pos, maze.end_pos)
-    )
-    
-    # Adiciona o nó inicial à fila de prioridade
-    heapq.heappush(open_set, start_node)
-    node_dict[maze.start_pos] = start_node
-    
+    start_pos = maze.start_pos if start is None else _check_position(maze, start)
+    end_pos = maze.end_pos if goal is None else _check_position(maze, goal)
+
+    if cache is not None:
+        key = solution_key(maze, start_pos, end_pos, heuristic, bidirectional, weight)
+        return cache.get_or_solve(
+            key, lambda: astar(maze, heuristic, stats, bidirectional, start_pos, end_pos,
+                               progress=progress, weight=weight,
+                               max_expansions=max_expansions, deadline=deadline,
+                               queue=queue)
+        )
+
+    budget = max_expansions is not None or deadline is not None
+    if bidirectional:
+        if budget:
+            raise ValueError("max_expansions e deadline só valem para o A* unidirecional")
+        if queue == 'buckets':
+            raise ValueError("A busca bidirecional usa sempre heapq")
+        return _bidirectional_astar(maze, heuristic, stats, start_pos, end_pos, progress, weight)
+
+    layout = _select_queue(maze, heuristic, weight, queue)
+    if stats is not None or budget:
+        stats = SearchStats() if stats is None else stats
+        steps = _astar_steps(maze, heuristic, start_pos, end_pos, stats, progress, weight,
+                             max_expansions, _stop_time(deadline), layout)
+        return SearchRun(steps, stats).run()
+
+    cols = maze.cols
+    n_cells = maze.rows * cols
+    start = start_pos[0] * cols + start_pos[1]
+    goal = end_pos[0] * cols + end_pos[1]
+
+    # Vizinhos e custos pré-calculados: o laço faz apenas leituras de arrays
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    h_func = _inflate(make_heuristic(maze, heuristic, end_pos), weight)
+    reopen = weight == 1  # Weighted A* não reabre células fechadas
+
+    # Início e fim em componentes diferentes: nenhuma busca é necessária
+    if not maze.connected(start_pos, end_pos):
+        return None
+
+    if layout is not None:
+        return _astar_buckets(maze, h_func, start, goal, *layout, progress)
+
+    g_cost, parent, closed = _search_arrays(n_cells)
+    h_start = h_func(start)
+    g_cost[start] = 0.0
+    open_set = [(h_start, h_start, start)]  # Entradas (f, h, índice)
+    expanded = 0
+    path = None
+
     while open_set:
-        # Pega o nó com menor f_cost
-        current = heapq.heappop(open_set)
-        
-        # Se chegou ao objetivo, reconstrói e retorna o caminho
-        if current.pos == maze.end_pos:
-            path = []
-            while current:
-                path.append(current.pos)
-                current = current.parent
-            return path[::-1]  # Inverte para começar do início
-        
-        # Marca o nó atual como explorado
-        closed_set.add(current.pos)
-        
-        # Explora os vizinhos
-        for neighbor_pos in maze.get_neighbors(current.pos):
-            # Se o vizinho já foi explorado, pula
-            if neighbor_pos in closed_set:
-                continue
-            
-            # Calcula o novo g_cost
-            new_g_cost = current.g_cost + maze.get_cost(current.pos, neighbor_pos)
-            
-            # Se o vizinho já foi visitado
-            if neighbor_pos in node_dict:
-                neighbor_node = node_dict[neighbor_pos]
-                # Se o novo caminho é melhor, atualiza
-                if new_g_cost < neighbor_node.g_cost:
-                    neighbor_node.g_cost = new_g_cost
-                    neighbor_node.parent = current
-                    # Reinsere na fila de prioridade
-                    heapq.heappush(open_set, neighbor_node)
-            else:
-                # Cria um novo nó para o vizinho
-                neighbor_node = Node(
-                    pos=neighbor_pos,
-                    g_cost=new_g_cost,
-                    h_cost=manhattan_distance(neighbor_pos, maze.end_pos),
-                    parent=current
-                )
-                # Adiciona ao dicionário e à fila de prioridade
-                node_dict[neighbor_pos] = neighbor_node
-                heapq.heappush(open_set, neighbor_node)
-    
-    # Se chegou aqui, não há solução
-    return None 
\ No newline at end of file
+        _, _, current = heapq.heappop(open_set)
+
+        # Entrada obsoleta: a célula já foi expandida com um custo melhor
+        if closed[current]:
+            continue
+
+        # Se chegou ao objetivo, reconstrói o caminho
+        if current == goal:
+            path = _reconstruct_path(parent, goal, cols)
+            break
+
+        closed[current] = True
+        expanded += 1
+        if progress is not None and not expanded % PROGRESS_INTERVAL:
+            report_progress(progress, expanded, len(open_set))
+        current_g = g_cost[current]
+        begin, end = indptr[current], indptr[current + 1]
+
+        for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+            new_g = current_g + cost
+
+            if new_g < g_cost[neighbor]:
+                # Caminho melhor: uma célula já fechada é reaberta (só ocorre
+                # com heurísticas inconsistentes ou infladas)
+                if closed[neighbor]:
+                    if not reopen:
+                        continue
+                    closed[neighbor] = False
+                g_cost[neighbor] = new_g
+                parent[neighbor] = current
+                h = h_func(neighbor)
+                heapq.heappush(open_set, (new_g + h, h, neighbor))
+
+    # path continua None se não há solução
+    return path
+
+def astar_search(maze: Maze, heuristic: HeuristicSpec = None,
+                 start: Optional[Tuple[int, int]] = None,
+                 goal: Optional[Tuple[int, int]] = None,
+                 max_expansions: Optional[int] = None,
+                 deadline: Optional[float] = None,
+                 weight: float = 1.0,
+                 progress: Optional[ProgressCallback] = None) -> SearchResult:
+    """
+    A* com limites de expansões e de tempo, com resultado estruturado.
+
+    Nunca lança por causa dos limites: a situação fica em status e o
+    caminho parcial (do início até a célula expandida mais próxima do
+    objetivo) permite, por exemplo, começar a andar antes do caminho
+    completo ou responder dentro de um prazo.
+
+    Args:
+        maze: Instância da classe Maze
+        heuristic: Mesmas opções de astar
+        start: Posição inicial (padrão: maze.start_pos)
+        goal: Posição final (padrão: maze.end_pos)
+        max_expansions: Número máximo de células expandidas (None: sem limite)
+        deadline: Prazo em segundos (None: sem limite)
+        weight: Fator de inflação da heurística, como em astar
+        progress: Mesma função de progresso de astar
+
+    Returns:
+        SearchResult: status FOUND (path), NO_PATH ou BUDGET_EXCEEDED
+                      (partial_path e reason), sempre com os contadores
+
+    Raises:
+        SearchCancelled: Se a função de progresso cancelar a busca
+    """
+    stats = SearchStats()
+    run = astar_iter(maze, heuristic, start, goal, stats, progress, weight, max_expansions, deadline)
+    try:
+        path = run.run()
+    except SearchBudgetExceeded as exceeded:
+        return SearchResult(BUDGET_EXCEEDED, partial_path=exceeded.partial_path,
+                            stats=stats, reason=exceeded.reason)
+    if path is None:
+        return SearchResult(NO_PATH, partial_path=run.partial_path(), stats=stats)
+    return SearchResult(FOUND, path=path, stats=stats)
+
+def _bidirectional_astar(maze: Maze, heuristic: HeuristicSpec, stats: Optional[SearchStats],
+                         start_pos: Tuple[int, int],
+                         end_pos: Tuple[int, int],
+                         progress: Optional[ProgressCallback] = None,
+                         weight: float = 1.0) -> Optional[List[Tuple[int, int]]]:
+    """
+    A* bidirecional: uma busca parte de start_pos e outra de end_pos.
+
+    Como get_cost usa a média dos pesos das duas células, o custo de uma
+    aresta é o mesmo nos dois sentidos e a busca reversa pode usar a mesma
+    tabela de adjacência. A cada passo expande-se o lado com a menor fronteira.
+    Sempre que uma aresta liga uma célula alcançada por um lado a uma
+    alcançada pelo outro, o custo do caminho completo atualiza o melhor
+    encontro (mu). A busca termina quando mu <= max(menor f da frente,
+    menor f de trás): com heurística consistente, cada um desses valores é
+    um limite inferior para qualquer caminho ainda não encontrado, então mu
+    é ótimo. Com weight > 1 os valores de f ficam no máximo weight vezes o
+    custo ótimo, e o mesmo critério limita mu a weight vezes o ótimo.
+    """
+    if start_pos == end_pos and maze.is_valid_position(start_pos):
+        return [start_pos]
+
+    cols = maze.cols
+    n_cells = maze.rows * cols
+    start = start_pos[0] * cols + start_pos[1]
+    goal = end_pos[0] * cols + end_pos[1]
+
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    # Índice 0: busca a partir do início; índice 1: busca a partir do fim
+    g_costs, parents, closeds = zip(_search_arrays(n_cells), _search_arrays(n_cells))
+    h_funcs = (_inflate(make_heuristic(maze, heuristic, end_pos), weight),
+               _inflate(make_heuristic(maze, heuristic, start_pos), weight))
+    if not maze.connected(start_pos, end_pos):
+        if stats is not None:
+            stats.nodes_expanded = stats.nodes_expanded_forward = stats.nodes_expanded_backward = 0
+        return None
+    open_sets = ([], [])
+    expanded = [0, 0]
+    for side, root in ((0, start), (1, goal)):
+        g_costs[side][root] = 0.0
+        h_root = h_funcs[side](root)
+        open_sets[side].append((h_root, h_root, root))
+
+    best_cost = float('inf')  # mu: custo do melhor caminho completo conhecido
+    meeting = None  # Aresta (célula do lado do início, célula do lado do fim)
+
+    while True:
+        # Descarta entradas obsoletas do topo para enxergar o menor f real
+        for side in (0, 1):
+            open_set, closed = open_sets[side], closeds[side]
+            while open_set and closed[open_set[0][2]]:
+                heapq.heappop(open_set)
+        if not open_sets[0] or not open_sets[1]:
+            break
+        if best_cost <= max(open_sets[0][0][0], open_sets[1][0][0]):
+            break
+
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set, closed = open_sets[side], closeds[side]
+        g_cost, parent, h_func = g_costs[side], parents[side], h_funcs[side]
+        other_g = g_costs[1 - side]
+
+        _, _, current = heapq.heappop(open_set)
+        closed[current] = True
+        expanded[side] += 1
+        if progress is not None and not (expanded[0] + expanded[1]) % PROGRESS_INTERVAL:
+            report_progress(progress, expanded[0] + expanded[1],
+                            len(open_sets[0]) + len(open_sets[1]))
+        current_g = g_cost[current]
+        begin, end = indptr[current], indptr[current + 1]
+
+        for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+            new_g = current_g + cost
+
+            if new_g < g_cost[neighbor]:
+                g_cost[neighbor] = new_g
+                parent[neighbor] = current
+                closed[neighbor] = False
+                h = h_func(neighbor)
+                heapq.heappush(open_set, (new_g + h, h, neighbor))
+
+            # Encontro das duas buscas através desta aresta
+            total = current_g + cost + other_g[neighbor]
+            if total < best_cost:
+                best_cost = total
+                meeting = (current, neighbor) if side == 0 else (neighbor, current)
+
+    if stats is not None:
+        stats.nodes_expanded = expanded[0] + expanded[1]
+        stats.nodes_expanded_forward = expanded[0]
+        stats.nodes_expanded_backward = expanded[1]
+
+    if meeting is None:
+        return None
+    forward_end, backward_end = meeting
+    forward_path = _reconstruct_path(parents[0], forward_end, cols)
+    backward_path = _reconstruct_path(parents[1], backward_end, cols)
+    return forward_path + backward_path[::-1]
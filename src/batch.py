@@ -0,0 +1,278 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory, util
+import heapq
+import numpy as np
+from .maze import Maze
+from .astar import astar, astar_search, _check_position, _reconstruct_path, _search_arrays
+from .heuristics import HeuristicSpec
+from .solution_cache import MISSING, SolutionCache, solution_key
+from .stats import SearchResult
+
+Position = Tuple[int, int]
+Path = Optional[List[Position]]
+
+# Lotes por processo em solve_mazes: mais lotes equilibram melhor a carga,
+# menos lotes reduzem a troca de mensagens com o pool
+CHUNKS_PER_PROCESS = 4
+
+# Labirinto e heurística de cada processo do pool (ver _init_worker)
+_worker_maze: Optional[Maze] = None
+_worker_heuristic: HeuristicSpec = None
+
+# Bloco de memória compartilhada e limites de busca de cada processo do
+# pool de solve_mazes (ver _init_shared_worker)
+_shared_block: Optional[shared_memory.SharedMemory] = None
+_worker_limits: Tuple[Optional[int], Optional[float]] = (None, None)
+
+class _SharedMaze(NamedTuple):
+    """Labirinto cujo terreno está no bloco de memória compartilhada"""
+    offset: int
+    shape: Tuple[int, int]
+    points: Tuple[Position, Position]
+    cell_weights: Dict[str, float]
+    movement_weights: Dict[str, float]
+
+def _init_worker(terrain, cell_weights, movement_weights, heuristic):
+    """Reconstrói o labirinto uma única vez em cada processo do pool"""
+    global _worker_maze, _worker_heuristic
+    _worker_maze = Maze.from_terrain(terrain, cell_weights)
+    _worker_maze.movement_weights = movement_weights
+    _worker_heuristic = heuristic
+
+def _solve_in_worker(pair: Tuple[Position, Position]) -> Path:
+    """Resolve uma consulta no labirinto do processo atual"""
+    start, goal = pair
+    return astar(_worker_maze, _worker_heuristic, start=start, goal=goal)
+
+def _init_shared_worker(block_name: str, heuristic: HeuristicSpec,
+                        max_expansions: Optional[int], deadline: Optional[float]):
+    """
+    Conecta cada processo do pool ao bloco com os terrenos, uma única vez.
+
+    O bloco é fechado quando o processo termina (atexit não roda nos
+    processos do multiprocessing, então o fechamento é um Finalize).
+    """
+    global _shared_block, _worker_heuristic, _worker_limits
+    _shared_block = shared_memory.SharedMemory(name=block_name)
+    util.Finalize(_shared_block, _shared_block.close, exitpriority=0)
+    _worker_heuristic = heuristic
+    _worker_limits = (max_expansions, deadline)
+
+def _solve_shared_chunk(chunk: List[Tuple[int, _SharedMaze]]) -> List[Tuple[int, SearchResult]]:
+    """Resolve um lote de labirintos lendo o terreno direto do bloco compartilhado"""
+    max_expansions, deadline = _worker_limits
+    results = []
+    for index, spec in chunk:
+        terrain = np.ndarray(spec.shape, dtype=np.uint8, buffer=_shared_block.buf, offset=spec.offset)
+        terrain.flags.writeable = False
+        maze = Maze.from_terrain(terrain, spec.cell_weights, spec.points)
+        maze.movement_weights = spec.movement_weights
+        results.append((index, astar_search(maze, _worker_heuristic, max_expansions=max_expansions,
+                                            deadline=deadline)))
+    return results
+
+def _size_chunks(sizes: List[int], processes: int) -> List[List[int]]:
+    """
+    Agrupa labirintos em lotes de trabalho parecido, maiores primeiro.
+
+    O trabalho de cada labirinto é estimado pelo número de células. Os
+    labirintos são percorridos do maior para o menor e cada lote é fechado
+    ao alcançar a fração CHUNKS_PER_PROCESS do total por processo: os
+    grandes ficam sozinhos e saem primeiro, e os pequenos se juntam em
+    lotes, para que um labirinto enorme não fique por último com os outros
+    processos parados.
+
+    Returns:
+        List[List[int]]: Índices dos labirintos de cada lote, em ordem de envio
+    """
+    target = max(sum(sizes) // (processes * CHUNKS_PER_PROCESS), 1)
+    chunks, current, current_size = [], [], 0
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+        current.append(index)
+        current_size += sizes[index]
+        if current_size >= target:
+            chunks.append(current)
+            current, current_size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _search_to_goals(maze: Maze, start: Position, goals: List[Position]) -> Dict[Position, Path]:
+    """
+    Dijkstra a partir de start que para assim que todos os objetivos são fechados.
+
+    Args:
+        maze: Instância da classe Maze
+        start: Posição inicial comum às consultas
+        goals: Objetivos distintos
+
+    Returns:
+        Dict[Position, Path]: Caminho (ou None) para cada objetivo
+    """
+    cols = maze.cols
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+    g_cost, parent, closed = _search_arrays(maze.rows * cols)
+
+    source = start[0] * cols + start[1]
+    # Objetivos em outro componente não são esperados: sem eles a busca não
+    # precisa esgotar o componente do início
+    remaining = {row * cols + col for row, col in goals if maze.connected(start, (row, col))}
+    g_cost[source] = 0.0
+    open_set = [(0.0, source)]
+
+    while open_set and remaining:
+        current_g, current = heapq.heappop(open_set)
+        if closed[current]:
+            continue
+        closed[current] = True
+        remaining.discard(current)
+
+        begin, end = indptr[current], indptr[current + 1]
+        for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+            new_g = current_g + cost
+            if new_g < g_cost[neighbor]:
+                g_cost[neighbor] = new_g
+                parent[neighbor] = current
+                heapq.heappush(open_set, (new_g, neighbor))
+
+    paths = {}
+    for row, col in goals:
+        idx = row * cols + col
+        paths[(row, col)] = _reconstruct_path(parent, idx, cols) if closed[idx] else None
+    return paths
+
+def astar_many(maze: Maze, pairs: Iterable[Tuple[Position, Position]],
+               heuristic: HeuristicSpec = None,
+               processes: Optional[int] = None,
+               cache: Optional[SolutionCache] = None) -> List[Path]:
+    """
+    Resolve várias consultas (início, objetivo) sobre o mesmo labirinto.
+
+    O pré-processamento do labirinto (tabela de adjacência, pesos) é
+    construído uma vez e compartilhado por todas as consultas. Consultas
+    repetidas são resolvidas uma única vez. Consultas que compartilham o
+    início são atendidas por uma única busca de Dijkstra, que para quando
+    todos os seus objetivos foram alcançados; as demais usam astar, opcionalmente
+    distribuídas em um pool de processos.
+
+    Args:
+        maze: Instância da classe Maze
+        pairs: Sequência de pares (início, objetivo)
+        heuristic: Heurística das consultas independentes (mesmas opções de
+                   astar; com processes precisa ser serializável)
+        processes: Número de processos para as consultas independentes
+                   (None ou 1 resolve tudo no processo atual)
+        cache: Se informado, pares já guardados no cache de soluções não são
+               resolvidos de novo e os novos resultados são guardados nele
+
+    Returns:
+        List[Path]: Caminho (ou None) de cada par, na ordem de entrada
+
+    Raises:
+        ValueError: Se alguma posição estiver fora do labirinto
+    """
+    pairs = [(_check_position(maze, start), _check_position(maze, goal)) for start, goal in pairs]
+
+    solved: Dict[Tuple[Position, Position], Path] = {}
+    keys: Dict[Tuple[Position, Position], Optional[str]] = {}
+    if cache is not None:
+        for pair in dict.fromkeys(pairs):
+            keys[pair] = solution_key(maze, pair[0], pair[1], heuristic)
+            path = MISSING if keys[pair] is None else cache.lookup(keys[pair])
+            if path is not MISSING:
+                solved[pair] = path
+    cached = set(solved)
+
+    # Objetivos distintos de cada início ainda sem solução, preservando a
+    # ordem de chegada
+    goals_by_start: Dict[Position, Dict[Position, None]] = {}
+    for start, goal in pairs:
+        if (start, goal) not in solved:
+            goals_by_start.setdefault(start, {})[goal] = None
+
+    independent = []
+    for start, goals in goals_by_start.items():
+        if len(goals) > 1:
+            for goal, path in _search_to_goals(maze, start, list(goals)).items():
+                solved[(start, goal)] = path
+        else:
+            independent.append((start, next(iter(goals))))
+
+    if processes and processes > 1 and len(independent) > 1:
+        initargs = (maze.terrain, dict(maze.cell_weights), dict(maze.movement_weights), heuristic)
+        chunksize = max(1, len(independent) // (4 * processes))
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            for pair, path in zip(independent, pool.map(_solve_in_worker, independent,
+                                                        chunksize=chunksize)):
+                solved[pair] = path
+    else:
+        for start, goal in independent:
+            solved[(start, goal)] = astar(maze, heuristic, start=start, goal=goal)
+
+    if cache is not None:
+        for pair, key in keys.items():
+            if key is not None and pair not in cached:
+                cache.store(key, solved[pair])
+
+    # Cópias para que pares repetidos não compartilhem a mesma lista
+    return [None if solved[pair] is None else list(solved[pair]) for pair in pairs]
+
+def solve_mazes(mazes: Iterable[Maze], heuristic: HeuristicSpec = None,
+                processes: Optional[int] = None,
+                max_expansions: Optional[int] = None,
+                deadline: Optional[float] = None) -> List[SearchResult]:
+    """
+    Resolve vários labirintos (do início ao fim de cada um) em paralelo.
+
+    Os terrenos (uint8, um byte por célula) são copiados uma vez para um
+    único bloco de multiprocessing.shared_memory e cada processo do pool
+    se conecta a ele na inicialização: os labirintos não são serializados,
+    só descrições de poucos bytes (posição no bloco, dimensões, pesos). O
+    trabalho é dividido em lotes pelo tamanho dos labirintos (ver
+    _size_chunks) e cada busca é a de astar_search.
+
+    Args:
+        mazes: Labirintos a resolver
+        heuristic: Mesmas opções de astar (com processes, precisa ser
+                   serializável: um nome ou None)
+        processes: Número de processos (None ou 1 resolve tudo no processo atual)
+        max_expansions: Limite de expansões de cada busca, como em astar_search
+        deadline: Prazo em segundos de cada busca, como em astar_search
+
+    Returns:
+        List[SearchResult]: Resultado (com os contadores) de cada labirinto,
+                            na ordem de entrada
+    """
+    mazes = list(mazes)
+    if not processes or processes <= 1 or len(mazes) <= 1:
+        return [astar_search(maze, heuristic, max_expansions=max_expansions, deadline=deadline)
+                for maze in mazes]
+
+    sizes = [maze.rows * maze.cols for maze in mazes]
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1])).tolist()
+    results: List[Optional[SearchResult]] = [None] * len(mazes)
+    block = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+    try:
+        specs = []
+        for maze, offset, size in zip(mazes, offsets, sizes):
+            np.ndarray(size, dtype=np.uint8, buffer=block.buf, offset=offset)[:] = maze.terrain.ravel()
+            specs.append(_SharedMaze(offset, (maze.rows, maze.cols), (maze.start_pos, maze.end_pos),
+                                     dict(maze.cell_weights), dict(maze.movement_weights)))
+
+        initargs = (block.name, heuristic, max_expansions, deadline)
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_shared_worker,
+                                 initargs=initargs) as pool:
+            futures = [pool.submit(_solve_shared_chunk, [(index, specs[index]) for index in chunk])
+                       for chunk in _size_chunks(sizes, processes)]
+            for future in as_completed(futures):
+                for index, result in future.result():
+                    results[index] = result
+    finally:
+        block.close()
+        block.unlink()
+    return results
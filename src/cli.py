@@ -0,0 +1,359 @@
+"""
+Interface de linha de comando, sem interface gráfica.
+
+Uso:
+    python -m src solve labirinto.txt [--json] [--algorithm jps]
+    python -m src batch pasta/ [--workers 8] [--output resultados.jsonl]
+    python -m src batch lista.txt            # um arquivo de labirinto por linha
+    python -m src landmarks mapa.maze [--count 8]  # tabelas da heurística 'alt'
+    python -m src contract mapa.maze         # hierarquia de contração do algoritmo 'ch'
+    python -m src convert entrada.txt saida.maze  # texto para o formato binário
+
+Este módulo não importa tkinter, então funciona em servidores sem display.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+import argparse
+import json
+import os
+import sys
+import time
+from .maze import Maze
+from .astar import astar
+from .jps import jps
+from .hpa import HierarchicalPathfinder
+from .heuristics import HEURISTIC_NAMES
+from .maze_io import convert_text_maze, load_maze
+from .landmarks import DEFAULT_LANDMARKS, landmarks_path, save_landmarks, select_landmarks
+from .contraction import (
+    build_contraction_hierarchy, contraction_path, hierarchy_file, save_contraction_hierarchy
+)
+from .stats import SearchStats
+
+# Extensões reconhecidas ao percorrer uma pasta no modo batch
+MAZE_EXTENSIONS = ('.txt', '.maze')
+
+# Algoritmos disponíveis: recebem (maze, heurística, stats)
+ALGORITHMS: Dict[str, Callable] = {
+    'astar': lambda maze, heuristic, stats: astar(maze, heuristic, stats),
+    'bidirectional': lambda maze, heuristic, stats: astar(maze, heuristic, stats, bidirectional=True),
+    'jps': lambda maze, heuristic, stats: jps(maze, heuristic, stats=stats),
+    'jps+': lambda maze, heuristic, stats: jps(maze, heuristic, plus=True, stats=stats),
+    'hpa': lambda maze, heuristic, stats: HierarchicalPathfinder(maze).find_path(stats=stats),
+    'ch': lambda maze, heuristic, stats: contraction_path(maze, stats=stats),
+}
+
+# Rótulos dos contadores de SearchStats na saída em texto
+STAT_LABELS: Dict[str, str] = {
+    'nodes_expanded': 'Nós expandidos',
+    'nodes_expanded_forward': 'Expandidos a partir do início',
+    'nodes_expanded_backward': 'Expandidos a partir do fim',
+    'heap_pushes': 'Inserções na fila',
+    'stale_pops': 'Entradas obsoletas',
+    'reopenings': 'Reaberturas',
+    'peak_open_size': 'Pico da fila',
+    'peak_memory': 'Memória no pico (bytes)',
+    'neighbor_time': 'Tempo em vizinhos',
+    'cost_time': 'Tempo em custos',
+    'total_time': 'Tempo da busca',
+}
+
+def solve_file(path: str, algorithm: str = 'astar', heuristic: Optional[str] = None,
+               include_path: bool = True) -> dict:
+    """
+    Carrega e resolve um arquivo de labirinto.
+
+    Erros de leitura ou do solucionador não são propagados: viram o campo
+    'error' do resultado, para que um arquivo inválido não interrompa um lote.
+
+    Args:
+        path: Arquivo de labirinto (texto ou binário)
+        algorithm: Nome em ALGORITHMS
+        heuristic: Nome da heurística (padrão do algoritmo se None)
+        include_path: Se False, o resultado não traz a lista de posições
+
+    Returns:
+        dict: Resultado serializável em JSON, com file, algorithm, found,
+              cost, length, path, stats e time (segundos), ou file e error
+    """
+    return _load_and_solve(path, algorithm, heuristic, include_path)[0]
+
+def _load_and_solve(path: str, algorithm: str, heuristic: Optional[str],
+                    include_path: bool) -> Tuple[dict, Optional[Maze]]:
+    """solve_file que devolve também o labirinto carregado (None se a leitura falhar)"""
+    started = time.perf_counter()
+    try:
+        maze = load_maze(path)
+    except (OSError, ValueError) as error:
+        return {'file': path, 'error': str(error)}, None
+
+    stats = SearchStats()
+    try:
+        found = ALGORITHMS[algorithm](maze, heuristic, stats)
+    except Exception as error:
+        return {'file': path, 'error': _error_message(error)}, maze
+    result = {
+        'file': path,
+        'algorithm': algorithm,
+        'found': found is not None,
+        'cost': None if found is None else maze.path_cost(found),
+        'length': None if found is None else len(found),
+    }
+    if include_path:
+        result['path'] = None if found is None else [list(pos) for pos in found]
+    result['stats'] = asdict(stats)
+    result['time'] = time.perf_counter() - started
+    return result, maze
+
+def _error_message(error: BaseException) -> str:
+    """Texto do campo 'error' (o nome da exceção se ela não tiver mensagem)"""
+    return str(error) or type(error).__name__
+
+def _solve_task(args: tuple) -> dict:
+    """Ponto de entrada dos processos do modo batch"""
+    return solve_file(*args)
+
+def iter_maze_files(source: str) -> Iterator[str]:
+    """
+    Lista os labirintos de uma pasta ou de um arquivo de manifesto.
+
+    Na pasta, são usados os arquivos com extensão em MAZE_EXTENSIONS, em
+    ordem alfabética. O manifesto tem um caminho por linha (relativo à pasta
+    do manifesto) e é lido aos poucos; linhas vazias e iniciadas por '#' são
+    ignoradas.
+
+    Raises:
+        OSError: Se a origem não puder ser lida
+    """
+    if os.path.isdir(source):
+        names = sorted(entry.name for entry in os.scandir(source)
+                       if entry.is_file() and entry.name.endswith(MAZE_EXTENSIONS))
+        for name in names:
+            yield os.path.join(source, name)
+        return
+    base = os.path.dirname(source)
+    with open(source, encoding='utf-8') as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield os.path.join(base, line)
+
+def run_batch(files: Iterator[str], output: TextIO, algorithm: str = 'astar',
+              heuristic: Optional[str] = None, include_path: bool = True,
+              workers: Optional[int] = None, max_pending: Optional[int] = None) -> Dict[str, int]:
+    """
+    Resolve vários labirintos em um pool de processos, gravando JSONL.
+
+    Cada resultado é gravado (uma linha JSON, na ordem em que terminar) assim
+    que fica pronto. No máximo max_pending arquivos ficam em andamento ao
+    mesmo tempo, então a memória usada não depende do tamanho do lote.
+
+    Um arquivo que falhe, inclusive derrubando o processo que o resolvia,
+    conta apenas como erro: se o pool quebrar (BrokenProcessPool), um pool
+    novo segue com o restante e cada arquivo que estava em andamento é
+    repetido sozinho num processo, para não culpar os vizinhos.
+
+    Args:
+        files: Caminhos dos labirintos (pode ser um iterador preguiçoso)
+        output: Arquivo de texto de saída
+        algorithm: Nome em ALGORITHMS
+        heuristic: Nome da heurística (padrão do algoritmo se None)
+        include_path: Se False, os resultados não trazem a lista de posições
+        workers: Número de processos (padrão: os.cpu_count()); 1 resolve no
+                 próprio processo
+        max_pending: Limite de arquivos em andamento (padrão: 4 por processo)
+
+    Returns:
+        Dict[str, int]: Contagem de arquivos 'solved', 'unsolved' e 'errors'
+    """
+    counts = {'solved': 0, 'unsolved': 0, 'errors': 0}
+
+    def emit(result: dict):
+        if 'error' in result:
+            counts['errors'] += 1
+        else:
+            counts['solved' if result['found'] else 'unsolved'] += 1
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for path in files:
+            emit(solve_file(path, algorithm, heuristic, include_path))
+        return counts
+
+    max_pending = max_pending or 4 * workers
+    pending: Dict[Future, str] = {}  # Tarefa em andamento -> arquivo
+
+    def isolated(task: tuple) -> dict:
+        with ProcessPoolExecutor(max_workers=1) as solo:
+            try:
+                return solo.submit(_solve_task, task).result()
+            except Exception as error:
+                return {'file': task[0], 'error': _error_message(error)}
+
+    def collect():
+        for future in wait(pending, return_when=FIRST_COMPLETED).done:
+            path = pending.pop(future)
+            try:
+                emit(future.result())
+            except BrokenProcessPool:
+                emit(isolated((path, algorithm, heuristic, include_path)))
+            except Exception as error:
+                emit({'file': path, 'error': _error_message(error)})
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for path in files:
+            if len(pending) >= max_pending:
+                collect()
+            task = (path, algorithm, heuristic, include_path)
+            try:
+                future = pool.submit(_solve_task, task)
+            except BrokenProcessPool:
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=workers)
+                future = pool.submit(_solve_task, task)
+            pending[future] = path
+        while pending:
+            collect()
+    finally:
+        pool.shutdown()
+    return counts
+
+def format_result(result: dict, maze: Optional[Maze] = None) -> str:
+    """
+    Formata o resultado de solve_file como texto, com todos os contadores
+    de SearchStats.
+
+    Args:
+        result: Resultado de solve_file
+        maze: Se informado, inclui o labirinto com o caminho marcado
+    """
+    if 'error' in result:
+        return f"{result['file']}: erro: {result['error']}"
+    lines = [f"Arquivo: {result['file']}", f"Algoritmo: {result['algorithm']}"]
+    if result['found']:
+        lines.append(f"Caminho encontrado: {result['length']} posições, custo {result['cost']:.2f}")
+        if result.get('path') is not None:
+            lines.append("Caminho: " + " -> ".join(f"({row}, {col})" for row, col in result['path']))
+            if maze is not None:
+                lines.append("")
+                lines.extend(' '.join(row) for row in maze.mark_path(
+                    [tuple(pos) for pos in result['path']]))
+                lines.append("")
+    else:
+        lines.append("Nenhum caminho encontrado")
+    for name, value in result['stats'].items():
+        label = STAT_LABELS.get(name, name)
+        # Os contadores de tempo estão em segundos
+        lines.append(f"{label}: {value * 1000:.2f} ms" if name.endswith('_time') else f"{label}: {value}")
+    lines.append(f"Tempo: {result['time'] * 1000:.2f} ms")
+    return '\n'.join(lines)
+
+def build_parser() -> argparse.ArgumentParser:
+    """Cria o parser dos comandos solve, batch, landmarks, contract e convert"""
+    parser = argparse.ArgumentParser(prog='python -m src', description="PathFinder sem interface gráfica")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_search_options(command: argparse.ArgumentParser):
+        command.add_argument('--algorithm', '-a', choices=list(ALGORITHMS), default='astar')
+        command.add_argument('--heuristic', choices=list(HEURISTIC_NAMES), default=None,
+                             help="padrão: octile escalada pelo menor peso de célula")
+        command.add_argument('--no-path', action='store_true',
+                             help="não inclui a lista de posições do caminho")
+
+    solve = commands.add_parser('solve', help="resolve um labirinto")
+    solve.add_argument('maze', help="arquivo de labirinto (texto ou binário)")
+    add_search_options(solve)
+    solve.add_argument('--json', action='store_true', help="imprime o resultado em JSON")
+    solve.add_argument('--show-maze', action='store_true',
+                       help="imprime o labirinto com o caminho marcado")
+
+    batch = commands.add_parser('batch', help="resolve todos os labirintos de uma pasta ou manifesto")
+    batch.add_argument('source', help="pasta com arquivos .txt/.maze ou manifesto com um caminho por linha")
+    add_search_options(batch)
+    batch.add_argument('--output', '-o', default='-', help="arquivo JSONL de saída (padrão: saída padrão)")
+    batch.add_argument('--workers', '-j', type=int, default=None, help="processos (padrão: núcleos da CPU)")
+
+    landmarks = commands.add_parser('landmarks', help="pré-calcula as tabelas da heurística 'alt'")
+    landmarks.add_argument('maze', help="arquivo de labirinto; as tabelas são gravadas ao lado, em <arquivo>.alt")
+    landmarks.add_argument('--count', '-k', type=int, default=DEFAULT_LANDMARKS,
+                           help=f"número de landmarks (padrão: {DEFAULT_LANDMARKS})")
+
+    contract = commands.add_parser('contract', help="pré-calcula a hierarquia de contração do algoritmo 'ch'")
+    contract.add_argument('maze', help="arquivo de labirinto; o índice é gravado ao lado, em <arquivo>.ch")
+
+    convert = commands.add_parser('convert', help="converte um labirinto em texto para o formato binário")
+    convert.add_argument('source', help="arquivo de labirinto em texto")
+    convert.add_argument('output', help="arquivo binário de saída (.maze)")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Executa a linha de comando.
+
+    Returns:
+        int: 0 em sucesso, 1 se não houver caminho (solve) e 2 em erros de
+             leitura (no batch, se algum arquivo falhar)
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'solve':
+        result, maze = _load_and_solve(args.maze, args.algorithm, args.heuristic, not args.no_path)
+        if 'error' in result:
+            print(f"Erro: {result['error']}", file=sys.stderr)
+            return 2
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(format_result(result, maze if args.show_maze else None))
+        return 0 if result['found'] else 1
+
+    if args.command == 'convert':
+        try:
+            converted = convert_text_maze(args.source, args.output)
+        except (OSError, ValueError) as error:
+            print(f"Erro: {error}", file=sys.stderr)
+            return 2
+        print(f"{args.output}: {converted.rows}x{converted.cols}")
+        return 0
+
+    if args.command in ('landmarks', 'contract'):
+        try:
+            maze = load_maze(args.maze)
+        except (OSError, ValueError) as error:
+            print(f"Erro: {error}", file=sys.stderr)
+            return 2
+        started = time.perf_counter()
+        if args.command == 'landmarks':
+            landmarks = select_landmarks(maze, args.count)
+            path = landmarks_path(args.maze)
+            save_landmarks(landmarks, path)
+            summary = f"{len(landmarks)} landmarks, {landmarks.nbytes / 2 ** 20:.1f} MiB"
+        else:
+            hierarchy = build_contraction_hierarchy(maze)
+            path = hierarchy_file(args.maze)
+            save_contraction_hierarchy(hierarchy, path)
+            summary = (f"{len(hierarchy)} arestas ({hierarchy.shortcuts} atalhos), "
+                       f"{hierarchy.nbytes / 2 ** 20:.1f} MiB")
+        print(f"{path}: {summary}, {time.perf_counter() - started:.2f} s")
+        return 0
+
+    try:
+        files = iter_maze_files(args.source)
+        if args.output == '-':
+            counts = run_batch(files, sys.stdout, args.algorithm, args.heuristic,
+                               not args.no_path, args.workers)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                counts = run_batch(files, output, args.algorithm, args.heuristic,
+                                   not args.no_path, args.workers)
+    except OSError as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 2
+    print(f"{counts['solved']} resolvidos, {counts['unsolved']} sem solução, "
+          f"{counts['errors']} com erro", file=sys.stderr)
+    return 2 if counts['errors'] else 0
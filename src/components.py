@@ -0,0 +1,354 @@
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+# Função (linha_ini, linha_fim, coluna_ini, coluna_fim) -> matriz booleana de
+# células transitáveis do recorte, usada nas atualizações incrementais
+PassableRegion = Callable[[int, int, int, int], np.ndarray]
+
+# Vizinhança 3x3 de uma célula percorrida em volta, em ordem circular; os
+# índices ímpares são os vizinhos ortogonais
+_RING = ((0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0))
+
+def _union_find(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    União vetorizada (hook-and-compress) de n elementos ligados pelos pares (a, b).
+
+    A cada rodada, a raiz maior de cada par ainda separado é pendurada na
+    menor e as árvores são comprimidas até a raiz. Como o pai é sempre
+    menor que o filho, escritas concorrentes não criam ciclos.
+
+    Returns:
+        np.ndarray: Raiz de cada elemento (o menor elemento do conjunto)
+    """
+    parent = np.arange(n)
+    while a.size:
+        root_a, root_b = parent[a], parent[b]
+        apart = root_a != root_b
+        a, b = a[apart], b[apart]
+        if not a.size:
+            break
+        root_a, root_b = root_a[apart], root_b[apart]
+        parent[np.maximum(root_a, root_b)] = np.minimum(root_a, root_b)
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    return parent
+
+def label_components(passable: np.ndarray) -> np.ndarray:
+    """
+    Rotula os componentes conexos das células transitáveis.
+
+    Como as diagonais não podem cortar cantos, toda diagonal permitida tem
+    os dois ortogonais livres e já existe um caminho ortogonal entre suas
+    pontas: os componentes de get_neighbors são os mesmos da conectividade
+    ortogonal. A rotulagem junta os trechos horizontais de cada linha e une
+    os trechos que se tocam verticalmente com _union_find.
+
+    Args:
+        passable: Matriz booleana (linhas, colunas) de células transitáveis
+
+    Returns:
+        np.ndarray: Rótulo de cada célula em índices planos (int32, ou int64
+                    em grades com 2**31 células ou mais); -1 nas
+                    intransitáveis e, nas demais, o menor índice plano do
+                    componente
+    """
+    rows, cols = passable.shape
+    flat = passable.ravel()
+    index_type = np.int32 if flat.size < 2 ** 31 else np.int64
+    labels = np.full(flat.size, -1, dtype=index_type)
+    if not flat.any():
+        return labels
+
+    starts = passable.copy()
+    starts[:, 1:] &= ~passable[:, :-1]
+    starts = starts.ravel()
+    run_first = np.flatnonzero(starts)  # Primeira célula de cada trecho
+    run_of = np.cumsum(starts, dtype=index_type)  # Trecho de cada célula transitável
+    run_of -= 1
+    del starts
+
+    vertical = (passable[:-1] & passable[1:]).ravel()
+    a, b = run_of[:-cols][vertical], run_of[cols:][vertical]
+    del vertical
+    # Trechos sobrepostos em várias colunas geram pares repetidos seguidos
+    distinct = np.ones(a.size, dtype=np.bool_)
+    distinct[1:] = (a[1:] != a[:-1]) | (b[1:] != b[:-1])
+    root = _union_find(run_first.size, a[distinct], b[distinct])
+    del a, b, distinct
+
+    labels[flat] = run_first[root[run_of[flat]]]
+    return labels
+
+class ComponentIndex:
+    """
+    Rótulos de componentes conexos com atualização incremental.
+
+    Responde em O(1) se duas células estão no mesmo componente. Quando uma
+    célula muda de transitável para obstáculo ou vice-versa, só os rótulos
+    afetados são refeitos: abrir uma célula une os componentes vizinhos
+    (com apelidos entre rótulos, como em union-find), e fechar uma célula
+    só separa o componente dela se os vizinhos ortogonais não continuarem
+    ligados pela volta da própria célula. Nesse caso, buscas em largura a
+    partir dos vizinhos param assim que se reencontram, e só os pedaços
+    menores que se soltaram ganham rótulos novos.
+
+    As listas de células de cada componente (para cells) são montadas na
+    primeira consulta e depois mantidas junto com os rótulos.
+    """
+
+    def __init__(self, passable: np.ndarray):
+        """
+        Args:
+            passable: Matriz booleana (linhas, colunas) de células transitáveis
+        """
+        self.rows, self.cols = passable.shape
+        self.labels = label_components(passable)
+        self._alias: Dict[int, int] = {}  # Rótulos unidos a outro componente
+        self._next_label = self.labels.size  # Rótulos novos não colidem com os iniciais
+        # Blocos de índices planos de cada componente, pelo rótulo canônico;
+        # podem conter células já fechadas ou repetidas, descartadas em cells
+        self._cells: Optional[Dict[int, List[np.ndarray]]] = None
+
+    def _find(self, label: int) -> int:
+        """Rótulo canônico, seguindo e encurtando a cadeia de apelidos"""
+        alias = self._alias
+        while label in alias:
+            parent = alias[label]
+            if parent in alias:
+                alias[label] = alias[parent]
+            label = parent
+        return label
+
+    def component(self, pos: Tuple[int, int]) -> int:
+        """
+        Rótulo do componente de uma célula (-1 se intransitável ou fora da grade).
+
+        Args:
+            pos: Tupla (linha, coluna)
+        """
+        row, col = pos
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return -1
+        label = int(self.labels[row * self.cols + col])
+        return label if label < 0 else self._find(label)
+
+    def _canonical(self, labels: np.ndarray) -> np.ndarray:
+        """Rótulos canônicos de um array de rótulos (-1 se intransitável)"""
+        unique, inverse = np.unique(labels, return_inverse=True)
+        roots = np.array([self._find(label) if label >= 0 else -1 for label in unique.tolist()],
+                         dtype=np.int64)
+        return roots[inverse.reshape(-1)]
+
+    def _cell_lists(self) -> Dict[int, List[np.ndarray]]:
+        """Listas de células por componente, montadas numa única ordenação"""
+        if self._cells is None:
+            flat = np.flatnonzero(self.labels >= 0)
+            roots = self._canonical(self.labels[flat])
+            order = np.argsort(roots, kind='stable')
+            roots, flat = roots[order], flat[order]
+            bounds = np.flatnonzero(roots[1:] != roots[:-1]) + 1
+            self._cells = {int(group_roots[0]): [group]
+                           for group_roots, group in zip(np.split(roots, bounds), np.split(flat, bounds))
+                           if group.size}
+        return self._cells
+
+    def cells(self, pos: Tuple[int, int]) -> np.ndarray:
+        """
+        Índices planos das células do componente de uma posição.
+
+        Proporcional ao tamanho do componente, não ao do labirinto (a
+        primeira consulta agrupa todas as células de uma vez).
+
+        Args:
+            pos: Tupla (linha, coluna)
+
+        Returns:
+            np.ndarray: Índices planos em ordem crescente (vazio se a
+                posição for intransitável)
+        """
+        label = self.component(pos)
+        if label < 0:
+            return np.empty(0, dtype=np.int64)
+        blocks = self._cell_lists()[label]
+        cells = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        # Descarta células fechadas depois, ou que foram para outro componente
+        cells = np.unique(cells[self._canonical(self.labels[cells]) == label])
+        blocks[:] = [cells]
+        return cells
+
+    def largest(self) -> np.ndarray:
+        """
+        Índices planos das células do maior componente.
+
+        Returns:
+            np.ndarray: Índices planos (vazio se não houver células transitáveis)
+        """
+        cells = np.flatnonzero(self.labels >= 0)
+        if not cells.size:
+            return cells
+        labels, inverse, counts = np.unique(self.labels[cells], return_inverse=True,
+                                            return_counts=True)
+        roots = np.array([self._find(int(label)) for label in labels.tolist()])
+        _, root_of = np.unique(roots, return_inverse=True)
+        best = int(np.argmax(np.bincount(root_of, weights=counts)))
+        return cells[root_of[inverse] == best]
+
+    def connected(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
+        """
+        Verifica se existe caminho entre duas células transitáveis.
+
+        Args:
+            pos1: Tupla (linha, coluna)
+            pos2: Tupla (linha, coluna)
+
+        Returns:
+            bool: True se as duas estão no mesmo componente (False se alguma
+                  estiver fora da grade)
+        """
+        label = self.component(pos1)
+        return label >= 0 and label == self.component(pos2)
+
+    def update(self, pos: Tuple[int, int], region: PassableRegion):
+        """
+        Atualiza os rótulos depois que uma célula foi alterada.
+
+        Args:
+            pos: Tupla (linha, coluna) da célula alterada
+            region: Função que devolve as células transitáveis de um recorte,
+                    já com a alteração aplicada
+        """
+        row, col = pos
+        cols = self.cols
+        idx = row * cols + col
+        r0, r1 = max(row - 1, 0), min(row + 2, self.rows)
+        c0, c1 = max(col - 1, 0), min(col + 2, cols)
+        block = np.zeros((3, 3), dtype=np.bool_)
+        block[r0 - row + 1:r1 - row + 1, c0 - col + 1:c1 - col + 1] = region(r0, r1, c0, c1)
+        if bool(block[1, 1]) == (self.labels[idx] >= 0):
+            return  # Só o peso mudou
+
+        ring = [bool(block[r, c]) for r, c in _RING]
+        neighbors = [(k, (row + _RING[k][0] - 1) * cols + col + _RING[k][1] - 1)
+                     for k in (1, 3, 5, 7) if ring[k]]
+
+        if block[1, 1]:
+            roots = {self._find(int(self.labels[n])) for _, n in neighbors}
+            if not roots:
+                if not self._labels_exhausted(1, region):
+                    self._new_component([idx])
+                return
+            target = min(roots)
+            for root in roots - {target}:
+                self._alias[root] = target
+            self.labels[idx] = target
+            if self._cells is not None:
+                for root in roots - {target}:
+                    self._cells[target].extend(self._cells.pop(root))
+                self._cells[target].append(np.array([idx]))
+            return
+
+        old = self._find(int(self.labels[idx]))
+        self.labels[idx] = -1
+        if not neighbors and self._cells is not None:
+            del self._cells[old]
+        if len(neighbors) <= 1 or all(ring):
+            return
+        # Os vizinhos continuam ligados se estão no mesmo trecho contínuo de
+        # células transitáveis em volta da célula fechada
+        first = ring.index(False)
+        run, runs = 0, [0] * 8
+        for step in range(1, 9):
+            k = (first + step) % 8
+            if not ring[k]:
+                run += 1
+            runs[k] = run
+        starts: Dict[int, int] = {}
+        for k, neighbor in neighbors:
+            starts.setdefault(runs[k], neighbor)
+        if len(starts) > 1:
+            self._split(list(starts.values()), region)
+
+    def _new_component(self, cells: List[int]):
+        """Dá um rótulo novo às células de um componente"""
+        label = self._next_label
+        self._next_label += 1
+        cells = np.array(cells, dtype=np.int64)
+        self.labels[cells] = label
+        if self._cells is not None:
+            self._cells[label] = [cells]
+
+    def _labels_exhausted(self, count: int, region: PassableRegion) -> bool:
+        """Se não restam count rótulos novos, rotula a grade inteira de novo"""
+        if self._next_label + count <= np.iinfo(self.labels.dtype).max:
+            return False
+        self.labels = label_components(region(0, self.rows, 0, self.cols))
+        self._alias.clear()
+        self._next_label = self.labels.size
+        self._cells = None
+        return True
+
+    def _split(self, starts: List[int], region: PassableRegion):
+        """
+        Separa os pedaços de um componente cortado por uma célula fechada.
+
+        Uma busca em largura ortogonal sai de cada vizinho, um passo de cada
+        por vez. Buscas que se tocam são unidas; uma busca que se esgota
+        sem tocar as outras percorreu um pedaço inteiro, que ganha rótulo
+        novo. Quando resta uma só busca ativa, o pedaço dela fica com o
+        rótulo antigo: o trabalho é proporcional aos pedaços menores, não
+        ao componente inteiro.
+
+        Args:
+            starts: Índices planos de um vizinho por trecho da volta da célula
+            region: Função de células transitáveis (para a rotulagem completa
+                    se os rótulos novos se esgotarem)
+        """
+        if self._labels_exhausted(len(starts) - 1, region):
+            return
+        labels, rows, cols = self.labels, self.rows, self.cols
+        owner = {cell: k for k, cell in enumerate(starts)}  # Busca que visitou cada célula
+        merged = list(range(len(starts)))  # Busca que absorveu cada busca
+        queues = [deque([cell]) for cell in starts]
+        visited: List[List[int]] = [[cell] for cell in starts]
+        active = list(range(len(starts)))
+
+        def find(k: int) -> int:
+            while merged[k] != k:
+                k = merged[k]
+            return k
+
+        while len(active) > 1:
+            for k in list(active):
+                if k not in active:
+                    continue  # Absorvida por outra busca nesta rodada
+                queue = queues[k]
+                if not queue:
+                    active.remove(k)
+                    self._new_component(visited[k])
+                    if len(active) == 1:
+                        break
+                    continue
+                cell = queue.popleft()
+                row, col = divmod(cell, cols)
+                for neighbor, inside in ((cell - cols, row > 0), (cell + cols, row < rows - 1),
+                                         (cell - 1, col > 0), (cell + 1, col < cols - 1)):
+                    if not inside or labels[neighbor] < 0:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = k
+                        visited[k].append(neighbor)
+                        queue.append(neighbor)
+                        continue
+                    other = find(other)
+                    if other != k:
+                        merged[other] = k
+                        queue.extend(queues[other])
+                        visited[k].extend(visited[other])
+                        active.remove(other)
+                if len(active) == 1:
+                    break
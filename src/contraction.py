@@ -0,0 +1,487 @@
+from typing import Dict, List, Optional, Tuple
+import heapq
+import math
+import os
+import struct
+import numpy as np
+from .maze import Maze
+from .astar import _check_position
+from .stats import SearchStats
+
+Position = Tuple[int, int]
+
+# Chave do índice entre as estruturas derivadas do labirinto (Maze.cached)
+HIERARCHY_KEY = 'contraction_hierarchy'
+
+# Extensão do arquivo do índice gravado ao lado do labirinto
+HIERARCHY_EXTENSION = '.ch'
+
+# Máximo de células assentadas por busca de testemunha: limites menores
+# aceleram o pré-processamento à custa de atalhos desnecessários (que não
+# alteram as respostas)
+WITNESS_LIMIT = 64
+
+# Formato do arquivo do índice (little-endian, arrays alinhados a 8 bytes):
+#   cabeçalho   magic, versão, reservado, linhas, colunas, nº de arestas,
+#               impressão digital do labirinto (16 bytes, ver Maze.fingerprint)
+#   indptr      (linhas * colunas + 1) int64 do grafo de subida em CSR
+#   custos      nº de arestas float64
+#   destinos    nº de arestas int32
+#   meios       nº de arestas int32 (célula contraída do atalho, -1 nas arestas da grade)
+#   filhos      2 * nº de arestas int32 (arestas do meio até a ponta inferior e
+#               até a superior de cada atalho, -1 nas arestas da grade)
+#   ordem       linhas * colunas int32 (posição de cada célula na contração, -1 nos obstáculos)
+HIERARCHY_MAGIC = b'PFCH'
+HIERARCHY_VERSION = 1
+_HEADER = struct.Struct('<4sHHIIQ16s')
+
+class ContractionHierarchy:
+    """
+    Hierarquia de contração do grafo da grade, para consultas exatas rápidas.
+
+    As células são contraídas uma a uma, da menos para a mais importante:
+    ao remover uma célula, cada par de vizinhos cujo menor caminho passava
+    por ela ganha um atalho com o mesmo custo. Como todo menor caminho
+    passa a ter uma forma "sobe e depois desce" na ordem de contração, uma
+    consulta é uma busca bidirecional que só segue arestas para células
+    mais importantes e visita poucas centenas de células, qualquer que seja
+    a distância. Os atalhos guardam a célula contraída e são desdobrados no
+    caminho célula a célula.
+
+    As arestas custam o mesmo nos dois sentidos, então um único grafo de
+    subida (CSR) serve às duas buscas. Cada aresta fica na lista da sua
+    ponta menos importante.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, costs: np.ndarray,
+                 middle: np.ndarray, children: np.ndarray, order: np.ndarray,
+                 fingerprint: str, shape: Tuple[int, int]):
+        """
+        Args:
+            indptr: Início das arestas de subida de cada célula (CSR)
+            indices: Célula de destino de cada aresta
+            costs: Custo de cada aresta
+            middle: Célula contraída de cada atalho (-1 nas arestas da grade)
+            children: Array (arestas, 2) com as arestas que formam cada atalho:
+                      do meio até a ponta inferior e até a superior (-1 nas
+                      arestas da grade)
+            order: Posição de cada célula na contração (-1 nos obstáculos)
+            fingerprint: Impressão digital do labirinto do índice
+            shape: Dimensões (linhas, colunas) do labirinto
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.costs = costs
+        self.middle = middle
+        self.children = children
+        self.order = order
+        self.fingerprint = fingerprint
+        self.shape = shape
+        self._indptr = memoryview(indptr)
+        self._indices = memoryview(indices)
+        self._costs = memoryview(costs)
+        self._middle = memoryview(middle)
+        self._children = memoryview(children.reshape(-1))
+        self._order = memoryview(order)
+
+    def __len__(self) -> int:
+        """Número de arestas de subida (da grade e atalhos)"""
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays do índice"""
+        return (self.indptr.nbytes + self.indices.nbytes + self.costs.nbytes
+                + self.middle.nbytes + self.children.nbytes + self.order.nbytes)
+
+    @property
+    def shortcuts(self) -> int:
+        """Número de atalhos"""
+        return int(np.count_nonzero(np.asarray(self.middle) >= 0))
+
+    def matches(self, maze: Maze) -> bool:
+        """Verifica se o índice foi construído para este labirinto"""
+        return self.shape == (maze.rows, maze.cols) and self.fingerprint == maze.fingerprint()
+
+    def attach(self, maze: Maze) -> 'ContractionHierarchy':
+        """
+        Associa o índice ao labirinto, para contraction_path usá-lo.
+
+        Raises:
+            ValueError: Se o índice for de outro labirinto
+        """
+        if not self.matches(maze):
+            raise ValueError("A hierarquia de contração não é deste labirinto")
+        return maze.cached(HIERARCHY_KEY, lambda: self)
+
+    def _search(self, source: int, target: int,
+                stats: Optional[SearchStats]) -> Tuple[float, List[Tuple[int, int, int]]]:
+        """
+        Busca bidirecional de subida entre dois índices planos.
+
+        Cada lado expande sempre a menor distância e para quando ela alcança
+        o melhor custo de encontro já visto, que então é o ótimo.
+
+        Returns:
+            Tuple[float, List[Tuple[int, int, int]]]: Custo e trechos (de,
+                para, aresta) do caminho na hierarquia, com os atalhos ainda
+                não desdobrados; infinito e lista vazia se não houver caminho
+        """
+        indptr, indices, costs = self._indptr, self._indices, self._costs
+        distance: Tuple[Dict[int, float], Dict[int, float]] = ({source: 0.0}, {target: 0.0})
+        # Célula anterior e aresta usada para chegar a cada célula
+        parent: Tuple[Dict[int, Tuple[int, int]], Dict[int, Tuple[int, int]]] = ({}, {})
+        open_sets = ([(0.0, source)], [(0.0, target)])
+        expanded = [0, 0]
+        best, meeting = math.inf, -1
+
+        while True:
+            forward_top = open_sets[0][0][0] if open_sets[0] else math.inf
+            backward_top = open_sets[1][0][0] if open_sets[1] else math.inf
+            if min(forward_top, backward_top) >= best:
+                break
+            side = 0 if forward_top <= backward_top else 1
+            current_d, current = heapq.heappop(open_sets[side])
+            own, other = distance[side], distance[1 - side]
+            if current_d > own[current]:
+                continue  # Entrada obsoleta
+            if current in other and current_d + other[current] < best:
+                best, meeting = current_d + other[current], current
+
+            begin, end = indptr[current], indptr[current + 1]
+            edges = list(zip(range(begin, end), indices[begin:end], costs[begin:end]))
+            # Stall-on-demand: se uma célula acima já alcançada oferece um
+            # caminho mais curto até esta, a distância dela não é a de
+            # subida ótima e não vale expandi-la
+            stalled = False
+            for _, neighbor, cost in edges:
+                if neighbor in own and own[neighbor] + cost < current_d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+            expanded[side] += 1
+
+            own_parent, open_set = parent[side], open_sets[side]
+            for edge, neighbor, cost in edges:
+                new_d = current_d + cost
+                if new_d < own.get(neighbor, math.inf):
+                    own[neighbor] = new_d
+                    own_parent[neighbor] = (current, edge)
+                    heapq.heappush(open_set, (new_d, neighbor))
+
+        if stats is not None:
+            stats.nodes_expanded_forward, stats.nodes_expanded_backward = expanded
+            stats.nodes_expanded = expanded[0] + expanded[1]
+        if meeting < 0:
+            return math.inf, []
+
+        legs = []
+        node = meeting
+        while node in parent[0]:
+            previous, edge = parent[0][node]
+            legs.append((previous, node, edge))
+            node = previous
+        legs.reverse()
+        node = meeting
+        while node in parent[1]:
+            following, edge = parent[1][node]
+            legs.append((node, following, edge))
+            node = following
+        return best, legs
+
+    def _unpack(self, source: int, legs: List[Tuple[int, int, int]]) -> List[int]:
+        """Desdobra os atalhos dos trechos de um caminho na hierarquia"""
+        indices, middle, children = self._indices, self._middle, self._children
+        path = [source]
+        for leg in legs:
+            stack = [leg]
+            while stack:
+                a, b, edge = stack.pop()
+                via = middle[edge]
+                if via < 0:
+                    path.append(b)
+                    continue
+                # A aresta fica na lista da ponta inferior; indices guarda a superior
+                to_low, to_high = children[2 * edge], children[2 * edge + 1]
+                if indices[edge] == b:
+                    stack.append((via, b, to_high))
+                    stack.append((a, via, to_low))
+                else:
+                    stack.append((via, b, to_low))
+                    stack.append((a, via, to_high))
+        return path
+
+    def distance(self, start: Position, goal: Position) -> float:
+        """
+        Custo do menor caminho entre duas posições (infinito se não houver).
+
+        Args:
+            start: Posição inicial
+            goal: Posição objetivo
+        """
+        cols = self.shape[1]
+        if start == goal:
+            return 0.0 if self._order[start[0] * cols + start[1]] >= 0 else math.inf
+        cost, _ = self._search(start[0] * cols + start[1], goal[0] * cols + goal[1], None)
+        return cost
+
+    def find_path(self, start: Position, goal: Position,
+                  stats: Optional[SearchStats] = None) -> Optional[List[Position]]:
+        """
+        Encontra o menor caminho exato entre duas posições.
+
+        Args:
+            start: Posição inicial
+            goal: Posição objetivo
+            stats: Se informado, recebe o número de células expandidas em
+                   cada sentido
+
+        Returns:
+            Optional[List[Position]]: Caminho no formato de astar, ou None
+        """
+        cols = self.shape[1]
+        source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+        if self._order[source] < 0 or self._order[target] < 0:
+            return None
+        if source == target:
+            return [start]
+        _, legs = self._search(source, target, stats)
+        if not legs:
+            return None
+        return [divmod(idx, cols) for idx in self._unpack(source, legs)]
+
+def _witness_search(graph: List[Dict[int, Tuple[float, int]]], source: int, excluded: int,
+                    targets: set, max_cost: float, limit: int) -> Dict[int, float]:
+    """
+    Dijkstra limitado a partir de source, sem passar por excluded.
+
+    Para ao assentar todos os alvos, ao passar de max_cost ou ao assentar
+    limit células; distâncias ausentes ou maiores que as reais só causam
+    atalhos a mais.
+    """
+    distance = {source: 0.0}
+    open_set = [(0.0, source)]
+    remaining = len(targets)
+    settled = 0
+    while open_set:
+        current_d, current = heapq.heappop(open_set)
+        if current_d > distance[current]:
+            continue
+        if current_d > max_cost or settled >= limit:
+            break
+        settled += 1
+        if current in targets:
+            remaining -= 1
+            if not remaining:
+                break
+        for neighbor, (cost, _) in graph[current].items():
+            if neighbor == excluded:
+                continue
+            new_d = current_d + cost
+            if new_d < distance.get(neighbor, math.inf):
+                distance[neighbor] = new_d
+                heapq.heappush(open_set, (new_d, neighbor))
+    return distance
+
+def _shortcuts(graph: List[Dict[int, Tuple[float, int]]], node: int,
+               limit: int) -> List[Tuple[int, int, float]]:
+    """Atalhos (u, w, custo) necessários para contrair node"""
+    neighbors = list(graph[node].items())
+    shortcuts = []
+    for i, (u, (cost_u, _)) in enumerate(neighbors[:-1]):
+        # Vizinhos já ligados a u por uma aresta no máximo tão cara dispensam a busca
+        edges_u = graph[u]
+        later = [(w, (cost_w, middle)) for w, (cost_w, middle) in neighbors[i + 1:]
+                 if edges_u.get(w, (math.inf, -1))[0] > cost_u + cost_w]
+        if not later:
+            continue
+        max_cost = cost_u + max(cost_w for _, (cost_w, _) in later)
+        witness = _witness_search(graph, u, node, {w for w, _ in later}, max_cost, limit)
+        for w, (cost_w, _) in later:
+            via = cost_u + cost_w
+            if witness.get(w, math.inf) > via:
+                shortcuts.append((u, w, via))
+    return shortcuts
+
+def build_contraction_hierarchy(maze: Maze, witness_limit: int = WITNESS_LIMIT) -> ContractionHierarchy:
+    """
+    Contrai todas as células transitáveis e monta o grafo de subida.
+
+    A ordem de contração é escolhida com atualização preguiçosa de
+    prioridades: a próxima célula é a de menor diferença de arestas
+    (atalhos criados menos arestas removidas) somada ao número de vizinhos
+    já contraídos, o que espalha as contrações pelo mapa. O custo é dominado
+    pelas buscas de testemunha: de segundos a um minuto em mapas 256x256
+    com paredes, e bem mais em terreno aberto com pesos variados, em que as
+    últimas células contraídas acumulam muitos atalhos.
+
+    Args:
+        maze: Instância da classe Maze
+        witness_limit: Máximo de células assentadas por busca de testemunha
+
+    Returns:
+        ContractionHierarchy: Índice do labirinto
+    """
+    adjacency = maze.get_adjacency()
+    n_cells = maze.rows * maze.cols
+    indptr, indices, costs = adjacency.indptr.tolist(), adjacency.indices.tolist(), adjacency.costs.tolist()
+    passable = np.flatnonzero(maze.get_weight_grid().ravel() < np.inf).tolist()
+
+    # Grafo restante: vizinho -> (custo, célula contraída do atalho ou -1)
+    graph: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n_cells)]
+    for node in passable:
+        graph[node] = {indices[k]: (costs[k], -1) for k in range(indptr[node], indptr[node + 1])}
+
+    contracted_neighbors = [0] * n_cells
+    queue = [(len(_shortcuts(graph, node, witness_limit)) - len(graph[node]), node) for node in passable]
+    heapq.heapify(queue)
+    order = np.full(n_cells, -1, dtype=np.int32)
+    upward: List[List[Tuple[int, float, int]]] = [[] for _ in range(n_cells)]
+    rank = 0
+
+    while queue:
+        _, node = heapq.heappop(queue)
+        # Atualização preguiçosa: a prioridade pode ter subido desde a inserção
+        shortcuts = _shortcuts(graph, node, witness_limit)
+        current = len(shortcuts) - len(graph[node]) + contracted_neighbors[node]
+        if queue and current > queue[0][0]:
+            heapq.heappush(queue, (current, node))
+            continue
+
+        order[node] = rank
+        rank += 1
+        neighbors = graph[node]
+        upward[node] = [(neighbor, cost, middle) for neighbor, (cost, middle) in neighbors.items()]
+        for neighbor in neighbors:
+            del graph[neighbor][node]
+            contracted_neighbors[neighbor] += 1
+        graph[node] = {}
+        for u, w, cost in shortcuts:
+            if cost < graph[u].get(w, (math.inf, -1))[0]:
+                graph[u][w] = graph[w][u] = (cost, node)
+
+    index_dtype = np.int32 if n_cells < 2 ** 31 else np.int64
+    up_indptr = np.zeros(n_cells + 1, dtype=np.int64)
+    np.cumsum([len(edges) for edges in upward], out=up_indptr[1:])
+    edges = [edge for node_edges in upward for edge in node_edges]
+    up_indices = np.array([edge[0] for edge in edges], dtype=index_dtype)
+    up_costs = np.array([edge[1] for edge in edges], dtype=np.float64)
+    up_middle = np.array([edge[2] for edge in edges], dtype=index_dtype)
+
+    # Cada atalho u-w criado ao contrair m é formado pelas arestas de subida
+    # de m até u e até w
+    up_children = np.full((len(edges), 2), -1, dtype=index_dtype)
+    positions: Dict[int, Dict[int, int]] = {}
+    for node in passable:
+        first = int(up_indptr[node])
+        for k, (neighbor, _, middle) in enumerate(upward[node], first):
+            if middle >= 0:
+                if middle not in positions:
+                    base = int(up_indptr[middle])
+                    positions[middle] = {edge[0]: base + j for j, edge in enumerate(upward[middle])}
+                up_children[k] = positions[middle][node], positions[middle][neighbor]
+    return ContractionHierarchy(up_indptr, up_indices, up_costs, up_middle, up_children, order,
+                                maze.fingerprint(), (maze.rows, maze.cols))
+
+def get_contraction_hierarchy(maze: Maze) -> ContractionHierarchy:
+    """
+    Retorna o índice associado ao labirinto, construindo-o na primeira vez.
+
+    Índices carregados com o labirinto (load_contraction_hierarchy,
+    load_maze) são reaproveitados; set_cells os descarta junto das demais
+    estruturas.
+    """
+    return maze.cached(HIERARCHY_KEY, lambda: build_contraction_hierarchy(maze))
+
+def contraction_path(maze: Maze, start: Optional[Position] = None, goal: Optional[Position] = None,
+                     stats: Optional[SearchStats] = None) -> Optional[List[Position]]:
+    """
+    Menor caminho exato usando (e guardando) a hierarquia de contração do labirinto.
+
+    A primeira consulta a um labirinto sem índice carregado paga o
+    pré-processamento; as seguintes custam uma fração de milissegundo.
+
+    Args:
+        maze: Instância da classe Maze
+        start: Posição inicial (padrão: maze.start_pos)
+        goal: Posição objetivo (padrão: maze.end_pos)
+        stats: Se informado, recebe o número de células expandidas
+
+    Returns:
+        Optional[List[Position]]: Caminho no formato de astar, ou None
+    """
+    start = maze.start_pos if start is None else _check_position(maze, start)
+    goal = maze.end_pos if goal is None else _check_position(maze, goal)
+    if start != goal and not maze.connected(start, goal):
+        return None
+    return get_contraction_hierarchy(maze).find_path(start, goal, stats)
+
+def hierarchy_file(maze_path: str) -> str:
+    """Arquivo do índice gravado ao lado de um arquivo de labirinto"""
+    return maze_path + HIERARCHY_EXTENSION
+
+def save_contraction_hierarchy(hierarchy: ContractionHierarchy, path: str) -> None:
+    """
+    Grava a hierarquia de contração.
+
+    Args:
+        hierarchy: Índice a gravar
+        path: Arquivo de destino (em geral hierarchy_file(arquivo do labirinto))
+    """
+    rows, cols = hierarchy.shape
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(HIERARCHY_MAGIC, HIERARCHY_VERSION, 0, rows, cols, len(hierarchy),
+                                bytes.fromhex(hierarchy.fingerprint)))
+        np.ascontiguousarray(hierarchy.indptr, dtype='<i8').tofile(file)
+        np.ascontiguousarray(hierarchy.costs, dtype='<f8').tofile(file)
+        np.ascontiguousarray(hierarchy.indices, dtype='<i4').tofile(file)
+        np.ascontiguousarray(hierarchy.middle, dtype='<i4').tofile(file)
+        np.ascontiguousarray(hierarchy.children, dtype='<i4').tofile(file)
+        np.ascontiguousarray(hierarchy.order, dtype='<i4').tofile(file)
+
+def load_contraction_hierarchy(path: str, maze: Optional[Maze] = None) -> ContractionHierarchy:
+    """
+    Carrega a hierarquia de contração mapeando os arrays direto do arquivo.
+
+    Nada é lido além do cabeçalho: cada consulta só traz do disco as
+    páginas das poucas células que visita.
+
+    Args:
+        path: Arquivo gravado por save_contraction_hierarchy
+        maze: Se informado, o índice é conferido e associado a ele
+
+    Returns:
+        ContractionHierarchy: Índice com os arrays em np.memmap (somente leitura)
+
+    Raises:
+        ValueError: Se o arquivo for inválido ou de outro labirinto
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size or header[:4] != HIERARCHY_MAGIC:
+        raise ValueError(f"Arquivo '{path}' não é uma hierarquia de contração")
+    magic, version, _, rows, cols, n_edges, fingerprint = _HEADER.unpack(header)
+    if version != HIERARCHY_VERSION:
+        raise ValueError(f"Versão {version} do formato de hierarquia de contração não suportada")
+
+    n_cells = rows * cols
+    layout = (('<i8', n_cells + 1), ('<f8', n_edges), ('<i4', n_edges), ('<i4', n_edges),
+              ('<i4', 2 * n_edges), ('<i4', n_cells))
+    expected = _HEADER.size + sum(np.dtype(dtype).itemsize * count for dtype, count in layout)
+    if os.path.getsize(path) != expected:
+        raise ValueError(f"Arquivo '{path}' truncado: esperados {expected} bytes")
+
+    arrays = []
+    offset = _HEADER.size
+    for dtype, count in layout:
+        arrays.append(np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+                      if count else np.zeros(0, dtype=dtype))
+        offset += np.dtype(dtype).itemsize * count
+    indptr, costs, indices, middle, children, order = arrays
+
+    hierarchy = ContractionHierarchy(indptr, indices, costs, middle, children.reshape(n_edges, 2),
+                                     order, fingerprint.hex(), (rows, cols))
+    if maze is not None:
+        hierarchy.attach(maze)
+    return hierarchy
@@ -0,0 +1,192 @@
+from typing import List, Optional, Tuple
+from collections import OrderedDict
+import heapq
+import numpy as np
+from .maze import Maze
+from .astar import _check_position, _search_arrays
+
+Position = Tuple[int, int]
+
+class DistanceField:
+    """
+    Distância de todas as células até um objetivo e o próximo passo de cada uma.
+
+    Obtido com um único Dijkstra reverso a partir do objetivo (as arestas têm
+    o mesmo custo nos dois sentidos). Depois disso, o caminho de qualquer
+    início é uma simples descida pelo campo, em O(tamanho do caminho).
+    """
+
+    def __init__(self, goal: Position, distance: np.ndarray, next_hop: np.ndarray):
+        """
+        Args:
+            goal: Posição objetivo
+            distance: Matriz (linhas, colunas) float64 com o custo até o
+                      objetivo (infinito se inalcançável)
+            next_hop: Matriz (linhas, colunas) com o índice plano da próxima
+                      célula rumo ao objetivo (-1 no objetivo e nas inalcançáveis)
+        """
+        self.goal = goal
+        self.distance = distance
+        self.next_hop = next_hop
+        self._next_hop_flat = memoryview(next_hop.ravel())
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays do campo"""
+        return self.distance.nbytes + self.next_hop.nbytes
+
+    def cost_from(self, start: Position) -> float:
+        """Custo do menor caminho de start até o objetivo (infinito se não houver)"""
+        return float(self.distance[start])
+
+    def path_from(self, start: Position) -> Optional[List[Position]]:
+        """
+        Caminho de start até o objetivo seguindo o campo.
+
+        Args:
+            start: Posição inicial
+
+        Returns:
+            Optional[List[Position]]: Caminho no formato de astar, ou None se o
+                                      objetivo for inalcançável
+        """
+        if self.distance[start] == np.inf:
+            return None
+        cols = self.distance.shape[1]
+        next_hop = self._next_hop_flat
+        path = [start]
+        idx = next_hop[start[0] * cols + start[1]]
+        while idx != -1:
+            path.append(divmod(idx, cols))
+            idx = next_hop[idx]
+        return path
+
+def build_distance_field(maze: Maze, goal: Optional[Position] = None) -> DistanceField:
+    """
+    Executa um Dijkstra reverso a partir do objetivo sobre todo o labirinto.
+
+    Args:
+        maze: Instância da classe Maze
+        goal: Posição objetivo (padrão: maze.end_pos)
+
+    Returns:
+        DistanceField: Campo de distâncias e próximos passos
+    """
+    goal = maze.end_pos if goal is None else _check_position(maze, goal)
+    cols = maze.cols
+    n_cells = maze.rows * cols
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    g_cost, parent, closed = _search_arrays(n_cells)
+    source = goal[0] * cols + goal[1]
+    open_set = []
+    if maze.is_valid_position(goal):  # Um objetivo intransitável não alcança nem a si mesmo
+        g_cost[source] = 0.0
+        open_set.append((0.0, source))
+
+    while open_set:
+        current_g, current = heapq.heappop(open_set)
+        if closed[current]:
+            continue
+        closed[current] = True
+
+        begin, end = indptr[current], indptr[current + 1]
+        for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+            new_g = current_g + cost
+            if new_g < g_cost[neighbor]:
+                g_cost[neighbor] = new_g
+                parent[neighbor] = current
+                heapq.heappush(open_set, (new_g, neighbor))
+
+    # O pai na árvore do Dijkstra reverso é o próximo passo rumo ao objetivo
+    distance = np.asarray(g_cost).reshape(maze.rows, cols)
+    index_dtype = np.int32 if n_cells < 2 ** 31 else np.int64
+    next_hop = np.array(parent, dtype=index_dtype).reshape(maze.rows, cols)
+    return DistanceField(goal, distance, next_hop)
+
+class DistanceFieldCache:
+    """
+    Cache LRU de campos de distância, limitado pelo total de bytes.
+
+    As entradas são indexadas por (impressão digital do labirinto, objetivo),
+    então labirintos distintos com o mesmo conteúdo compartilham campos.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Orçamento de memória para os campos guardados
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._fields: 'OrderedDict[Tuple[str, Position], DistanceField]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def get(self, maze: Maze, goal: Optional[Position] = None) -> DistanceField:
+        """
+        Retorna o campo do objetivo, calculando-o se não estiver no cache.
+
+        Args:
+            maze: Instância da classe Maze
+            goal: Posição objetivo (padrão: maze.end_pos)
+
+        Returns:
+            DistanceField: Campo de distâncias até o objetivo
+        """
+        goal = maze.end_pos if goal is None else _check_position(maze, goal)
+        key = (maze.fingerprint(), goal)
+        field = self._fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self._fields.move_to_end(key)
+            return field
+
+        self.misses += 1
+        field = build_distance_field(maze, goal)
+        if field.nbytes <= self.max_bytes:
+            # Remove os menos usados até caber no orçamento
+            while self.current_bytes + field.nbytes > self.max_bytes:
+                _, evicted = self._fields.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+            self._fields[key] = field
+            self.current_bytes += field.nbytes
+        return field
+
+    def clear(self):
+        """Remove todos os campos guardados"""
+        self._fields.clear()
+        self.current_bytes = 0
+
+# Cache compartilhado usado por distance_field_path
+default_cache = DistanceFieldCache()
+
+def distance_field_path(maze: Maze, start: Optional[Position] = None,
+                        goal: Optional[Position] = None,
+                        cache: Optional[DistanceFieldCache] = None) -> Optional[List[Position]]:
+    """
+    Menor caminho até o objetivo usando (e guardando) seu campo de distâncias.
+
+    A primeira consulta a um objetivo custa um Dijkstra completo; as seguintes,
+    de qualquer início, custam O(tamanho do caminho).
+
+    Args:
+        maze: Instância da classe Maze
+        start: Posição inicial (padrão: maze.start_pos)
+        goal: Posição objetivo (padrão: maze.end_pos)
+        cache: Cache a usar (padrão: default_cache)
+
+    Returns:
+        Optional[List[Position]]: Caminho no formato de astar, ou None
+    """
+    start = maze.start_pos if start is None else _check_position(maze, start)
+    cache = default_cache if cache is None else cache
+    return cache.get(maze, goal).path_from(start)
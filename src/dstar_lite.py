@@ -0,0 +1,270 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import math
+import numpy as np
+from .maze import Maze, NEIGHBOR_OFFSETS
+from .astar import _check_position
+from .heuristics import HeuristicSpec, LANDMARK_HEURISTIC, make_heuristic
+from .stats import SearchStats, ProgressCallback, PROGRESS_INTERVAL, report_progress
+
+Position = Tuple[int, int]
+Key = Tuple[float, float]
+
+# Tolerância nas comparações de chaves: somas de custos feitas em ordens
+# diferentes podem diferir no último bit
+KEY_EPSILON = 1e-9
+
+class DStarLite:
+    """
+    Planejador incremental D* Lite.
+
+    A busca parte do objetivo em direção ao início e mantém, entre chamadas,
+    os custos g e rhs de cada célula e a fila de prioridade. Depois de
+    update_cells, replan corrige apenas as células cujo custo foi afetado
+    pelas alterações, em vez de repetir a busca inteira.
+
+    O início pode mudar entre chamadas (replan(start=...)), como um agente
+    que anda pelo labirinto enquanto descobre obstáculos.
+    """
+
+    def __init__(self, maze: Maze, heuristic: HeuristicSpec = None,
+                 start: Optional[Position] = None, goal: Optional[Position] = None):
+        """
+        Prepara o planejador; a primeira busca acontece no primeiro replan.
+
+        Args:
+            maze: Instância da classe Maze (alterada por update_cells)
+            heuristic: Mesmas opções de astar, exceto 'alt' (as tabelas de
+                       landmarks só valem para o labirinto sem alterações)
+            start: Posição inicial (padrão: maze.start_pos)
+            goal: Posição objetivo (padrão: maze.end_pos)
+
+        Raises:
+            ValueError: Se a heurística for 'alt'
+        """
+        if heuristic == LANDMARK_HEURISTIC:
+            raise ValueError("D* Lite não aceita a heurística 'alt': o labirinto muda entre as buscas")
+        self.maze = maze
+        self.start = maze.start_pos if start is None else _check_position(maze, start)
+        self.goal = maze.end_pos if goal is None else _check_position(maze, goal)
+
+        # A heurística usa o menor peso que qualquer célula pode vir a ter, para
+        # continuar admissível depois de alterações no terreno
+        self._min_weight = min(
+            (weight for symbol, weight in maze.cell_weights.items()
+             if symbol != '#' and weight < math.inf),
+            default=1.0
+        )
+        self._heuristic = heuristic
+        self._h = make_heuristic(maze, heuristic, self.start, self._min_weight)
+
+        n_cells = maze.rows * maze.cols
+        self._weights = memoryview(maze.get_weight_grid().ravel().copy())
+        self._g = memoryview(np.full(n_cells, np.inf))
+        self._rhs = memoryview(np.full(n_cells, np.inf))
+        self._open: List[Tuple[float, float, int]] = []
+        self._open_keys = {}  # Chave atual de cada célula na fila
+        self._km = 0.0  # Acúmulo de h pelas mudanças de início
+        self._last_start = self._index(self.start)
+        self._changed: List[Position] = []
+        # Vizinhos já calculados; os das células em volta de uma alteração são descartados
+        self._neighbor_cache: Dict[int, List[Tuple[int, float]]] = {}
+
+        self._goal_idx = self._index(self.goal)
+        self._rhs[self._goal_idx] = 0.0
+        self._push(self._goal_idx)
+
+    def _index(self, pos: Position) -> int:
+        return pos[0] * self.maze.cols + pos[1]
+
+    def _neighbors(self, idx: int) -> List[Tuple[int, float]]:
+        """Vizinhos e custos de uma célula, pelas regras de Maze.get_neighbors e Maze.get_cost"""
+        cached = self._neighbor_cache.get(idx)
+        if cached is not None:
+            return cached
+        weights = self._weights
+        if weights[idx] == math.inf:
+            self._neighbor_cache[idx] = []
+            return []
+        rows, cols = self.maze.rows, self.maze.cols
+        row, col = divmod(idx, cols)
+        orthogonal = self.maze.movement_weights['orthogonal']
+        diagonal = self.maze.movement_weights['diagonal']
+        result = []
+        for dr, dc in NEIGHBOR_OFFSETS:
+            new_row, new_col = row + dr, col + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols):
+                continue
+            neighbor = new_row * cols + new_col
+            if weights[neighbor] == math.inf:
+                continue
+            if dr and dc:
+                # Sem cortar cantos: os dois ortogonais precisam ser transitáveis
+                if weights[new_row * cols + col] == math.inf or weights[row * cols + new_col] == math.inf:
+                    continue
+                base = diagonal
+            else:
+                base = orthogonal
+            result.append((neighbor, base * ((weights[idx] + weights[neighbor]) / 2)))
+        self._neighbor_cache[idx] = result
+        return result
+
+    def _key(self, idx: int) -> Key:
+        best = min(self._g[idx], self._rhs[idx])
+        return best + self._h(idx) + self._km, best
+
+    @staticmethod
+    def _key_less(a: Key, b: Key) -> bool:
+        """a < b na ordem lexicográfica, tratando como iguais valores dentro de KEY_EPSILON"""
+        if abs(a[0] - b[0]) > KEY_EPSILON:
+            return a[0] < b[0]
+        return a[1] < b[1] - KEY_EPSILON
+
+    def _push(self, idx: int):
+        key = self._key(idx)
+        self._open_keys[idx] = key
+        heapq.heappush(self._open, (key[0], key[1], idx))
+
+    def _top(self) -> Optional[Tuple[Key, int]]:
+        """Menor entrada válida da fila, descartando entradas obsoletas"""
+        open_set = self._open
+        while open_set:
+            k1, k2, idx = open_set[0]
+            if self._open_keys.get(idx) == (k1, k2):
+                return (k1, k2), idx
+            heapq.heappop(open_set)
+        return None
+
+    def _update_vertex(self, idx: int):
+        """Recalcula rhs de uma célula e a (re)coloca na fila se estiver inconsistente"""
+        if idx != self._goal_idx:
+            g = self._g
+            self._rhs[idx] = min((cost + g[neighbor] for neighbor, cost in self._neighbors(idx)),
+                                 default=math.inf)
+        if self._g[idx] != self._rhs[idx]:
+            self._push(idx)
+        else:
+            self._open_keys.pop(idx, None)
+
+    def _compute_shortest_path(self, progress: Optional[ProgressCallback] = None) -> int:
+        """
+        Processa a fila até o início ficar consistente; retorna o número de expansões.
+
+        Pode ser interrompido (SearchCancelled) entre duas expansões: a fila
+        continua com todas as células inconsistentes e a próxima chamada
+        retoma de onde parou.
+        """
+        g, rhs = self._g, self._rhs
+        start = self._index(self.start)
+        expanded = 0
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            key, current = top
+            if rhs[start] == g[start] and not self._key_less(key, self._key(start)):
+                break
+            new_key = self._key(current)
+            if self._key_less(key, new_key):
+                # A chave cresceu com km: recoloca com o valor atual
+                self._push(current)
+                continue
+
+            heapq.heappop(self._open)
+            del self._open_keys[current]
+            expanded += 1
+            if progress is not None and not expanded % PROGRESS_INTERVAL:
+                report_progress(progress, expanded, len(self._open_keys))
+            if g[current] > rhs[current]:
+                g[current] = rhs[current]
+                for neighbor, _ in self._neighbors(current):
+                    self._update_vertex(neighbor)
+            else:
+                g[current] = math.inf
+                self._update_vertex(current)
+                for neighbor, _ in self._neighbors(current):
+                    self._update_vertex(neighbor)
+        return expanded
+
+    def update_cells(self, changes: Iterable[Tuple[Position, str]]) -> List[Position]:
+        """
+        Altera células do labirinto; o caminho é corrigido no próximo replan.
+
+        Args:
+            changes: Pares ((linha, coluna), símbolo), como em Maze.set_cells
+
+        Returns:
+            List[Position]: Posições cujo conteúdo realmente mudou
+        """
+        changed = self.maze.set_cells(changes)
+        for pos in changed:
+            self._weights[self._index(pos)] = self.maze.cell_weight(pos)
+        self._changed.extend(changed)
+        return changed
+
+    def replan(self, start: Optional[Position] = None,
+               stats: Optional[SearchStats] = None,
+               progress: Optional[ProgressCallback] = None) -> Optional[List[Position]]:
+        """
+        Atualiza o menor caminho depois das alterações pendentes.
+
+        Args:
+            start: Nova posição inicial (padrão: mantém a atual)
+            stats: Se informado, recebe as expansões feitas nesta chamada
+            progress: Mesma função de progresso de astar; após um
+                      cancelamento, o próximo replan continua a busca
+
+        Returns:
+            Optional[List[Position]]: Caminho do início ao objetivo, ou None
+
+        Raises:
+            SearchCancelled: Se a função de progresso cancelar a busca
+        """
+        maze = self.maze
+        if start is not None:
+            self.start = _check_position(maze, start)
+            # Em vez de reordenar a fila, soma às chaves futuras a distância
+            # estimada entre o início anterior e o novo
+            self._h = make_heuristic(maze, self._heuristic, self.start, self._min_weight)
+            self._km += self._h(self._last_start)
+            self._last_start = self._index(self.start)
+
+        # Uma alteração muda as arestas da própria célula e as diagonais que
+        # passam pelo seu canto, todas com as duas pontas no bloco 3x3 em volta
+        affected = set()
+        for row, col in self._changed:
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if 0 <= row + dr < maze.rows and 0 <= col + dc < maze.cols:
+                        affected.add((row + dr) * maze.cols + col + dc)
+        self._changed = []
+        for idx in affected:
+            self._neighbor_cache.pop(idx, None)
+        for idx in affected:
+            self._update_vertex(idx)
+
+        expanded = self._compute_shortest_path(progress)
+        if stats is not None:
+            stats.nodes_expanded = expanded
+        return self._extract_path()
+
+    @property
+    def cost(self) -> float:
+        """Custo do caminho atual (infinito se não houver); válido após replan"""
+        if self._weights[self._goal_idx] == math.inf:
+            return math.inf  # Objetivo intransitável, mesmo com início igual ao fim
+        return self._g[self._index(self.start)]
+
+    def _extract_path(self) -> Optional[List[Position]]:
+        """Desce pelos valores de g do início até o objetivo"""
+        g = self._g
+        current = self._index(self.start)
+        goal = self._goal_idx
+        if self.cost == math.inf:
+            return None
+        cols = self.maze.cols
+        path = [divmod(current, cols)]
+        while current != goal:
+            current = min(self._neighbors(current), key=lambda item: item[1] + g[item[0]])[0]
+            path.append(divmod(current, cols))
+        return path
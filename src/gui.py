@@ -1,8 +1,105 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 from .maze import Maze
-from .astar import astar
+from .dstar_lite import DStarLite
+from .maze_io import load_maze
+from .solution_cache import MISSING, default_solution_cache, solution_key
+from .stats import ProgressCallback, SearchCancelled
+from .utils import TERRAIN_SYMBOLS, TERRAIN_CODES, START_CODE, END_CODE
+
+PATH_CODE = TERRAIN_CODES['*']
+FREE_CODE = TERRAIN_CODES['0']
+
+# Grades com até esta quantidade de células são desenhadas com um retângulo
+# por célula; as maiores, ou com um lado maior que VIEWPORT_SIZE (que teria
+# células de menos de um pixel), como uma imagem da área visível (viewport)
+ITEM_MODE_MAX_CELLS = 2500
+
+# Tamanho máximo do canvas (em pixels) e tamanho padrão de cada célula
+VIEWPORT_SIZE = 800
+DEFAULT_CELL_SIZE = 40
+
+# Escalas (pixels por célula) disponíveis no zoom do viewport
+ZOOM_LEVELS = (1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 40)
+
+# Intervalo (ms) entre as leituras dos eventos da resolução em andamento
+SOLVER_POLL_MS = 50
+
+def build_palette(colors: Dict[str, str]) -> np.ndarray:
+    """
+    Converte as cores '#RRGGBB' de cada símbolo em uma tabela RGB por código de terreno.
+
+    Args:
+        colors: Cor de cada símbolo de TERRAIN_SYMBOLS
+
+    Returns:
+        np.ndarray: Matriz uint8 (len(TERRAIN_SYMBOLS), 3)
+    """
+    return np.array([
+        [int(colors[symbol][i:i + 2], 16) for i in (1, 3, 5)] for symbol in TERRAIN_SYMBOLS
+    ], dtype=np.uint8)
+
+def fit_scale(rows: int, cols: int) -> float:
+    """Maior escala de ZOOM_LEVELS em que a grade inteira cabe no viewport"""
+    fitting = [scale for scale in ZOOM_LEVELS if max(rows, cols) * scale <= VIEWPORT_SIZE]
+    return fitting[-1] if fitting else ZOOM_LEVELS[0]
+
+def render_viewport(terrain: np.ndarray, palette: np.ndarray, top: int, left: int,
+                    scale: float, width: int, height: int) -> np.ndarray:
+    """
+    Desenha a área visível da grade como uma imagem RGB.
+
+    Com escala >= 1 cada célula vira um bloco de scale x scale pixels; com
+    escala < 1 apenas uma célula a cada 1/scale (em cada eixo) é amostrada.
+
+    Args:
+        terrain: Matriz uint8 de códigos de terreno
+        palette: Tabela de build_palette
+        top: Primeira linha visível
+        left: Primeira coluna visível
+        scale: Pixels por célula (um dos ZOOM_LEVELS)
+        width: Largura máxima da imagem em pixels
+        height: Altura máxima da imagem em pixels
+
+    Returns:
+        np.ndarray: Imagem uint8 (altura, largura, 3), recortada na borda da grade
+    """
+    if scale >= 1:
+        size = int(scale)
+        region = terrain[top:top + -(-height // size), left:left + -(-width // size)]
+        image = palette[region].repeat(size, axis=0).repeat(size, axis=1)
+        return image[:height, :width]
+    step = round(1 / scale)
+    return palette[terrain[top:top + height * step:step, left:left + width * step:step]]
+
+def cell_box(row: int, col: int, top: int, left: int,
+             scale: float) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Retângulo (x1, y1, x2, y2) de uma célula na imagem de render_viewport.
+
+    Returns:
+        Optional[Tuple[int, int, int, int]]: Retângulo, ou None se a célula
+        não aparece na imagem (fora da área visível ou não amostrada)
+    """
+    row, col = row - top, col - left
+    if row < 0 or col < 0:
+        return None
+    if scale >= 1:
+        size = int(scale)
+        return col * size, row * size, (col + 1) * size, (row + 1) * size
+    step = round(1 / scale)
+    if row % step or col % step:
+        return None
+    return col // step, row // step, col // step + 1, row // step + 1
+
+def ppm_image(image: np.ndarray) -> bytes:
+    """Codifica uma imagem RGB uint8 como PPM binário (aceito por tk.PhotoImage)"""
+    height, width = image.shape[:2]
+    return b'P6 %d %d 255\n' % (width, height) + np.ascontiguousarray(image).tobytes()
 
 class PathFinderGUI:
     def __init__(self, root: tk.Tk):
@@ -12,10 +109,29 @@ class PathFinderGUI:
         # Configurações do labirinto
         self.rows = 10
         self.cols = 10
-        self.cell_size = 40
-        self.maze_data: List[List[str]] = []
+        self.cell_size = DEFAULT_CELL_SIZE
+        self.terrain = np.zeros((self.rows, self.cols), dtype=np.uint8)
         self.start_pos = None
         self.end_pos = None
+
+        # Planejador incremental reaproveitado entre resoluções
+        self.planner: Optional[DStarLite] = None
+
+        # Estado do desenho: itens do canvas (grades pequenas) ou imagem da
+        # área visível (grades grandes), com a posição e a escala do viewport
+        self.cell_items: Optional[np.ndarray] = None
+        self.photo: Optional[tk.PhotoImage] = None
+        self.image_item: Optional[int] = None
+        self.view_top = 0
+        self.view_left = 0
+        self.scale = 1.0
+        self._pan_anchor: Optional[Tuple[int, int]] = None
+
+        # Resolução em andamento: a busca roda em uma thread e envia progresso
+        # e resultado por uma fila, lida na thread da interface via root.after
+        self.solver: Optional[threading.Thread] = None
+        self.solver_events: 'queue.Queue[Tuple[str, object]]' = queue.Queue()
+        self.cancel_event = threading.Event()
         
         # Cores
         self.colors = {
@@ -28,9 +144,21 @@ class PathFinderGUI:
             '#': '#000000',    # Preto para obstáculo
             '*': '#FFA500'     # Laranja para o caminho encontrado
         }
+        self.palette = build_palette(self.colors)
         
         self._init_ui()
         self._create_empty_maze()
+
+    @property
+    def solving(self) -> bool:
+        """Se há uma resolução em andamento"""
+        return self.solver is not None
+
+    @property
+    def image_mode(self) -> bool:
+        """Se a grade é desenhada como imagem do viewport"""
+        return (self.rows * self.cols > ITEM_MODE_MAX_CELLS
+                or max(self.rows, self.cols) > VIEWPORT_SIZE)
     
     def _init_ui(self):
         """Inicializa a interface do usuário"""
@@ -82,23 +210,39 @@ class PathFinderGUI:
             command=self._load_maze
         ).grid(row=len(tools)+4, column=0, pady=5)
         
-        ttk.Button(
+        self.solve_button = ttk.Button(
             controls_frame,
             text="Resolver",
             command=self._solve_maze
-        ).grid(row=len(tools)+5, column=0, pady=5)
+        )
+        self.solve_button.grid(row=len(tools)+5, column=0, pady=5)
         
         ttk.Button(
             controls_frame,
             text="Limpar",
             command=self._clear_maze
         ).grid(row=len(tools)+6, column=0, pady=5)
+
+        self.cancel_button = ttk.Button(
+            controls_frame,
+            text="Cancelar",
+            command=self._cancel_solve,
+            state='disabled'
+        )
+        self.cancel_button.grid(row=len(tools)+7, column=0, pady=5)
+
+        # Andamento da resolução (nós expandidos e tamanho da fronteira)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(controls_frame, textvariable=self.status_var, wraplength=180, font=("Arial", 8)).grid(row=len(tools)+8, column=0, pady=5)
+
+        ttk.Label(controls_frame, text="Em labirintos grandes, use a roda do mouse para zoom e o botão direito (ou as setas) para mover a visão.", wraplength=180, foreground="gray", font=("Arial", 7)).grid(row=len(tools)+9, column=0, pady=(10, 0))
         
         # Canvas para desenhar o labirinto
         self.canvas = tk.Canvas(
             self.maze_frame,
             width=self.cols * self.cell_size,
-            height=self.rows * self.cell_size
+            height=self.rows * self.cell_size,
+            highlightthickness=0
         )
         self.canvas.grid(row=0, column=0)
         
@@ -106,16 +250,49 @@ class PathFinderGUI:
         self.canvas.bind("<Button-1>", self._on_canvas_click)
         self.canvas.bind("<B1-Motion>", self._on_canvas_drag)
     
+        # Zoom (roda do mouse; Button-4/5 no X11) e deslocamento da visão
+        self.canvas.bind("<MouseWheel>", self._on_zoom)
+        self.canvas.bind("<Button-4>", self._on_zoom)
+        self.canvas.bind("<Button-5>", self._on_zoom)
+        self.canvas.bind("<Button-3>", self._on_pan_start)
+        self.canvas.bind("<B3-Motion>", self._on_pan_drag)
+        for key, direction in {'<Up>': (-1, 0), '<Down>': (1, 0),
+                               '<Left>': (0, -1), '<Right>': (0, 1)}.items():
+            self.root.bind(key, lambda event, direction=direction: self._on_pan_key(*direction))
+
     def _create_empty_maze(self):
         """Cria um labirinto vazio"""
-        self.maze_data = [['0' for _ in range(self.cols)] for _ in range(self.rows)]
+        self.terrain = np.full((self.rows, self.cols), FREE_CODE, dtype=np.uint8)
         self._draw_maze()
     
     def _draw_maze(self):
-        """Desenha o labirinto no canvas"""
+        """
+        Desenha o labirinto inteiro no canvas.
+
+        Só é chamado quando a grade é criada ou trocada; alterações de células
+        passam por _refresh_cells, que atualiza apenas o que mudou.
+        """
         self.canvas.delete("all")
+        self.cell_items = None
+        self.photo = None
+        self.image_item = None
         
-        # Desenha as células
+        if self.image_mode:
+            self.scale = fit_scale(self.rows, self.cols)
+            self.view_top = self.view_left = 0
+            self.canvas.config(
+                width=min(VIEWPORT_SIZE, max(1, int(self.cols * self.scale))),
+                height=min(VIEWPORT_SIZE, max(1, int(self.rows * self.scale)))
+            )
+            self._draw_viewport()
+            return
+
+        self.cell_size = min(DEFAULT_CELL_SIZE, VIEWPORT_SIZE // max(self.rows, self.cols))
+        self.canvas.config(width=self.cols * self.cell_size, height=self.rows * self.cell_size)
+
+        # Um retângulo e um texto por célula; os IDs são guardados para que
+        # alterações usem itemconfig em vez de recriar os itens
+        self.cell_items = np.zeros((self.rows, self.cols, 2), dtype=np.int64)
         for row in range(self.rows):
             for col in range(self.cols):
                 x1 = col * self.cell_size
@@ -123,35 +300,67 @@ class PathFinderGUI:
                 x2 = x1 + self.cell_size
                 y2 = y1 + self.cell_size
                 
-                cell_type = self.maze_data[row][col]
-                color = self.colors[cell_type]
-                
-                self.canvas.create_rectangle(
+                cell_type = TERRAIN_SYMBOLS[self.terrain[row, col]]
+                rect = self.canvas.create_rectangle(
                     x1, y1, x2, y2,
-                    fill=color,
+                    fill=self.colors[cell_type],
                     outline='gray'
                 )
                 
-                # Adiciona texto para início, fim e pesos
-                if cell_type in ['S', 'E']:
-                    self.canvas.create_text(
-                        (x1 + x2) / 2,
-                        (y1 + y2) / 2,
-                        text=cell_type,
-                        fill='black'
-                    )
-                elif cell_type in ['1', '2', '3']:
-                    self.canvas.create_text(
-                        (x1 + x2) / 2,
-                        (y1 + y2) / 2,
-                        text=cell_type,
-                        fill='black'
-                    )
+                # Texto para início, fim e pesos
+                text = self.canvas.create_text(
+                    (x1 + x2) / 2,
+                    (y1 + y2) / 2,
+                    text=self._cell_label(cell_type),
+                    fill='black'
+                )
+                self.cell_items[row, col] = (rect, text)
+
+    @staticmethod
+    def _cell_label(cell_type: str) -> str:
+        """Texto exibido sobre a célula (início, fim e pesos)"""
+        return cell_type if cell_type in ('S', 'E', '1', '2', '3') else ''
+
+    def _draw_viewport(self):
+        """Redesenha a imagem da área visível (após zoom, deslocamento ou troca da grade)"""
+        image = render_viewport(
+            self.terrain, self.palette, self.view_top, self.view_left, self.scale,
+            int(self.canvas.cget('width')), int(self.canvas.cget('height'))
+        )
+        if image.size == 0:
+            return
+        self.photo = tk.PhotoImage(master=self.root, data=ppm_image(image), format='PPM')
+        if self.image_item is None:
+            self.image_item = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        else:
+            self.canvas.itemconfig(self.image_item, image=self.photo)
+
+    def _refresh_cells(self, cells: Iterable[Tuple[int, int]]):
+        """Atualiza no canvas apenas as células informadas"""
+        for row, col in cells:
+            cell_type = TERRAIN_SYMBOLS[self.terrain[row, col]]
+            if self.cell_items is not None:
+                rect, text = self.cell_items[row, col].tolist()
+                self.canvas.itemconfig(rect, fill=self.colors[cell_type])
+                self.canvas.itemconfig(text, text=self._cell_label(cell_type))
+            elif self.photo is not None:
+                box = cell_box(row, col, self.view_top, self.view_left, self.scale)
+                if box is not None and box[0] < self.photo.width() and box[1] < self.photo.height():
+                    self.photo.put(self.colors[cell_type], to=box)
     
     def _get_cell_from_coords(self, event) -> Optional[tuple[int, int]]:
         """Converte coordenadas do mouse para posição na grade"""
-        col = event.x // self.cell_size
-        row = event.y // self.cell_size
+        if self.image_mode:
+            if self.scale >= 1:
+                row = self.view_top + int(event.y // self.scale)
+                col = self.view_left + int(event.x // self.scale)
+            else:
+                step = round(1 / self.scale)
+                row = self.view_top + event.y * step
+                col = self.view_left + event.x * step
+        else:
+            col = event.x // self.cell_size
+            row = event.y // self.cell_size
         
         if 0 <= row < self.rows and 0 <= col < self.cols:
             return row, col
@@ -171,43 +380,100 @@ class PathFinderGUI:
             if tool.startswith('path') or tool == 'wall':  # Permite arrasto para todos os tipos de terreno
                 self._update_cell(pos)
     
+    def _on_zoom(self, event):
+        """Aproxima ou afasta a visão mantendo a célula sob o cursor no lugar"""
+        if not self.image_mode:
+            return
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        level = ZOOM_LEVELS.index(self.scale) + (1 if zoom_in else -1)
+        if not 0 <= level < len(ZOOM_LEVELS):
+            return
+
+        pos = self._get_cell_from_coords(event)
+        self.scale = ZOOM_LEVELS[level]
+        if pos is not None:
+            self.view_top = pos[0] - int(event.y / self.scale)
+            self.view_left = pos[1] - int(event.x / self.scale)
+        self._pan_by(0, 0)
+
+    def _on_pan_start(self, event):
+        """Guarda o ponto de partida do arrasto com o botão direito"""
+        self._pan_anchor = (event.x, event.y)
+
+    def _on_pan_drag(self, event):
+        """Desloca a visão acompanhando o arrasto com o botão direito"""
+        if self._pan_anchor is None or not self.image_mode:
+            return
+        d_col = int((self._pan_anchor[0] - event.x) / self.scale)
+        d_row = int((self._pan_anchor[1] - event.y) / self.scale)
+        if d_row or d_col:
+            self._pan_anchor = (event.x, event.y)
+            self._pan_by(d_row, d_col)
+
+    def _on_pan_key(self, d_row: int, d_col: int):
+        """Desloca a visão um décimo do viewport na direção da seta"""
+        cells = max(1, int(VIEWPORT_SIZE / 10 / self.scale))
+        self._pan_by(d_row * cells, d_col * cells)
+
+    def _pan_by(self, d_row: int, d_col: int):
+        """Desloca a visão em linhas/colunas, mantendo-a dentro da grade"""
+        if not self.image_mode:
+            return
+        visible_rows = int(int(self.canvas.cget('height')) / self.scale)
+        visible_cols = int(int(self.canvas.cget('width')) / self.scale)
+        self.view_top = min(max(0, self.view_top + d_row), max(0, self.rows - visible_rows))
+        self.view_left = min(max(0, self.view_left + d_col), max(0, self.cols - visible_cols))
+        self._draw_viewport()
+
     def _update_cell(self, pos: tuple[int, int]):
         """Atualiza uma célula do labirinto"""
+        if self.solving:
+            return
         row, col = pos
         tool = self.tool_var.get()
+        changed = []
+
+        def set_code(cell: Tuple[int, int], code: int):
+            if self.terrain[cell] != code:
+                self.terrain[cell] = code
+                changed.append(cell)
         
         if tool == "start":
             # Remove início anterior
             if self.start_pos:
-                old_row, old_col = self.start_pos
-                self.maze_data[old_row][old_col] = '0'
+                set_code(self.start_pos, FREE_CODE)
+            if (row, col) == self.end_pos:
+                self.end_pos = None
             self.start_pos = (row, col)
-            self.maze_data[row][col] = 'S'
+            set_code((row, col), START_CODE)
             
         elif tool == "end":
             # Remove fim anterior
             if self.end_pos:
-                old_row, old_col = self.end_pos
-                self.maze_data[old_row][old_col] = '0'
+                set_code(self.end_pos, FREE_CODE)
+            if (row, col) == self.start_pos:
+                self.start_pos = None
             self.end_pos = (row, col)
-            self.maze_data[row][col] = 'E'
+            set_code((row, col), END_CODE)
             
         elif tool == "wall":
-            if self.maze_data[row][col] not in ['S', 'E']:
-                self.maze_data[row][col] = '#'
+            if self.terrain[row, col] not in (START_CODE, END_CODE):
+                set_code((row, col), TERRAIN_CODES['#'])
                 
         elif tool.startswith("path"):
-            if self.maze_data[row][col] not in ['S', 'E']:
+            if self.terrain[row, col] not in (START_CODE, END_CODE):
                 weight = tool[-1]  # Pega o último caractere (0, 1, 2 ou 3)
-                self.maze_data[row][col] = weight
+                set_code((row, col), TERRAIN_CODES[weight])
         
-        self._draw_maze()
+        self._refresh_cells(changed)
     
     def _load_maze(self):
-        """Carrega um labirinto a partir de um arquivo"""
+        """Carrega um labirinto a partir de um arquivo (texto ou binário)"""
+        if self.solving:
+            return
         file_path = filedialog.askopenfilename(
             title="Selecione um arquivo de labirinto",
-            filetypes=[("Arquivos de texto", "*.txt"), ("Todos os arquivos", "*.*")],
+            filetypes=[("Arquivos de labirinto", "*.txt *.maze"), ("Todos os arquivos", "*.*")],
             initialdir="examples"
         )
         
@@ -215,80 +481,135 @@ class PathFinderGUI:
             return
             
         try:
-            with open(file_path, 'r') as file:
-                lines = [line.strip() for line in file.readlines() if line.strip()]
-                
-            # Remove espaços em branco e caracteres de nova linha
-            maze_data = [line.split() for line in lines]
-            
-            # Debug: Mostra informações sobre o labirinto carregado
-            print(f"Número de linhas: {len(maze_data)}")
-            print(f"Número de colunas: {len(maze_data[0]) if maze_data else 0}")
-            
-            # Verifica se o labirinto tem o tamanho correto
-            if len(maze_data) != self.rows:
-                messagebox.showerror(
-                    "Erro",
-                    f"O labirinto deve ter {self.rows} linhas. Encontrado: {len(maze_data)}"
-                )
-                return
-                
-            if any(len(row) != self.cols for row in maze_data):
-                messagebox.showerror(
-                    "Erro",
-                    f"O labirinto deve ter {self.cols} colunas em cada linha"
-                )
-                return
-            
-            # Atualiza o labirinto
-            self.maze_data = maze_data
-            self.start_pos = None
-            self.end_pos = None
-            
-            # Encontra as posições de início e fim
-            for row in range(self.rows):
-                for col in range(self.cols):
-                    if self.maze_data[row][col] == 'S':
-                        self.start_pos = (row, col)
-                    elif self.maze_data[row][col] == 'E':
-                        self.end_pos = (row, col)
-            
-            self._draw_maze()
-            messagebox.showinfo("Sucesso", "Labirinto carregado com sucesso!")
-            
-        except Exception as e:
+            maze = load_maze(file_path)
+        except (OSError, ValueError) as e:
             messagebox.showerror("Erro", f"Erro ao carregar o labirinto: {str(e)}")
-            print(f"Erro detalhado: {str(e)}")  # Debug: Mostra o erro completo
+            return
+
+        # Atualiza o labirinto (uma cópia em memória, que a edição altera),
+        # ajustando a grade ao tamanho carregado
+        self.terrain = np.array(maze.terrain, dtype=np.uint8)
+        self.rows, self.cols = maze.rows, maze.cols
+        self.start_pos, self.end_pos = maze.start_pos, maze.end_pos
+
+        self._draw_maze()
+        messagebox.showinfo("Sucesso", "Labirinto carregado com sucesso!")
     
     def _solve_maze(self):
-        """Resolve o labirinto usando A*"""
+        """
+        Resolve o labirinto usando o planejador incremental (D* Lite).
+
+        A busca roda em uma thread separada para não travar a janela; o
+        andamento aparece abaixo dos botões e "Cancelar" interrompe a busca.
+        """
+        if self.solving:
+            return
+
+        # Limpa o caminho anterior
+        previous = np.argwhere(self.terrain == PATH_CODE)
+        self.terrain[self.terrain == PATH_CODE] = FREE_CODE
+        self._refresh_cells(map(tuple, previous.tolist()))
+
+        self.cancel_event.clear()
+        self.solver = threading.Thread(target=self._run_solver, daemon=True)
+        self.solve_button.state(['disabled'])
+        self.cancel_button.state(['!disabled'])
+        self.status_var.set("Resolvendo...")
+        self.solver.start()
+        self.root.after(SOLVER_POLL_MS, self._poll_solver)
+
+    def _run_solver(self):
+        """Executa _plan na thread de resolução, enviando os eventos pela fila"""
+        def progress(expanded: int, frontier: int) -> bool:
+            self.solver_events.put(('progress', (expanded, frontier)))
+            return not self.cancel_event.is_set()
+
         try:
-            # Limpa o caminho anterior
-            for row in range(self.rows):
-                for col in range(self.cols):
-                    if self.maze_data[row][col] == '*':
-                        self.maze_data[row][col] = '0'
-            
-            # Cria instância do labirinto
-            maze = Maze(self.maze_data)
-            
-            # Encontra o caminho
-            path = astar(maze)
-            
-            if path:
-                # Marca o caminho
-                for row, col in path[1:-1]:  # Ignora início e fim
-                    self.maze_data[row][col] = '*'
-                self._draw_maze()
-                messagebox.showinfo("Sucesso", "Caminho encontrado!")
+            self.solver_events.put(('done', self._plan(progress)))
+        except SearchCancelled:
+            self.solver_events.put(('cancelled', None))
+        except Exception as e:
+            # Qualquer falha precisa chegar à interface, senão a resolução
+            # nunca termina e os botões ficam bloqueados
+            self.solver_events.put(('error', str(e) or type(e).__name__))
+
+    def _poll_solver(self):
+        """Trata, na thread da interface, os eventos enviados pela resolução"""
+        while True:
+            try:
+                kind, value = self.solver_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                expanded, frontier = value
+                self.status_var.set(f"Expandidos: {expanded}  Fronteira: {frontier}")
             else:
-                messagebox.showwarning("Aviso", "Não foi possível encontrar um caminho!")
-                
-        except ValueError as e:
-            messagebox.showerror("Erro", str(e))
-    
+                self._finish_solve(kind, value)
+                return
+        self.root.after(SOLVER_POLL_MS, self._poll_solver)
+
+    def _finish_solve(self, kind: str, value):
+        """Mostra o resultado da resolução e libera a interface"""
+        self.solver.join()
+        self.solver = None
+        self.solve_button.state(['!disabled'])
+        self.cancel_button.state(['disabled'])
+        self.status_var.set("")
+
+        if kind == 'cancelled':
+            self.status_var.set("Resolução cancelada")
+        elif kind == 'error':
+            messagebox.showerror("Erro", value)
+        elif value:
+            # Marca o caminho
+            for row, col in value[1:-1]:  # Ignora início e fim
+                self.terrain[row, col] = PATH_CODE
+            self._refresh_cells(value[1:-1])
+            messagebox.showinfo("Sucesso", "Caminho encontrado!")
+        else:
+            messagebox.showwarning("Aviso", "Não foi possível encontrar um caminho!")
+
+    def _cancel_solve(self):
+        """Pede o cancelamento da resolução em andamento"""
+        if self.solving:
+            self.cancel_event.set()
+            self.status_var.set("Cancelando...")
+
+    def _plan(self, progress: Optional[ProgressCallback] = None) -> Optional[List[tuple[int, int]]]:
+        """
+        Resolve o labirinto atual, consultando antes o cache de soluções.
+
+        Se só o terreno mudou desde a última resolução, as células alteradas
+        são repassadas ao planejador incremental, que corrige apenas a parte
+        afetada do caminho; caso contrário (início, fim ou tamanho
+        diferentes), um novo planejador é criado. Um cancelamento via
+        progress mantém o planejador, e a próxima resolução continua a busca.
+        """
+        terrain = self.terrain.copy()
+        maze = Maze.from_terrain(terrain, write_through=True)
+        key = solution_key(maze, maze.start_pos, maze.end_pos)
+        path = default_solution_cache.lookup(key)
+        if path is not MISSING:
+            return path
+
+        planner = self.planner
+        if (planner is None or planner.maze.terrain.shape != terrain.shape
+                or (planner.start, planner.goal) != (maze.start_pos, maze.end_pos)):
+            self.planner = planner = DStarLite(maze)
+        else:
+            rows, cols = np.nonzero(planner.maze.terrain != terrain)
+            planner.update_cells(
+                ((row, col), TERRAIN_SYMBOLS[terrain[row, col]])
+                for row, col in zip(rows.tolist(), cols.tolist())
+            )
+        path = planner.replan(progress=progress)
+        default_solution_cache.store(key, path)
+        return path
+
     def _clear_maze(self):
         """Limpa o labirinto"""
+        if self.solving:
+            return
         self.start_pos = None
         self.end_pos = None
         self._create_empty_maze()
@@ -297,4 +618,4 @@ def run_gui():
     """Inicia a interface gráfica"""
     root = tk.Tk()
     app = PathFinderGUI(root)
-    root.mainloop() 
\ No newline at end of file
+    root.mainloop()
@@ -0,0 +1,121 @@
+from typing import Callable, Dict, Optional, Tuple, Union
+import math
+from .maze import Maze
+from .landmarks import get_landmarks
+
+# Heurística definida pelo usuário: recebe (posição, objetivo) e devolve a estimativa
+HeuristicFunction = Callable[[Tuple[int, int], Tuple[int, int]], float]
+HeuristicSpec = Union[None, str, HeuristicFunction]
+
+DEFAULT_HEURISTIC = 'octile'
+
+def _manhattan(dr, dc, orth, diag, minimum, sqrt):
+    """Soma dos deslocamentos; só é admissível sem movimentos diagonais baratos"""
+    return orth * (dr + dc)
+
+def _octile(dr, dc, orth, diag, minimum, sqrt):
+    """Passos diagonais enquanto possível, depois ortogonais"""
+    return orth * (dr + dc) + (diag - 2 * orth) * minimum(dr, dc)
+
+def _euclidean(dr, dc, orth, diag, minimum, sqrt):
+    """Distância em linha reta, escalada para nunca superestimar um passo"""
+    return min(orth, diag / math.sqrt(2)) * sqrt(dr * dr + dc * dc)
+
+def _zero(dr, dc, orth, diag, minimum, sqrt):
+    """Heurística nula: a busca se comporta como Dijkstra"""
+    return 0.0 * dr
+
+# As fórmulas recebem os deslocamentos absolutos, os custos mínimos de passo
+# (ver movement_scales) e as funções de mínimo e raiz a usar
+HEURISTICS: Dict[str, Callable] = {
+    'manhattan': _manhattan,
+    'octile': _octile,
+    'euclidean': _euclidean,
+    'zero': _zero,
+    'dijkstra': _zero,
+}
+
+# Heurística ALT: maior entre a octile e os limites dos landmarks do
+# labirinto (ver landmarks.py), calculados na primeira busca se o labirinto
+# não os trouxer carregados
+LANDMARK_HEURISTIC = 'alt'
+
+# Todos os nomes aceitos por make_heuristic
+HEURISTIC_NAMES = (*HEURISTICS, LANDMARK_HEURISTIC)
+
+# Heurísticas consistentes (h(a) <= custo(a, b) + h(b) em toda aresta), em
+# que f nunca diminui ao longo de um caminho; a manhattan superestima passos
+# diagonais e fica de fora
+CONSISTENT_HEURISTICS = ('octile', 'euclidean', 'zero', 'dijkstra', LANDMARK_HEURISTIC)
+
+def movement_scales(maze: Maze, min_weight: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Calcula o menor custo possível de um passo ortogonal e de um diagonal.
+
+    O custo de uma aresta é o peso do movimento vezes a média dos pesos das
+    duas células, então nunca é menor que o peso do movimento vezes o menor
+    peso de célula transitável do labirinto. Um passo diagonal também nunca
+    custa mais que dois ortogonais, já que só é permitido quando os dois
+    ortogonais adjacentes são transitáveis.
+
+    Args:
+        maze: Instância da classe Maze
+        min_weight: Menor peso de célula a considerar (padrão: o menor
+                    presente no labirinto)
+
+    Returns:
+        Tuple[float, float]: Custos mínimos (ortogonal, diagonal)
+    """
+    if min_weight is None:
+        min_weight = maze.min_cell_weight()
+    orth = maze.movement_weights['orthogonal'] * min_weight
+    diag = min(maze.movement_weights['diagonal'] * min_weight, 2 * orth)
+    return orth, diag
+
+def _formula(name: Optional[str]) -> Callable:
+    """Retorna a fórmula de uma heurística nomeada"""
+    if name is None:
+        name = DEFAULT_HEURISTIC
+    if name not in HEURISTICS:
+        raise ValueError(
+            f"Heurística desconhecida '{name}'. Opções: {', '.join(HEURISTIC_NAMES)}"
+        )
+    return HEURISTICS[name]
+
+def make_heuristic(maze: Maze, heuristic: HeuristicSpec = None,
+                   goal: Optional[Tuple[int, int]] = None,
+                   min_weight: Optional[float] = None) -> Callable[[int], float]:
+    """
+    Cria a função h(índice) usada pela busca.
+
+    Args:
+        maze: Instância da classe Maze
+        heuristic: Nome ('manhattan', 'octile', 'euclidean', 'zero'/'dijkstra',
+                   'alt'), função (posição, objetivo) -> float, ou None para a
+                   padrão (octile escalada pelo menor peso, a mais justa
+                   admissível entre as geométricas)
+        goal: Posição objetivo (padrão: maze.end_pos)
+        min_weight: Menor peso de célula usado na escala (ver movement_scales)
+
+    Returns:
+        Callable[[int], float]: Estimativa de custo a partir de um índice plano
+    """
+    if goal is None:
+        goal = maze.end_pos
+    cols = maze.cols
+
+    if callable(heuristic):
+        return lambda idx: heuristic(divmod(idx, cols), goal)
+    if heuristic == LANDMARK_HEURISTIC:
+        octile = make_heuristic(maze, 'octile', goal, min_weight)
+        return get_landmarks(maze).heuristic(goal, octile)
+
+    formula = _formula(heuristic)
+    orth, diag = movement_scales(maze, min_weight)
+    goal_row, goal_col = goal
+
+    def h(idx: int) -> float:
+        row, col = divmod(idx, cols)
+        return formula(abs(row - goal_row), abs(col - goal_col), orth, diag, min, math.sqrt)
+
+    return h
@@ -0,0 +1,431 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+import numpy as np
+from .maze import Adjacency, Maze, build_adjacency
+from .astar import astar, _check_position, _search_arrays
+from .heuristics import make_heuristic
+from .stats import SearchStats
+
+Position = Tuple[int, int]
+Cluster = Tuple[int, int]
+BorderKey = Tuple[str, int, int]
+
+# Entradas com pelo menos este comprimento ganham uma transição em cada ponta
+LONG_ENTRANCE = 6
+
+class HierarchicalPathfinder:
+    """
+    Busca hierárquica (HPA*) para grades muito grandes.
+
+    O labirinto é dividido em clusters quadrados. Em cada fronteira entre
+    clusters vizinhos, cada trecho contínuo de células transitáveis dos dois
+    lados (entrada) ganha uma transição no meio, ou duas nas pontas se for
+    longo. O grafo abstrato liga as transições de um mesmo cluster pelo custo
+    do menor caminho dentro dele e as duas células de cada transição pelo
+    custo do passo que cruza a fronteira.
+
+    Uma consulta conecta o início e o fim às transições dos seus clusters,
+    busca no grafo abstrato e refina apenas os trechos usados pelo caminho
+    abstrato (com cache dos refinamentos). O resultado é quase ótimo: use
+    deviation para medir a diferença em relação ao A*.
+
+    Alterações no labirinto devem passar por update_cells; alterações feitas
+    diretamente com Maze.set_cells não são vistas pelo grafo abstrato.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = 16):
+        """
+        Pré-processa o labirinto.
+
+        Args:
+            maze: Instância da classe Maze
+            cluster_size: Lado (em células) de cada cluster
+        """
+        if cluster_size < 2:
+            raise ValueError("O tamanho do cluster deve ser pelo menos 2")
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.cluster_rows = math.ceil(maze.rows / cluster_size)
+        self.cluster_cols = math.ceil(maze.cols / cluster_size)
+        self._weights = maze.get_weight_grid()
+
+        self._borders: Dict[BorderKey, List[Tuple[int, int]]] = {}
+        self._intra: Dict[Cluster, Dict[Tuple[int, int], float]] = {}
+        self._refined: Dict[Cluster, Dict[Tuple[int, int], List[int]]] = {}
+        self._graph: Dict[int, Dict[int, float]] = {}
+
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                for key in self._cluster_borders((cluster_row, cluster_col)):
+                    if key not in self._borders:
+                        self._borders[key] = self._find_transitions(key)
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                self._build_cluster((cluster_row, cluster_col))
+        self._build_graph()
+
+    # Geometria dos clusters
+
+    def cluster_of(self, idx: int) -> Cluster:
+        """Cluster que contém a célula de índice plano idx"""
+        row, col = divmod(idx, self.maze.cols)
+        return row // self.cluster_size, col // self.cluster_size
+
+    def _bounds(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """Limites (linha inicial, linha final, coluna inicial, coluna final) do cluster"""
+        size = self.cluster_size
+        row0, col0 = cluster[0] * size, cluster[1] * size
+        return row0, min(row0 + size, self.maze.rows), col0, min(col0 + size, self.maze.cols)
+
+    def _cluster_borders(self, cluster: Cluster) -> List[BorderKey]:
+        """Fronteiras do cluster: ('h', r, c) separa (r, c) de (r + 1, c); ('v', r, c) separa (r, c) de (r, c + 1)"""
+        cluster_row, cluster_col = cluster
+        borders = []
+        if cluster_row > 0:
+            borders.append(('h', cluster_row - 1, cluster_col))
+        if cluster_row < self.cluster_rows - 1:
+            borders.append(('h', cluster_row, cluster_col))
+        if cluster_col > 0:
+            borders.append(('v', cluster_row, cluster_col - 1))
+        if cluster_col < self.cluster_cols - 1:
+            borders.append(('v', cluster_row, cluster_col))
+        return borders
+
+    def _find_transitions(self, key: BorderKey) -> List[Tuple[int, int]]:
+        """
+        Encontra as transições de uma fronteira.
+
+        Basta considerar travessias ortogonais: como as diagonais não cortam
+        cantos, qualquer caminho pode ser trocado por um que cruza as
+        fronteiras ortogonalmente.
+
+        Returns:
+            List[Tuple[int, int]]: Pares (célula de um lado, célula do outro) em índices planos
+        """
+        orientation, cluster_row, cluster_col = key
+        cols = self.maze.cols
+        passable = self._weights < np.inf
+        row0, row1, col0, col1 = self._bounds((cluster_row, cluster_col))
+        if orientation == 'h':
+            line = np.arange(col0, col1)
+            open_crossing = passable[row1 - 1, col0:col1] & passable[row1, col0:col1]
+            pair = lambda c: ((row1 - 1) * cols + c, row1 * cols + c)
+        else:
+            line = np.arange(row0, row1)
+            open_crossing = passable[row0:row1, col1 - 1] & passable[row0:row1, col1]
+            pair = lambda r: (r * cols + col1 - 1, r * cols + col1)
+
+        # Trechos contínuos de travessias abertas
+        edges = np.diff(np.concatenate(([0], open_crossing.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+
+        transitions = []
+        for first, last in zip(starts.tolist(), ends.tolist()):
+            if last - first + 1 >= LONG_ENTRANCE:
+                transitions += [pair(int(line[first])), pair(int(line[last]))]
+            else:
+                transitions.append(pair(int(line[(first + last) // 2])))
+        return transitions
+
+    def _transitions_of(self, cluster: Cluster) -> List[int]:
+        """Células de transição que pertencem ao cluster"""
+        cells = []
+        for key in self._cluster_borders(cluster):
+            for a, b in self._borders[key]:
+                for cell in (a, b):
+                    if self.cluster_of(cell) == cluster and cell not in cells:
+                        cells.append(cell)
+        return cells
+
+    # Buscas locais
+
+    def _local_adjacency(self, cluster: Cluster) -> Adjacency:
+        """Tabela de adjacência restrita ao cluster (índices locais)"""
+        row0, row1, col0, col1 = self._bounds(cluster)
+        return build_adjacency(
+            self._weights[row0:row1, col0:col1],
+            self.maze.movement_weights['orthogonal'],
+            self.maze.movement_weights['diagonal']
+        )
+
+    def _to_local(self, cluster: Cluster, idx: int) -> int:
+        """Converte um índice plano global em índice local do cluster"""
+        row0, _, col0, col1 = self._bounds(cluster)
+        row, col = divmod(idx, self.maze.cols)
+        return (row - row0) * (col1 - col0) + col - col0
+
+    def _to_global(self, cluster: Cluster, local: int) -> int:
+        """Converte um índice local do cluster em índice plano global"""
+        row0, _, col0, col1 = self._bounds(cluster)
+        row, col = divmod(local, col1 - col0)
+        return (row0 + row) * self.maze.cols + col0 + col
+
+    def _local_search(self, cluster: Cluster, source: int, targets: Iterable[int],
+                      adjacency: Optional[Adjacency] = None):
+        """
+        Dijkstra restrito ao cluster, parando quando todos os alvos são fechados.
+
+        Args:
+            cluster: Cluster onde a busca acontece
+            source: Índice plano (global) de partida
+            targets: Índices planos (globais) a alcançar
+            adjacency: Tabela de _local_adjacency, para reaproveitá-la entre buscas
+
+        Returns:
+            Custos, pais e marcas de fechado (memoryviews indexadas por índice local)
+        """
+        if adjacency is None:
+            adjacency = self._local_adjacency(cluster)
+        indptr, indices, edge_costs = (memoryview(a) for a in adjacency)
+        g_cost, parent, closed = _search_arrays(len(indptr) - 1)
+
+        local_source = self._to_local(cluster, source)
+        remaining = {self._to_local(cluster, idx) for idx in targets}
+        g_cost[local_source] = 0.0
+        open_set = [(0.0, local_source)]
+
+        while open_set and remaining:
+            current_g, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue
+            closed[current] = True
+            remaining.discard(current)
+
+            begin, end = indptr[current], indptr[current + 1]
+            for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+                new_g = current_g + cost
+                if new_g < g_cost[neighbor]:
+                    g_cost[neighbor] = new_g
+                    parent[neighbor] = current
+                    heapq.heappush(open_set, (new_g, neighbor))
+        return g_cost, parent, closed
+
+    def _local_costs(self, cluster: Cluster, source: int, targets: Iterable[int],
+                     adjacency: Optional[Adjacency] = None) -> Dict[int, float]:
+        """Custo de source até cada alvo alcançável dentro do cluster"""
+        targets = list(targets)
+        g_cost, _, closed = self._local_search(cluster, source, targets, adjacency)
+        costs = {}
+        for target in targets:
+            local = self._to_local(cluster, target)
+            if closed[local]:
+                costs[target] = g_cost[local]
+        return costs
+
+    def _build_cluster(self, cluster: Cluster):
+        """Calcula as arestas internas (transição a transição) de um cluster"""
+        transitions = self._transitions_of(cluster)
+        edges = {}
+        adjacency = self._local_adjacency(cluster) if len(transitions) > 1 else None
+        for i, source in enumerate(transitions[:-1]):
+            for target, cost in self._local_costs(cluster, source, transitions[i + 1:], adjacency).items():
+                edges[(source, target)] = cost
+        self._intra[cluster] = edges
+        self._refined[cluster] = {}
+
+    def _border_edges(self, transitions: List[Tuple[int, int]]) -> Dict[Tuple[int, int], float]:
+        """Arestas que cruzam uma fronteira, com o custo do passo ortogonal"""
+        orthogonal = self.maze.movement_weights['orthogonal']
+        flat_weights = self._weights.ravel()
+        return {(a, b): orthogonal * ((flat_weights[a] + flat_weights[b]) / 2)
+                for a, b in transitions}
+
+    def _link(self, edges: Dict[Tuple[int, int], float]):
+        """Acrescenta arestas (nos dois sentidos) ao grafo abstrato"""
+        graph = self._graph
+        for (a, b), cost in edges.items():
+            graph.setdefault(a, {})[b] = cost
+            graph.setdefault(b, {})[a] = cost
+
+    def _unlink(self, edges: Iterable[Tuple[int, int]]):
+        """Remove arestas do grafo abstrato, e os nós que ficarem sem arestas"""
+        graph = self._graph
+        for a, b in edges:
+            for node, other in ((a, b), (b, a)):
+                neighbors = graph.get(node)
+                if neighbors is not None:
+                    neighbors.pop(other, None)
+                    if not neighbors:
+                        del graph[node]
+
+    def _build_graph(self):
+        """Monta o grafo abstrato a partir das fronteiras e dos clusters"""
+        self._graph = {}
+        for transitions in self._borders.values():
+            self._link(self._border_edges(transitions))
+        for edges in self._intra.values():
+            self._link(edges)
+
+    # Atualização
+
+    def update_cells(self, changes: Iterable[Tuple[Position, str]]) -> Set[Cluster]:
+        """
+        Altera células do labirinto e reconstrói apenas os clusters afetados.
+
+        Um cluster é reconstruído se contém uma célula alterada ou se as
+        transições de uma de suas fronteiras mudaram. No grafo abstrato só
+        são trocadas as arestas internas desses clusters e as das suas
+        fronteiras; o restante do grafo não é percorrido.
+
+        Args:
+            changes: Pares ((linha, coluna), símbolo), como em Maze.set_cells
+
+        Returns:
+            Set[Cluster]: Clusters reconstruídos
+        """
+        changed = self.maze.set_cells(changes)
+        if not changed:
+            return set()
+        weight_grid = self.maze.get_weight_grid()
+        for row, col in changed:
+            self._weights[row, col] = weight_grid[row, col]
+
+        size = self.cluster_size
+        rebuild = {(row // size, col // size) for row, col in changed}
+        old_borders: Dict[BorderKey, List[Tuple[int, int]]] = {}
+        for cluster in list(rebuild):
+            for key in self._cluster_borders(cluster):
+                transitions = self._find_transitions(key)
+                if transitions != self._borders[key]:
+                    old_borders.setdefault(key, self._borders[key])
+                    self._borders[key] = transitions
+                    orientation, cluster_row, cluster_col = key
+                    rebuild.add((cluster_row, cluster_col))
+                    if orientation == 'h':
+                        rebuild.add((cluster_row + 1, cluster_col))
+                    else:
+                        rebuild.add((cluster_row, cluster_col + 1))
+
+        # As arestas de fronteira dependem dos pesos das duas pontas, que
+        # ficam em clusters reconstruídos se mudaram: basta refazer as
+        # fronteiras desses clusters
+        keys = {key for cluster in rebuild for key in self._cluster_borders(cluster)}
+        for key in keys:
+            self._unlink(old_borders.get(key, self._borders[key]))
+        for cluster in rebuild:
+            self._unlink(self._intra[cluster])
+            self._build_cluster(cluster)
+            self._link(self._intra[cluster])
+        for key in keys:
+            self._link(self._border_edges(self._borders[key]))
+        return rebuild
+
+    # Consultas
+
+    def find_path(self, start: Optional[Position] = None, goal: Optional[Position] = None,
+                  stats: Optional[SearchStats] = None) -> Optional[List[Position]]:
+        """
+        Encontra um caminho quase ótimo pelo grafo abstrato.
+
+        Args:
+            start: Posição inicial (padrão: maze.start_pos)
+            goal: Posição final (padrão: maze.end_pos)
+            stats: Se informado, recebe o número de nós abstratos expandidos
+
+        Returns:
+            Optional[List[Position]]: Caminho no formato de astar, ou None
+        """
+        maze = self.maze
+        start = maze.start_pos if start is None else _check_position(maze, start)
+        goal = maze.end_pos if goal is None else _check_position(maze, goal)
+        if not maze.connected(start, goal):
+            return None
+        if start == goal:
+            return [start]
+
+        cols = maze.cols
+        source = start[0] * cols + start[1]
+        target = goal[0] * cols + goal[1]
+        start_cluster = self.cluster_of(source)
+        goal_cluster = self.cluster_of(target)
+
+        # Liga início e fim às transições dos seus clusters (e entre si, se
+        # estiverem no mesmo cluster)
+        start_targets = set(self._transitions_of(start_cluster))
+        if start_cluster == goal_cluster:
+            start_targets.add(target)
+        start_edges = self._local_costs(start_cluster, source, start_targets)
+        goal_edges = self._local_costs(goal_cluster, target, self._transitions_of(goal_cluster))
+
+        def neighbors(node: int):
+            yield from self._graph.get(node, {}).items()
+            if node == source:
+                yield from start_edges.items()
+            if node in goal_edges:
+                yield target, goal_edges[node]
+
+        h_func = make_heuristic(maze, None, goal)
+        g_cost = {source: 0.0}
+        parent = {source: -1}
+        closed = set()
+        open_set = [(h_func(source), source)]
+        expanded = 0
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            if current == target:
+                break
+            closed.add(current)
+            expanded += 1
+            current_g = g_cost[current]
+            for neighbor, cost in neighbors(current):
+                new_g = current_g + cost
+                if new_g < g_cost.get(neighbor, math.inf):
+                    g_cost[neighbor] = new_g
+                    parent[neighbor] = current
+                    closed.discard(neighbor)
+                    heapq.heappush(open_set, (new_g + h_func(neighbor), neighbor))
+
+        if stats is not None:
+            stats.nodes_expanded = expanded
+        if target not in g_cost:
+            return None
+
+        abstract_path = [target]
+        while parent[abstract_path[-1]] != -1:
+            abstract_path.append(parent[abstract_path[-1]])
+        abstract_path.reverse()
+        return [divmod(idx, cols) for idx in self._refine(abstract_path)]
+
+    def _refine(self, abstract_path: List[int]) -> List[int]:
+        """Transforma o caminho abstrato em um caminho célula a célula"""
+        path = [abstract_path[0]]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(b)  # Passo que cruza a fronteira
+                continue
+            cache = self._refined[cluster]
+            if (a, b) not in cache:
+                _, parent, _ = self._local_search(cluster, a, [b])
+                segment = []
+                local = self._to_local(cluster, b)
+                while local != -1:
+                    segment.append(self._to_global(cluster, local))
+                    local = parent[local]
+                segment.reverse()
+                cache[(a, b)] = segment
+            path.extend(cache[(a, b)][1:])
+        return path
+
+    def deviation(self, start: Optional[Position] = None, goal: Optional[Position] = None) -> float:
+        """
+        Mede quanto o caminho hierárquico fica acima do ótimo.
+
+        Executa também o A* exato, então serve para avaliação e não para
+        consultas interativas.
+
+        Returns:
+            float: (custo HPA* / custo ótimo) - 1; 0.0 se ótimo ou se não há caminho
+        """
+        path = self.find_path(start, goal)
+        optimal = astar(self.maze, start=start, goal=goal)
+        if path is None or optimal is None:
+            return 0.0
+        cost = self.maze.path_cost(path)
+        optimal_cost = self.maze.path_cost(optimal)
+        return cost / optimal_cost - 1 if optimal_cost > 0 else 0.0
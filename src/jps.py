@@ -0,0 +1,407 @@
+from typing import List, Optional, Tuple
+import heapq
+import numpy as np
+from .maze import Maze, NEIGHBOR_OFFSETS
+from .astar import _check_position
+from .heuristics import HeuristicSpec, make_heuristic
+from .stats import SearchStats
+
+def _shift(grid: np.ndarray, dr: int, dc: int) -> np.ndarray:
+    """Retorna out[r, c] = grid[r + dr, c + dc], preenchendo com zero fora dos limites"""
+    rows, cols = grid.shape
+    out = np.zeros_like(grid)
+    out[max(0, -dr):rows - max(0, dr), max(0, -dc):cols - max(0, dc)] = \
+        grid[max(0, dr):rows - max(0, -dr), max(0, dc):cols - max(0, -dc)]
+    return out
+
+class JumpPointSearch:
+    """
+    Jump Point Search (JPS) e JPS+ sobre um Maze, sem cortar cantos.
+
+    Em regiões de custo uniforme a busca "salta" ao longo de linhas retas e
+    diagonais e só insere na fila os pontos de salto (células com vizinhos
+    forçados por obstáculos), eliminando a expansão de caminhos simétricos.
+    Uma célula só participa dos saltos se ela e todos os seus vizinhos
+    transitáveis tiverem o mesmo peso; as demais (terrenos '1'-'3' e suas
+    bordas) são expandidas vizinho a vizinho como no A*, o que mantém os
+    caminhos ótimos em mapas mistos.
+
+    Com plus=True as distâncias de salto das 8 direções são pré-calculadas
+    (JPS+), trocando a varredura de cada salto por uma leitura de tabela ao
+    custo de 8 inteiros por célula.
+
+    O grid é representado internamente com uma borda de obstáculos, o que
+    dispensa testes de limite nos laços de salto.
+    """
+
+    def __init__(self, maze: Maze, plus: bool = False):
+        """
+        Prepara as estruturas de salto do labirinto.
+
+        Args:
+            maze: Instância da classe Maze
+            plus: Se True, pré-calcula as tabelas de distância de salto (JPS+)
+        """
+        self.maze = maze
+        self.plus = plus
+        self.width = width = maze.cols + 2
+
+        weights = np.full((maze.rows + 2, width), np.inf)
+        weights[1:-1, 1:-1] = maze.get_weight_grid()
+        walk = weights < np.inf
+
+        # Célula elegível: transitável e com todos os vizinhos transitáveis
+        # de mesmo peso
+        eligible = walk.copy()
+        for dr, dc in NEIGHBOR_OFFSETS:
+            neighbor_walk = _shift(walk, dr, dc)
+            same_weight = _shift(weights, dr, dc) == weights
+            eligible &= ~neighbor_walk | same_weight
+
+        self._walk = bytearray(walk.ravel().tobytes())
+        self._eligible = bytearray(eligible.ravel().tobytes())
+        self._weights = memoryview(weights.ravel())
+
+        self._directions = NEIGHBOR_OFFSETS
+        self._steps = [dr * width + dc for dr, dc in NEIGHBOR_OFFSETS]
+        self._direction_index = {d: k for k, d in enumerate(NEIGHBOR_OFFSETS)}
+        self._base_costs = [
+            maze.movement_weights['diagonal'] if dr and dc else maze.movement_weights['orthogonal']
+            for dr, dc in NEIGHBOR_OFFSETS
+        ]
+
+        self._tables = None
+        if plus:
+            self._tables = [memoryview(table.ravel()) for table in self._build_tables(walk, eligible)]
+
+    @staticmethod
+    def _straight_table(walk: np.ndarray, eligible: np.ndarray, dr: int) -> np.ndarray:
+        """
+        Distâncias de salto na vertical (direção dr) para todas as células.
+
+        Valor positivo d: o salto para em um ponto de salto a d passos.
+        Valor d <= 0: é possível andar -d passos até um obstáculo, sem ponto
+        de salto. A direção horizontal é obtida com a matriz transposta.
+        """
+        rows = walk.shape[0]
+        forced = np.zeros_like(walk)
+        for side in (-1, 1):
+            forced |= _shift(walk, 0, side) & ~_shift(walk, -dr, side)
+        stop = walk & (~eligible | forced)
+
+        table = np.zeros(walk.shape, dtype=np.int32)
+        order = range(rows - 2, -1, -1) if dr > 0 else range(1, rows)
+        for i in order:
+            nxt = table[i + dr]
+            value = np.where(stop[i + dr], 1, np.where(nxt > 0, nxt + 1, nxt - 1))
+            table[i] = np.where(walk[i + dr], value, 0)
+        return table
+
+    @staticmethod
+    def _diagonal_table(walk: np.ndarray, eligible: np.ndarray, dr: int, dc: int,
+                        horizontal: np.ndarray, vertical: np.ndarray) -> np.ndarray:
+        """
+        Distâncias de salto na diagonal (dr, dc), no mesmo formato das retas.
+
+        Uma célula da diagonal é ponto de salto se não for elegível ou se um
+        dos saltos retos que partem dela (componentes da diagonal) encontrar
+        um ponto de salto.
+        """
+        rows = walk.shape[0]
+        stop = walk & (~eligible | (horizontal > 0) | (vertical > 0))
+        step_ok = _shift(walk, dr, dc) & _shift(walk, dr, 0) & _shift(walk, 0, dc)
+        stop_next = _shift(stop, 0, dc)
+
+        table = np.zeros(walk.shape, dtype=np.int32)
+        order = range(rows - 2, -1, -1) if dr > 0 else range(1, rows)
+        for i in order:
+            nxt = np.zeros_like(table[i])
+            if dc > 0:
+                nxt[:-1] = table[i + dr, 1:]
+            else:
+                nxt[1:] = table[i + dr, :-1]
+            value = np.where(stop_next[i + dr], 1, np.where(nxt > 0, nxt + 1, nxt - 1))
+            table[i] = np.where(step_ok[i], value, 0)
+        return table
+
+    def _build_tables(self, walk: np.ndarray, eligible: np.ndarray) -> List[np.ndarray]:
+        """Pré-calcula as tabelas JPS+ na ordem de NEIGHBOR_OFFSETS"""
+        straight = {}
+        for dr in (-1, 1):
+            straight[(dr, 0)] = self._straight_table(walk, eligible, dr)
+            straight[(0, dr)] = self._straight_table(walk.T, eligible.T, dr).T
+        tables = []
+        for dr, dc in NEIGHBOR_OFFSETS:
+            if dr and dc:
+                table = self._diagonal_table(walk, eligible, dr, dc,
+                                             straight[(0, dc)], straight[(dr, 0)])
+            else:
+                table = straight[(dr, dc)]
+            tables.append(table)
+
+        dtype = np.int16 if max(walk.shape) < np.iinfo(np.int16).max else np.int32
+        return [np.ascontiguousarray(table, dtype=dtype) for table in tables]
+
+    def _jump_straight(self, x: int, step: int, side: int, goal: int) -> int:
+        """
+        Varre em linha reta a partir de x até um ponto de salto.
+
+        Args:
+            x: Índice (com borda) de partida
+            step: Deslocamento de um passo na direção do salto
+            side: Deslocamento perpendicular (para detectar vizinhos forçados)
+            goal: Índice do objetivo
+
+        Returns:
+            int: Índice do ponto de salto, ou -1 se a linha termina em obstáculo
+        """
+        walk = self._walk
+        eligible = self._eligible
+        cur = x
+        while True:
+            cur += step
+            if not walk[cur]:
+                return -1
+            if cur == goal or not eligible[cur]:
+                return cur
+            if ((walk[cur + side] and not walk[cur + side - step]) or
+                    (walk[cur - side] and not walk[cur - side - step])):
+                return cur
+
+    def _jump_diagonal(self, x: int, row_step: int, col_step: int, goal: int) -> int:
+        """Varre na diagonal a partir de x até um ponto de salto (ou -1)"""
+        walk = self._walk
+        eligible = self._eligible
+        width = self.width
+        step = row_step + col_step
+        cur = x
+        while True:
+            # Não corta cantos: os dois ortogonais precisam ser transitáveis
+            if not (walk[cur + row_step] and walk[cur + col_step] and walk[cur + step]):
+                return -1
+            cur += step
+            if cur == goal or not eligible[cur]:
+                return cur
+            if (self._jump_straight(cur, col_step, width, goal) != -1 or
+                    self._jump_straight(cur, row_step, 1, goal) != -1):
+                return cur
+
+    def _jump(self, x: int, k: int, goal: int) -> Tuple[int, int]:
+        """Salta na direção k usando varredura (JPS); retorna (índice, passos)"""
+        dr, dc = self._directions[k]
+        step = self._steps[k]
+        if dr and dc:
+            target = self._jump_diagonal(x, dr * self.width, dc, goal)
+        elif dr:
+            target = self._jump_straight(x, step, 1, goal)
+        else:
+            target = self._jump_straight(x, step, self.width, goal)
+        if target == -1:
+            return -1, 0
+        return target, (target - x) // step
+
+    def _jump_plus(self, x: int, k: int, goal: int) -> Tuple[int, int]:
+        """Salta na direção k usando as tabelas pré-calculadas (JPS+)"""
+        value = self._tables[k][x]
+        reach = value if value > 0 else -value
+        dr, dc = self._directions[k]
+        row, col = divmod(x, self.width)
+        goal_row, goal_col = divmod(goal, self.width)
+        delta_row = (goal_row - row) * dr
+        delta_col = (goal_col - col) * dc
+
+        # O objetivo depende da consulta, então é tratado aqui e não na tabela
+        if dr and dc:
+            if delta_row > 0 and delta_col > 0:
+                steps = min(delta_row, delta_col)
+                if steps <= reach:
+                    return x + steps * self._steps[k], steps
+        elif dr:
+            if goal_col == col and 0 < delta_row <= reach:
+                return goal, delta_row
+        elif goal_row == row and 0 < delta_col <= reach:
+            return goal, delta_col
+
+        if value > 0:
+            return x + value * self._steps[k], value
+        return -1, 0
+
+    def _pruned_directions(self, x: int, parent: int) -> List[int]:
+        """Direções a explorar a partir de x dado o sentido de chegada"""
+        width = self.width
+        walk = self._walk
+        index = self._direction_index
+        x_row, x_col = divmod(x, width)
+        p_row, p_col = divmod(parent, width)
+        dr = (x_row > p_row) - (x_row < p_row)
+        dc = (x_col > p_col) - (x_col < p_col)
+
+        if dr and dc:
+            return [index[(dr, 0)], index[(0, dc)], index[(dr, dc)]]
+
+        directions = [index[(dr, dc)]]
+        if dc:
+            for side in (-1, 1):
+                if walk[x + side * width] and not walk[x + side * width - dc]:
+                    directions += [index[(side, 0)], index[(side, dc)]]
+        else:
+            for side in (-1, 1):
+                if walk[x + side] and not walk[x + side - dr * width]:
+                    directions += [index[(0, side)], index[(dr, side)]]
+        return directions
+
+    def find_path(self, start: Optional[Tuple[int, int]] = None,
+                  goal: Optional[Tuple[int, int]] = None,
+                  heuristic: HeuristicSpec = None,
+                  stats: Optional[SearchStats] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+        Encontra o menor caminho entre duas posições.
+
+        Args:
+            start: Posição inicial (padrão: maze.start_pos)
+            goal: Posição final (padrão: maze.end_pos)
+            heuristic: Mesmas opções de astar
+            stats: Se informado, recebe os contadores da busca
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: Caminho célula a célula, no mesmo
+                                            formato de astar, ou None
+
+        Raises:
+            ValueError: Se start ou goal estiver fora do labirinto
+        """
+        maze = self.maze
+        start = maze.start_pos if start is None else _check_position(maze, start)
+        goal = maze.end_pos if goal is None else _check_position(maze, goal)
+        if not maze.connected(start, goal):
+            return None  # Componentes diferentes: resposta imediata
+        width, cols = self.width, maze.cols
+        source = (start[0] + 1) * width + start[1] + 1
+        target = (goal[0] + 1) * width + goal[1] + 1
+
+        walk = self._walk
+        eligible = self._eligible
+        weights = self._weights
+        steps = self._steps
+        base_costs = self._base_costs
+        jump = self._jump_plus if self.plus else self._jump
+        all_directions = range(len(steps))
+        h_func = make_heuristic(maze, heuristic, goal)
+
+        n_cells = len(walk)
+        g_array = np.full(n_cells, np.inf)
+        parent_array = np.full(n_cells, -1, dtype=np.int64)
+        closed_array = np.zeros(n_cells, dtype=np.bool_)
+        g_cost = memoryview(g_array)
+        parent = memoryview(parent_array)
+        closed = memoryview(closed_array)
+
+        def h(x: int) -> float:
+            row, col = divmod(x, width)
+            return h_func((row - 1) * cols + col - 1)
+
+        h_start = h(source)
+        g_cost[source] = 0.0
+        open_set = [(h_start, h_start, source)]
+        expanded = 0
+        found = False
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue
+            if current == target:
+                found = True
+                break
+
+            closed[current] = True
+            expanded += 1
+            current_g = g_cost[current]
+            current_weight = weights[current]
+            current_parent = parent[current]
+
+            if not eligible[current]:
+                # Fora de região uniforme: expansão normal, vizinho a vizinho
+                for k, (dr, dc) in enumerate(self._directions):
+                    neighbor = current + steps[k]
+                    if not walk[neighbor]:
+                        continue
+                    if dr and dc and not (walk[current + dr * width] and walk[current + dc]):
+                        continue
+                    new_g = current_g + base_costs[k] * ((current_weight + weights[neighbor]) / 2)
+                    if new_g < g_cost[neighbor]:
+                        g_cost[neighbor] = new_g
+                        parent[neighbor] = current
+                        closed[neighbor] = False
+                        h_neighbor = h(neighbor)
+                        heapq.heappush(open_set, (new_g + h_neighbor, h_neighbor, neighbor))
+                continue
+
+            if current_parent == -1 or not eligible[current_parent]:
+                directions = all_directions
+            else:
+                directions = self._pruned_directions(current, current_parent)
+
+            for k in directions:
+                neighbor, n_steps = jump(current, k, target)
+                if neighbor == -1:
+                    continue
+                # Passos internos em terreno uniforme e o último até o ponto de salto
+                base = base_costs[k]
+                cost = base * current_weight * (n_steps - 1) + base * ((current_weight + weights[neighbor]) / 2)
+                new_g = current_g + cost
+                if new_g < g_cost[neighbor]:
+                    g_cost[neighbor] = new_g
+                    parent[neighbor] = current
+                    closed[neighbor] = False
+                    h_neighbor = h(neighbor)
+                    heapq.heappush(open_set, (new_g + h_neighbor, h_neighbor, neighbor))
+
+        if stats is not None:
+            stats.nodes_expanded = expanded
+        if not found:
+            return None
+        return self._unpack_path(parent, target)
+
+    def _unpack_path(self, parent, target: int) -> List[Tuple[int, int]]:
+        """Expande a sequência de pontos de salto em um caminho célula a célula"""
+        width = self.width
+        jump_points = []
+        node = target
+        while node != -1:
+            jump_points.append(divmod(node, width))
+            node = parent[node]
+        jump_points.reverse()
+
+        path = [(jump_points[0][0] - 1, jump_points[0][1] - 1)]
+        for (r1, c1), (r2, c2) in zip(jump_points, jump_points[1:]):
+            dr = (r2 > r1) - (r2 < r1)
+            dc = (c2 > c1) - (c2 < c1)
+            row, col = r1, c1
+            while (row, col) != (r2, c2):
+                row += dr
+                col += dc
+                path.append((row - 1, col - 1))
+        return path
+
+def jps(maze: Maze, heuristic: HeuristicSpec = None, plus: bool = False,
+        stats: Optional[SearchStats] = None) -> Optional[List[Tuple[int, int]]]:
+    """
+    Encontra o menor caminho com Jump Point Search.
+
+    O pré-processamento fica guardado na instância do labirinto e é
+    reaproveitado em chamadas seguintes.
+
+    Args:
+        maze: Instância da classe Maze representando o labirinto
+        heuristic: Mesmas opções de astar
+        plus: Se True, usa JPS+ (distâncias de salto pré-calculadas)
+        stats: Se informado, recebe os contadores da busca
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: Lista de posições representando o caminho,
+                                        ou None se não houver solução
+    """
+    key = 'jps+' if plus else 'jps'
+    solver = maze.cached(key, lambda: JumpPointSearch(maze, plus=plus))
+    return solver.find_path(heuristic=heuristic, stats=stats)
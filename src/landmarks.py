@@ -0,0 +1,268 @@
+from typing import Callable, List, Optional, Tuple
+import heapq
+import os
+import struct
+import numpy as np
+from .maze import Maze
+
+Position = Tuple[int, int]
+
+# Número padrão de landmarks: cada um ocupa 4 bytes por célula
+DEFAULT_LANDMARKS = 8
+
+# Chave das tabelas entre as estruturas derivadas do labirinto (Maze.cached)
+LANDMARKS_KEY = 'landmarks'
+
+# Extensão do arquivo de tabelas gravado ao lado do labirinto
+LANDMARKS_EXTENSION = '.alt'
+
+# Formato do arquivo de tabelas (little-endian):
+#   cabeçalho   magic, versão, nº de landmarks, linhas, colunas
+#   impressão   impressão digital do labirinto (16 bytes, ver Maze.fingerprint)
+#   posições    (linha, coluna) uint32 de cada landmark
+#   folgas      um float64 por landmark (ver Landmarks)
+#   distâncias  nº de landmarks * linhas * colunas float32, em ordem de landmark
+LANDMARKS_MAGIC = b'PFLM'
+LANDMARKS_VERSION = 1
+_HEADER = struct.Struct('<4sHHII16s')
+
+def distances_from(maze: Maze, source: Position) -> np.ndarray:
+    """
+    Custo exato do menor caminho de uma célula até todas as outras (Dijkstra).
+
+    Como as arestas custam o mesmo nos dois sentidos, também é a distância
+    de cada célula até source.
+
+    Args:
+        maze: Instância da classe Maze
+        source: Posição transitável de origem
+
+    Returns:
+        np.ndarray: Array plano float64 (infinito nas inalcançáveis)
+    """
+    cols = maze.cols
+    adjacency = maze.get_adjacency()
+    indptr = memoryview(adjacency.indptr)
+    indices = memoryview(adjacency.indices)
+    edge_costs = memoryview(adjacency.costs)
+
+    distance_array = np.full(maze.rows * cols, np.inf)
+    distance = memoryview(distance_array)
+    start = source[0] * cols + source[1]
+    distance[start] = 0.0
+    open_set = [(0.0, start)]
+
+    while open_set:
+        current_d, current = heapq.heappop(open_set)
+        if current_d > distance[current]:
+            continue  # Entrada obsoleta
+        begin, end = indptr[current], indptr[current + 1]
+        for neighbor, cost in zip(indices[begin:end], edge_costs[begin:end]):
+            new_d = current_d + cost
+            if new_d < distance[neighbor]:
+                distance[neighbor] = new_d
+                heapq.heappush(open_set, (new_d, neighbor))
+
+    return distance_array
+
+class Landmarks:
+    """
+    Tabelas de distâncias exatas a partir de alguns landmarks (heurística ALT).
+
+    Pela desigualdade triangular, para qualquer landmark L,
+    |d(L, objetivo) - d(L, u)| nunca supera o custo de u até o objetivo. A
+    heurística é o maior desses limites (e da octile), consistente como as
+    geométricas, mas muito mais justa em labirintos com paredes, em que o
+    caminho real contorna obstáculos que a distância geométrica ignora.
+
+    As distâncias são guardadas em float32 para caber em mapas grandes; a
+    folga de cada landmark cobre o arredondamento, para que o limite nunca
+    superestime.
+    """
+
+    def __init__(self, positions: List[Position], distances: np.ndarray,
+                 fingerprint: str, shape: Tuple[int, int],
+                 slack: Optional[np.ndarray] = None):
+        """
+        Args:
+            positions: Posição de cada landmark
+            distances: Array (landmarks, linhas * colunas) float32 de distâncias
+            fingerprint: Impressão digital do labirinto das tabelas
+            shape: Dimensões (linhas, colunas) do labirinto
+            slack: Folga de cada landmark (padrão: calculada das distâncias)
+        """
+        self.positions = positions
+        self.distances = distances
+        self.fingerprint = fingerprint
+        self.shape = shape
+        if slack is None:
+            # Erro de arredondamento de uma diferença: até dois ulps da maior distância
+            largest = [row[row < np.inf].max(initial=0.0) for row in distances]
+            slack = np.array([2 * float(np.spacing(np.float32(value))) for value in largest])
+        self.slack = np.asarray(slack, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelas tabelas"""
+        return self.distances.nbytes
+
+    def matches(self, maze: Maze) -> bool:
+        """Verifica se as tabelas foram calculadas para este labirinto"""
+        return self.shape == (maze.rows, maze.cols) and self.fingerprint == maze.fingerprint()
+
+    def _terms(self, goal: Position) -> List[tuple]:
+        """(tabela, distância do objetivo, folga) dos landmarks que alcançam o objetivo"""
+        target = goal[0] * self.shape[1] + goal[1]
+        return [(memoryview(row), float(row[target]), float(slack))
+                for row, slack in zip(self.distances, self.slack) if row[target] < np.inf]
+
+    def heuristic(self, goal: Position,
+                  base: Optional[Callable[[int], float]] = None) -> Callable[[int], float]:
+        """
+        Cria a função h(índice) rumo a um objetivo.
+
+        Args:
+            goal: Posição objetivo
+            base: Heurística combinada pelo máximo (em geral a octile), usada
+                  também quando nenhum landmark alcança o objetivo
+
+        Returns:
+            Callable[[int], float]: Estimativa de custo a partir de um índice
+                                    plano (infinito se a célula não alcança
+                                    o objetivo)
+        """
+        terms = self._terms(goal)
+        if base is None:
+            base = lambda idx: 0.0
+
+        def h(idx: int) -> float:
+            best = base(idx)
+            for table, target, slack in terms:
+                bound = table[idx] - target
+                if bound < 0:
+                    bound = -bound
+                bound -= slack
+                if bound > best:
+                    best = bound
+            return best
+
+        return h
+
+    def attach(self, maze: Maze) -> 'Landmarks':
+        """
+        Associa as tabelas ao labirinto, para a heurística 'alt' usá-las.
+
+        Raises:
+            ValueError: Se as tabelas forem de outro labirinto
+        """
+        if not self.matches(maze):
+            raise ValueError("As tabelas de landmarks não são deste labirinto")
+        return maze.cached(LANDMARKS_KEY, lambda: self)
+
+def select_landmarks(maze: Maze, count: int = DEFAULT_LANDMARKS) -> Landmarks:
+    """
+    Escolhe landmarks por seleção do ponto mais distante e calcula as tabelas.
+
+    Os landmarks ficam no maior componente conexo (consultas em outros
+    componentes usam só a heurística geométrica). O primeiro é a célula mais
+    distante de uma célula qualquer do componente; cada seguinte é a célula
+    cuja distância ao landmark mais próximo já escolhido é a maior, o que
+    espalha os landmarks pela periferia do mapa. Custa um Dijkstra completo
+    por landmark, mais um para o primeiro.
+
+    Args:
+        maze: Instância da classe Maze
+        count: Número de landmarks (menos, se o componente for pequeno)
+
+    Returns:
+        Landmarks: Tabelas de distâncias dos landmarks escolhidos
+    """
+    cols = maze.cols
+    cells = maze.get_components().largest()
+    positions: List[Position] = []
+    tables: List[np.ndarray] = []
+
+    if cells.size and count > 0:
+        # Distância de cada célula do componente ao landmark mais próximo
+        nearest = distances_from(maze, divmod(int(cells[0]), cols))[cells]
+        for _ in range(count):
+            best = int(np.argmax(nearest))
+            if positions and nearest[best] <= 0:
+                break  # Todas as células do componente já são landmarks
+            position = divmod(int(cells[best]), cols)
+            table = distances_from(maze, position)
+            positions.append(position)
+            tables.append(table.astype(np.float32))
+            nearest = table[cells] if len(positions) == 1 else np.minimum(nearest, table[cells])
+
+    distances = np.array(tables, dtype=np.float32).reshape(len(tables), maze.rows * cols)
+    return Landmarks(positions, distances, maze.fingerprint(), (maze.rows, maze.cols))
+
+def get_landmarks(maze: Maze, count: int = DEFAULT_LANDMARKS) -> Landmarks:
+    """
+    Retorna as tabelas associadas ao labirinto, calculando-as na primeira vez.
+
+    Tabelas carregadas com o labirinto (load_landmarks, load_maze) são
+    reaproveitadas; set_cells as descarta junto das demais estruturas.
+    """
+    return maze.cached(LANDMARKS_KEY, lambda: select_landmarks(maze, count))
+
+def landmarks_path(maze_path: str) -> str:
+    """Arquivo de tabelas gravado ao lado de um arquivo de labirinto"""
+    return maze_path + LANDMARKS_EXTENSION
+
+def save_landmarks(landmarks: Landmarks, path: str) -> None:
+    """
+    Grava as tabelas de landmarks.
+
+    Args:
+        landmarks: Tabelas a gravar
+        path: Arquivo de destino (em geral landmarks_path(arquivo do labirinto))
+    """
+    rows, cols = landmarks.shape
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(LANDMARKS_MAGIC, LANDMARKS_VERSION, len(landmarks), rows, cols,
+                                bytes.fromhex(landmarks.fingerprint)))
+        np.array(landmarks.positions, dtype='<u4').reshape(len(landmarks), 2).tofile(file)
+        landmarks.slack.astype('<f8').tofile(file)
+        np.ascontiguousarray(landmarks.distances, dtype='<f4').tofile(file)
+
+def load_landmarks(path: str, maze: Optional[Maze] = None) -> Landmarks:
+    """
+    Carrega tabelas de landmarks mapeando as distâncias direto do arquivo.
+
+    Args:
+        path: Arquivo gravado por save_landmarks
+        maze: Se informado, as tabelas são conferidas e associadas a ele
+
+    Returns:
+        Landmarks: Tabelas com as distâncias em np.memmap (somente leitura)
+
+    Raises:
+        ValueError: Se o arquivo for inválido ou de outro labirinto
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:4] != LANDMARKS_MAGIC:
+            raise ValueError(f"Arquivo '{path}' não é uma tabela de landmarks")
+        magic, version, count, rows, cols, fingerprint = _HEADER.unpack(header)
+        if version != LANDMARKS_VERSION:
+            raise ValueError(f"Versão {version} do formato de landmarks não suportada")
+        positions = np.fromfile(file, dtype='<u4', count=2 * count).reshape(count, 2)
+        slack = np.fromfile(file, dtype='<f8', count=count)
+
+    offset = _HEADER.size + positions.nbytes + slack.nbytes
+    expected = offset + 4 * count * rows * cols
+    if os.path.getsize(path) != expected:
+        raise ValueError(f"Arquivo '{path}' truncado: esperados {expected} bytes")
+    distances = (np.memmap(path, dtype='<f4', mode='r', offset=offset, shape=(count, rows * cols))
+                 if count else np.zeros((0, rows * cols), dtype=np.float32))
+
+    landmarks = Landmarks([tuple(pos) for pos in positions.tolist()], distances,
+                          fingerprint.hex(), (rows, cols), slack)
+    if maze is not None:
+        landmarks.attach(maze)
+    return landmarks
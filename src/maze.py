@@ -1,6 +1,83 @@
-from typing import List, Tuple, Optional, Dict
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, List, Mapping, Tuple, Optional, Dict, NamedTuple, TypeVar
+import hashlib
 import numpy as np
-from .utils import validate_maze, find_points
+from .utils import encode_maze, validate_terrain, find_points, TERRAIN_SYMBOLS, TERRAIN_CODES, WALL_CODE
+from .components import ComponentIndex
+
+# Deslocamentos (linha, coluna) dos vizinhos, na mesma ordem de get_neighbors:
+# primeiro os ortogonais, depois os diagonais
+NEIGHBOR_OFFSETS = (
+    (-1, 0), (1, 0), (0, -1), (0, 1),
+    (-1, -1), (-1, 1), (1, -1), (1, 1)
+)
+
+T = TypeVar('T')
+
+class Adjacency(NamedTuple):
+    """
+    Tabela de adjacência no formato CSR sobre índices planos.
+
+    Os vizinhos da célula i são indices[indptr[i]:indptr[i + 1]] e o custo de
+    cada aresta está na mesma posição de costs.
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    costs: np.ndarray
+
+def build_adjacency(weights: np.ndarray, orthogonal: float, diagonal: float) -> Adjacency:
+    """
+    Constrói a tabela CSR de vizinhos e custos de uma grade de pesos.
+
+    Aplica as regras de Maze.get_neighbors (diagonais sem cortar cantos) e os
+    custos de Maze.get_cost, de forma vetorizada. Células intransitáveis não
+    têm vizinhos.
+
+    Args:
+        weights: Matriz (linhas, colunas) float64 com o peso de cada célula
+                 (infinito para intransitáveis)
+        orthogonal: Peso de um movimento ortogonal
+        diagonal: Peso de um movimento diagonal
+
+    Returns:
+        Adjacency: Arrays indptr, indices e costs sobre índices planos da grade
+    """
+    rows, cols = weights.shape
+    n_cells = rows * cols
+    passable = weights < np.inf
+
+    # Bordas falsas evitam testes de limite nos deslocamentos
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.bool_)
+    padded[1:-1, 1:-1] = passable
+
+    def shifted(dr: int, dc: int) -> np.ndarray:
+        return padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+
+    edge_mask = np.empty((rows, cols, len(NEIGHBOR_OFFSETS)), dtype=np.bool_)
+    for k, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+        mask = passable & shifted(dr, dc)
+        if dr and dc:
+            # Diagonal só é permitida se os dois ortogonais forem válidos
+            mask &= shifted(dr, 0) & shifted(0, dc)
+        edge_mask[:, :, k] = mask
+    edge_mask = edge_mask.reshape(n_cells, len(NEIGHBOR_OFFSETS))
+
+    indptr = np.zeros(n_cells + 1, dtype=np.int64)
+    np.cumsum(edge_mask.sum(axis=1), out=indptr[1:])
+
+    # np.nonzero percorre em ordem de linha: origem e depois direção
+    sources, directions = np.nonzero(edge_mask)
+    flat_offsets = np.array([dr * cols + dc for dr, dc in NEIGHBOR_OFFSETS])
+    index_dtype = np.int32 if n_cells < 2 ** 31 else np.int64
+    indices = (sources + flat_offsets[directions]).astype(index_dtype)
+
+    base_costs = np.array([
+        diagonal if dr and dc else orthogonal for dr, dc in NEIGHBOR_OFFSETS
+    ], dtype=np.float64)
+    flat_weights = weights.ravel()
+    costs = base_costs[directions] * ((flat_weights[sources] + flat_weights[indices]) / 2)
+
+    return Adjacency(indptr, indices, costs)
 
 class Maze:
     def __init__(self, maze_data: List[List[str]], cell_weights: Optional[Dict[str, float]] = None):
@@ -15,24 +92,69 @@ class Maze:
                       '#': Obstáculo
             cell_weights: Dicionário com pesos para cada tipo de célula
         """
-        # Valida o labirinto
-        is_valid, error_msg = validate_maze(maze_data)
-        if not is_valid:
-            raise ValueError(error_msg)
-        
-        self.maze = maze_data
-        self.rows = len(maze_data)
-        self.cols = len(maze_data[0])
-        self.start_pos, self.end_pos = find_points(maze_data)
+        # Converte e valida o labirinto em uma única passada vetorizada
+        terrain = encode_maze(maze_data)
+        self._setup(terrain, cell_weights)
+        self._maze = maze_data
+        self._copy_on_write = False  # A matriz foi criada aqui
+
+    @classmethod
+    def from_terrain(cls, terrain: np.ndarray, cell_weights: Optional[Dict[str, float]] = None,
+                     points: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None,
+                     write_through: bool = False) -> 'Maze':
+        """
+        Cria um labirinto diretamente a partir de uma matriz de códigos de terreno.
+
+        A matriz não é copiada, o que permite usar arrays mapeados em memória
+        ou somente leitura: maze.terrain é a própria matriz recebida. Por
+        padrão, o primeiro set_cells que altera alguma célula troca
+        maze.terrain por uma cópia, e a matriz de quem chamou (ou o arquivo
+        mapeado) continua intacta. Com write_through=True, set_cells grava
+        na própria matriz.
+
+        Args:
+            terrain: Matriz uint8 com os códigos de TERRAIN_SYMBOLS
+            cell_weights: Dicionário com pesos para cada tipo de célula
+            points: Posições (início, fim) já conhecidas; se informadas, a
+                    matriz é usada como está, sem ser validada nem percorrida
+            write_through: Se True, as alterações de set_cells são gravadas
+                           na matriz recebida
+
+        Returns:
+            Maze: Labirinto equivalente
+
+        Raises:
+            ValueError: Se a matriz for inválida, ou somente leitura com
+                        write_through=True
+        """
+        terrain = np.asanyarray(terrain)
+        if terrain.dtype != np.uint8:
+            raise ValueError(f"A matriz de terreno deve ser uint8, encontrado: {terrain.dtype}")
+        if write_through and not terrain.flags.writeable:
+            raise ValueError("write_through=True exige uma matriz de terreno gravável")
+        if points is None:
+            validate_terrain(terrain)
+        maze = cls.__new__(cls)
+        maze._setup(terrain, cell_weights, points)
+        maze._maze = None
+        maze._copy_on_write = not write_through
+        return maze
+
+    def _setup(self, terrain: np.ndarray, cell_weights: Optional[Dict[str, float]],
+               points: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None):
+        """Inicializa os atributos comuns a partir da matriz de terreno já validada"""
+        self.terrain = terrain
+        self.rows, self.cols = terrain.shape
+        self.start_pos, self.end_pos = find_points(terrain) if points is None else points
         
         # Pesos para diferentes tipos de movimento
-        self.movement_weights = {
+        self._movement_weights: Mapping[str, float] = MappingProxyType({
             'orthogonal': 1,  # Movimento ortogonal (cima, baixo, esquerda, direita)
             'diagonal': 1.4   # Movimento diagonal (aproximadamente √2)
-        }
+        })
         
         # Pesos para diferentes tipos de célula
-        self.cell_weights = cell_weights or {
+        self._cell_weights: Mapping[str, float] = MappingProxyType(dict(cell_weights or {
             'S': 1.0,  # Início
             'E': 1.0,  # Fim
             '0': 1.0,  # Caminho normal
@@ -40,11 +162,135 @@ class Maze:
             '2': 3.0,  # Terreno muito difícil
             '3': 4.0,  # Terreno extremamente difícil
             '#': float('inf')  # Obstáculo
-        }
-        
-        # Converte para matriz numpy para melhor performance
-        self.maze_array = np.array(maze_data)
+        }))
+
+        # Representações derivadas construídas sob demanda
+        self._maze_array: Optional[np.ndarray] = None
+        self._derived: Dict[str, Any] = {}
+        self._reset_weights()
+
+    def _reset_weights(self):
+        """Recalcula a tabela de pesos e descarta o que foi derivado dos pesos antigos"""
+        # Peso de cada código de terreno; obstáculos e símbolos sem peso
+        # definido são intransitáveis
+        self._weight_table = np.array([
+            self._cell_weights.get(symbol, np.inf) if code != WALL_CODE else np.inf
+            for code, symbol in enumerate(TERRAIN_SYMBOLS)
+        ], dtype=np.float64)
+        self._cost_array: Optional[np.ndarray] = None
+        self._adjacency: Optional[Adjacency] = None
+        self._components: Optional[ComponentIndex] = None
+        self._min_weight: Optional[float] = None
+        self._derived.clear()
+
+    @property
+    def movement_weights(self) -> Mapping[str, float]:
+        """
+        Pesos dos movimentos 'orthogonal' e 'diagonal' (somente leitura).
+
+        Para mudá-los, atribua um novo dicionário: as estruturas derivadas
+        (adjacência, caches de solucionadores) são descartadas.
+        """
+        return self._movement_weights
+
+    @movement_weights.setter
+    def movement_weights(self, weights: Mapping[str, float]):
+        self._movement_weights = MappingProxyType(dict(weights))
+        self._reset_weights()
+
+    @property
+    def cell_weights(self) -> Mapping[str, float]:
+        """
+        Peso de cada símbolo de célula (somente leitura).
+
+        Para mudá-los, atribua um novo dicionário: as estruturas derivadas
+        (adjacência, componentes, caches de solucionadores) são descartadas.
+        """
+        return self._cell_weights
+
+    @cell_weights.setter
+    def cell_weights(self, weights: Mapping[str, float]):
+        self._cell_weights = MappingProxyType(dict(weights))
+        self._reset_weights()
+
+    @property
+    def maze(self) -> List[List[str]]:
+        """Matriz 2D de caracteres do labirinto (gerada sob demanda se necessário)"""
+        if self._maze is None:
+            self._maze = self.maze_array.tolist()
+        return self._maze
+
+    @property
+    def cost_array(self) -> np.ndarray:
+        """Matriz float32 com o custo de cada célula (gerada sob demanda)"""
+        if self._cost_array is None:
+            self._cost_array = self._weight_table.astype(np.float32)[self.terrain]
+        return self._cost_array
+
+    @property
+    def maze_array(self) -> np.ndarray:
+        """Matriz NumPy de caracteres do labirinto (gerada sob demanda)"""
+        if self._maze_array is None:
+            self._maze_array = np.array(TERRAIN_SYMBOLS)[self.terrain]
+        return self._maze_array
     
+    def set_cells(self, changes: Iterable[Tuple[Tuple[int, int], str]]) -> List[Tuple[int, int]]:
+        """
+        Altera o tipo de algumas células do labirinto.
+
+        As estruturas derivadas (adjacência, caches de solucionadores) são
+        descartadas e reconstruídas sob demanda; o índice de componentes,
+        se já existir, é atualizado incrementalmente. O início e o fim não
+        podem ser sobrescritos nem movidos por aqui.
+
+        Num labirinto criado por from_terrain, a primeira alteração copia a
+        matriz de terreno, que pode pertencer a quem chamou, estar mapeada de
+        um arquivo ou ser somente leitura; só com write_through=True a
+        alteração é feita na própria matriz.
+
+        Args:
+            changes: Pares ((linha, coluna), símbolo), com símbolo entre
+                     '0'-'3', '#' e '*'
+
+        Returns:
+            List[Tuple[int, int]]: Posições cujo conteúdo realmente mudou
+
+        Raises:
+            ValueError: Se uma posição ou símbolo for inválido
+        """
+        changed = []
+        for pos, symbol in changes:
+            row, col = pos
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                raise ValueError(f"Posição ({row}, {col}) fora do labirinto {self.rows}x{self.cols}")
+            if symbol not in TERRAIN_CODES or symbol in ('S', 'E'):
+                raise ValueError(f"Símbolo inválido '{symbol}' para a posição ({row}, {col})")
+            if (row, col) in (self.start_pos, self.end_pos):
+                raise ValueError(f"A posição ({row}, {col}) é o início ou o fim do labirinto")
+
+            code = TERRAIN_CODES[symbol]
+            if self.terrain[row, col] != code:
+                if self._copy_on_write:
+                    self.terrain = np.array(self.terrain)
+                    self._copy_on_write = False
+                self.terrain[row, col] = code
+                if self._cost_array is not None:
+                    self._cost_array[row, col] = self._weight_table[code]
+                if self._maze_array is not None:
+                    self._maze_array[row, col] = symbol
+                if self._components is not None:
+                    self._components.update((row, col), self._passable_region)
+                changed.append((row, col))
+
+        if changed:
+            # A lista de caracteres pode pertencer a quem criou o labirinto,
+            # então é regenerada em vez de alterada
+            self._maze = None
+            self._adjacency = None
+            self._min_weight = None
+            self._derived.clear()
+        return changed
+
     def is_valid_position(self, pos: Tuple[int, int]) -> bool:
         """
         Verifica se uma posição é válida no labirinto.
@@ -59,9 +305,43 @@ class Maze:
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return False
         
-        cell = self.maze[row][col]
-        return cell != '#' and self.cell_weights.get(cell, float('inf')) < float('inf')
+        return self._weight_table[self.terrain[row, col]] < np.inf
     
+    def _passable_region(self, r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+        """Células transitáveis do recorte [r0, r1) x [c0, c1)"""
+        return (self._weight_table < np.inf)[self.terrain[r0:r1, c0:c1]]
+
+    def get_components(self) -> ComponentIndex:
+        """
+        Retorna o índice de componentes conexos das células transitáveis.
+
+        Construído de forma vetorizada na primeira chamada; depois,
+        set_cells o mantém atualizado sem rotular o labirinto de novo.
+
+        Returns:
+            ComponentIndex: Rótulos de componentes com consulta em O(1)
+        """
+        if self._components is None:
+            self._components = ComponentIndex(self.get_weight_grid() < np.inf)
+        return self._components
+
+    def connected(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> bool:
+        """
+        Verifica se existe algum caminho entre duas posições.
+
+        Args:
+            pos1: Tupla (linha, coluna)
+            pos2: Tupla (linha, coluna)
+
+        Returns:
+            bool: True se as duas posições são transitáveis e estão no mesmo
+                  componente (uma posição transitável é ligada a si mesma);
+                  False se alguma estiver fora do labirinto
+        """
+        if pos1 == pos2:
+            return self.is_valid_position(pos1)
+        return self.get_components().connected(pos1, pos2)
+
     def get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """
         Retorna os vizinhos válidos de uma posição, incluindo diagonais.
@@ -108,6 +388,133 @@ class Maze:
         
         return neighbors
     
+    def cached(self, key: str, build: Callable[[], T]) -> T:
+        """
+        Retorna uma estrutura derivada do labirinto, construindo-a na primeira chamada.
+
+        Permite que solucionadores guardem pré-processamentos (tabelas de
+        salto, índices etc.) junto da instância e os reaproveitem entre buscas.
+
+        Args:
+            key: Nome da estrutura
+            build: Função sem argumentos que constrói a estrutura
+
+        Returns:
+            A estrutura armazenada sob a chave
+        """
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+
+    def fingerprint(self) -> str:
+        """
+        Retorna um hash do conteúdo do labirinto.
+
+        Cobre a matriz de terreno (incluindo as posições de S e E), os pesos
+        das células e os pesos de movimento: dois labirintos com a mesma
+        impressão digital produzem as mesmas buscas.
+
+        O hash é calculado uma vez e guardado junto das demais estruturas
+        derivadas.
+
+        Returns:
+            str: Hash BLAKE2b em hexadecimal
+        """
+        def build() -> str:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.array(self.terrain.shape, dtype=np.int64).tobytes())
+            digest.update(np.ascontiguousarray(self.terrain).tobytes())
+            digest.update(self._weight_table.tobytes())
+            digest.update(repr(sorted(self.movement_weights.items())).encode())
+            return digest.hexdigest()
+
+        return self.cached('fingerprint', build)
+
+    def get_weight_grid(self) -> np.ndarray:
+        """
+        Retorna o peso (float64) de cada célula; intransitáveis valem infinito.
+
+        Returns:
+            np.ndarray: Matriz (linhas, colunas) de pesos
+        """
+        return self._weight_table[self.terrain]
+
+    def cell_weight(self, pos: Tuple[int, int]) -> float:
+        """
+        Retorna o peso (float64) de uma célula; intransitáveis valem infinito.
+
+        Args:
+            pos: Tupla (linha, coluna)
+
+        Returns:
+            float: Peso da célula
+        """
+        return float(self._weight_table[self.terrain[pos]])
+
+    def min_cell_weight(self) -> float:
+        """
+        Retorna o menor peso entre as células transitáveis do labirinto.
+
+        Returns:
+            float: Menor peso (0.0 se não houver células transitáveis)
+        """
+        if self._min_weight is None:
+            present = np.bincount(self.terrain.ravel(), minlength=len(TERRAIN_SYMBOLS)) > 0
+            weights = self._weight_table[present[:len(TERRAIN_SYMBOLS)]]
+            weights = weights[weights < np.inf]
+            self._min_weight = float(weights.min()) if weights.size else 0.0
+        return self._min_weight
+
+    def integer_cost_scale(self, max_scale: int = 1000) -> Optional[int]:
+        """
+        Retorna o menor fator inteiro que torna inteiros todos os custos de aresta.
+
+        Cada aresta custa o peso do movimento vezes a média dos pesos de duas
+        células, então os custos possíveis formam um conjunto pequeno que não
+        depende do tamanho do labirinto (com os pesos padrão, o fator é 10).
+
+        Args:
+            max_scale: Maior fator testado
+
+        Returns:
+            Optional[int]: Fator, ou None se nenhum fator até max_scale servir
+        """
+        orth = self.movement_weights['orthogonal']
+        diag = self.movement_weights['diagonal']
+
+        def build() -> Optional[int]:
+            weights = self._weight_table[self._weight_table < np.inf]
+            pairs = ((weights[:, None] + weights[None, :]) / 2).ravel()
+            costs = np.concatenate([orth * pairs, diag * pairs])
+            for scale in range(1, max_scale + 1):
+                scaled = costs * scale
+                if np.all(np.abs(scaled - np.round(scaled)) < 1e-6):
+                    return scale
+            return None
+
+        return self.cached(f'cost_scale:{orth!r}:{diag!r}:{max_scale}', build)
+
+    def get_adjacency(self) -> Adjacency:
+        """
+        Retorna a tabela de vizinhos e custos de aresta de todas as células.
+
+        A tabela é construída de forma vetorizada na primeira chamada e
+        reaproveitada nas seguintes, de modo que labirintos usados uma única
+        vez não pagam por ela. Aplica as mesmas regras de get_neighbors
+        (incluindo a proibição de cortar cantos nas diagonais) e os mesmos
+        custos de get_cost; células intransitáveis não têm vizinhos.
+
+        Returns:
+            Adjacency: Arrays indptr, indices e costs no formato CSR
+        """
+        if self._adjacency is None:
+            self._adjacency = build_adjacency(
+                self.get_weight_grid(),
+                self.movement_weights['orthogonal'],
+                self.movement_weights['diagonal']
+            )
+        return self._adjacency
+
     def get_cost(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
         """
         Calcula o custo de movimento entre duas posições adjacentes.
@@ -128,12 +535,24 @@ class Maze:
         else:
             base_cost = self.movement_weights['orthogonal']
         
-        # Custo do terreno (média entre as duas células)
-        cell1 = self.maze[row1][col1]
-        cell2 = self.maze[row2][col2]
-        terrain_cost = (self.cell_weights[cell1] + self.cell_weights[cell2]) / 2
+        # Custo do terreno (média entre as duas células), pela mesma tabela
+        # de pesos usada nas buscas
+        weight_table = self._weight_table
+        terrain_cost = (weight_table[self.terrain[row1, col1]] + weight_table[self.terrain[row2, col2]]) / 2
         
         return base_cost * terrain_cost
+
+    def path_cost(self, path: List[Tuple[int, int]]) -> float:
+        """
+        Calcula o custo total de um caminho, somando get_cost de cada passo.
+
+        Args:
+            path: Lista de posições adjacentes, como a devolvida pelos solucionadores
+
+        Returns:
+            float: Custo do caminho (0 para um caminho de uma só posição)
+        """
+        return sum(self.get_cost(path[i], path[i + 1]) for i in range(len(path) - 1))
     
     def mark_path(self, path: List[Tuple[int, int]]) -> List[List[str]]:
         """
@@ -0,0 +1,237 @@
+from typing import BinaryIO, Dict, Optional, Tuple
+import math
+import os
+import re
+import struct
+import numpy as np
+from .maze import Maze
+from .landmarks import landmarks_path, load_landmarks
+from .contraction import hierarchy_file, load_contraction_hierarchy
+from .utils import TERRAIN_SYMBOLS, TERRAIN_CODES, START_CODE, END_CODE, INVALID_CODE
+
+# Formato binário de labirinto (little-endian):
+#   cabeçalho   magic, versão, nº de símbolos, linhas, colunas, início, fim
+#   pesos       um float64 por símbolo de TERRAIN_SYMBOLS (NaN = sem peso)
+#   terreno     linhas * colunas bytes uint8, em ordem de linha
+BINARY_MAGIC = b'PFMZ'
+BINARY_VERSION = 1
+_HEADER = struct.Struct('<4sHHIIIIII')
+_WEIGHTS = struct.Struct(f'<{len(TERRAIN_SYMBOLS)}d')
+BINARY_HEADER_SIZE = _HEADER.size + _WEIGHTS.size
+
+# Tabela de conversão de byte para código de terreno
+_BYTE_TO_CODE = np.full(256, INVALID_CODE, dtype=np.uint8)
+for _symbol, _code in TERRAIN_CODES.items():
+    _BYTE_TO_CODE[ord(_symbol)] = _code
+
+_TOKEN = re.compile(rb'\S+')
+
+def load_maze(path: str, cell_weights: Optional[Dict[str, float]] = None) -> Maze:
+    """
+    Carrega um labirinto de um arquivo, em texto ou no formato binário.
+
+    Arquivos em texto têm uma linha da grade por linha do arquivo, com as
+    células separadas por espaços ("S 0 #") ou juntas ("S0#"); linhas em
+    branco são ignoradas e a grade pode ter qualquer tamanho retangular.
+    O arquivo é lido linha a linha e decodificado direto para uma matriz
+    uint8 de códigos de terreno. Tabelas de landmarks e hierarquias de
+    contração gravadas ao lado do arquivo são carregadas junto.
+
+    Args:
+        path: Arquivo de labirinto
+        cell_weights: Dicionário com pesos para cada tipo de célula (em
+                      arquivos binários, padrão são os pesos gravados)
+
+    Returns:
+        Maze: Labirinto carregado
+
+    Raises:
+        ValueError: Se o arquivo for inválido; erros de texto indicam linha e
+                    coluna (a partir de 1) no arquivo
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            maze = load_binary_maze(path)
+            if cell_weights is not None:
+                maze = _attach_indexes(Maze.from_terrain(
+                    maze.terrain, cell_weights, (maze.start_pos, maze.end_pos)), path)
+            return maze
+        file.seek(0)
+        terrain, start, end = _parse_text(file)
+    # O terreno lido do texto não é de mais ninguém: pode ser alterado sem cópia
+    return _attach_indexes(Maze.from_terrain(terrain, cell_weights, points=(start, end),
+                                             write_through=True), path)
+
+def _attach_indexes(maze: Maze, path: str) -> Maze:
+    """
+    Associa ao labirinto os índices gravados ao lado do arquivo.
+
+    São as tabelas de landmarks (landmarks_path) e a hierarquia de contração
+    (hierarchy_file). Índices ausentes ou de outro labirinto (arquivo
+    alterado depois de gravá-los, outros pesos) são ignorados: quem os usa
+    os recalcula.
+    """
+    for index_path, load in ((landmarks_path(path), load_landmarks),
+                             (hierarchy_file(path), load_contraction_hierarchy)):
+        if os.path.exists(index_path):
+            try:
+                load(index_path, maze)
+            except ValueError:
+                pass
+    return maze
+
+def _parse_text(file: BinaryIO) -> Tuple[np.ndarray, Tuple[int, int], Tuple[int, int]]:
+    """Decodifica um labirinto em texto, devolvendo terreno, início e fim"""
+    cells = bytearray()
+    width = 0
+    start = end = None
+    row = 0
+    for number, raw in enumerate(file, 1):
+        if number == 1 and raw.startswith(b'\xef\xbb\xbf'):
+            raw = raw[3:]
+        line = raw.strip()
+        if not line:
+            continue
+
+        # Caso comum: um caractere por célula, separados por um único espaço
+        chars = np.frombuffer(line, dtype=np.uint8)
+        if len(chars) > 1 and len(chars) % 2 and not np.any(chars[1::2] != 32):
+            chars = chars[::2]
+        else:
+            tokens = line.split()
+            if len(tokens) > 1:
+                for k, token in enumerate(tokens):
+                    if len(token) != 1:
+                        raise ValueError(f"Célula inválida '{token.decode(errors='replace')}' "
+                                         f"na linha {number}, coluna {_column(raw, k)}")
+                chars = np.frombuffer(b''.join(tokens), dtype=np.uint8)
+
+        if not width:
+            width = len(chars)
+        elif len(chars) != width:
+            raise ValueError(f"Linha {number} tem {len(chars)} células, esperadas {width} "
+                             "(todas as linhas devem ter o mesmo tamanho)")
+
+        codes = _BYTE_TO_CODE[chars]
+        invalid = np.flatnonzero(codes == INVALID_CODE)
+        if invalid.size:
+            k = int(invalid[0])
+            raise ValueError(f"Caractere inválido '{chr(chars[k])}' "
+                             f"na linha {number}, coluna {_column(raw, k)}")
+
+        for code, name in ((START_CODE, 'inicial (S)'), (END_CODE, 'final (E)')):
+            found = np.flatnonzero(codes == code)
+            if not found.size:
+                continue
+            if found.size > 1 or (start if code == START_CODE else end) is not None:
+                k = int(found[-1])
+                raise ValueError(f"Deve haver exatamente um ponto {name}: outro encontrado "
+                                 f"na linha {number}, coluna {_column(raw, k)}")
+            if code == START_CODE:
+                start = (row, int(found[0]))
+            else:
+                end = (row, int(found[0]))
+
+        cells += codes.tobytes()
+        row += 1
+
+    if not row:
+        raise ValueError("Labirinto vazio")
+    if start is None:
+        raise ValueError("Deve haver exatamente um ponto inicial (S)")
+    if end is None:
+        raise ValueError("Deve haver exatamente um ponto final (E)")
+    terrain = np.frombuffer(cells, dtype=np.uint8).reshape(row, width)
+    return terrain, start, end
+
+def _column(raw: bytes, k: int) -> int:
+    """Coluna (a partir de 1) no arquivo da k-ésima célula de uma linha"""
+    tokens = [match.start() for match in _TOKEN.finditer(raw)]
+    if len(tokens) == 1:
+        return tokens[0] + k + 1
+    return tokens[k] + 1
+
+def save_binary_maze(maze: Maze, path: str) -> None:
+    """
+    Grava um labirinto no formato binário.
+
+    Args:
+        maze: Instância da classe Maze
+        path: Arquivo de destino
+    """
+    weights = [float(maze.cell_weights.get(symbol, math.nan)) for symbol in TERRAIN_SYMBOLS]
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION, len(TERRAIN_SYMBOLS), maze.rows, maze.cols,
+            *maze.start_pos, *maze.end_pos
+        ))
+        file.write(_WEIGHTS.pack(*weights))
+        np.ascontiguousarray(maze.terrain).tofile(file)
+
+def load_binary_maze(path: str, mode: str = 'c', validate: bool = True) -> Maze:
+    """
+    Carrega um labirinto binário mapeando o terreno direto do arquivo.
+
+    Nada é copiado: o terreno do Maze é um np.memmap sobre o arquivo, e as
+    páginas só são lidas do disco quando acessadas.
+
+    Args:
+        path: Arquivo gravado por save_binary_maze
+        mode: Modo do np.memmap: 'c' (alterações de set_cells ficam só em
+              memória), 'r' (somente leitura; a primeira alteração copia o
+              terreno para a memória) ou 'r+' (alterações vão para o arquivo)
+        validate: Se False, confia no início e fim do cabeçalho e não
+                  percorre o terreno (carregamento em tempo constante)
+
+    Returns:
+        Maze: Labirinto com os pesos de célula gravados no arquivo (e os
+              índices gravados ao lado dele, se houver)
+
+    Raises:
+        ValueError: Se o arquivo não estiver no formato esperado
+    """
+    with open(path, 'rb') as file:
+        header = file.read(BINARY_HEADER_SIZE)
+    if len(header) < BINARY_HEADER_SIZE or header[:4] != BINARY_MAGIC:
+        raise ValueError(f"Arquivo '{path}' não é um labirinto binário")
+
+    magic, version, n_symbols, rows, cols, *points = _HEADER.unpack_from(header)
+    if version != BINARY_VERSION or n_symbols != len(TERRAIN_SYMBOLS):
+        raise ValueError(f"Versão {version} do formato binário não suportada")
+    weights = _WEIGHTS.unpack_from(header, _HEADER.size)
+    cell_weights = {
+        symbol: weight for symbol, weight in zip(TERRAIN_SYMBOLS, weights) if not math.isnan(weight)
+    }
+
+    terrain = np.memmap(path, dtype=np.uint8, mode=mode,
+                        offset=BINARY_HEADER_SIZE, shape=(rows, cols))
+    start, end = tuple(points[:2]), tuple(points[2:])
+    # O mapeamento 'c' é privado; só no 'r' a matriz precisa ser copiada
+    write_through = mode != 'r'
+    if validate:
+        maze = Maze.from_terrain(terrain, cell_weights, write_through=write_through)
+        if (maze.start_pos, maze.end_pos) != (start, end):
+            raise ValueError(f"Início ou fim do cabeçalho não confere com o terreno de '{path}'")
+        return _attach_indexes(maze, path)
+    return _attach_indexes(Maze.from_terrain(terrain, cell_weights, points=(start, end),
+                                                write_through=write_through), path)
+
+def convert_text_maze(text_path: str, binary_path: str,
+                      cell_weights: Optional[Dict[str, float]] = None) -> Maze:
+    """
+    Converte um labirinto em texto para o formato binário.
+
+    Args:
+        text_path: Arquivo .txt de entrada
+        binary_path: Arquivo binário de saída
+        cell_weights: Pesos de célula gravados no arquivo (padrão do Maze se None)
+
+    Returns:
+        Maze: Labirinto convertido
+
+    Raises:
+        ValueError: Se o labirinto em texto for inválido
+    """
+    maze = load_maze(text_path, cell_weights)
+    save_binary_maze(maze, binary_path)
+    return maze
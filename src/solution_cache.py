@@ -0,0 +1,177 @@
+from typing import Callable, List, Optional, Tuple, Union
+from collections import OrderedDict
+import sqlite3
+import threading
+import numpy as np
+from .maze import Maze
+from .heuristics import DEFAULT_HEURISTIC, HeuristicSpec
+
+Position = Tuple[int, int]
+Path = Optional[List[Position]]
+
+# Marca de ausência em lookup (None é um resultado válido: "sem caminho")
+MISSING = object()
+
+def solution_key(maze: Maze, start: Position, goal: Position,
+                 heuristic: HeuristicSpec = None, bidirectional: bool = False,
+                 weight: float = 1.0) -> Optional[str]:
+    """
+    Chave de uma consulta a partir do conteúdo do labirinto.
+
+    Combina a impressão digital do labirinto (terreno, pesos das células e
+    pesos de movimento) com as posições e as opções que podem mudar o caminho
+    devolvido. Nomes diferentes para a mesma heurística (None e 'octile',
+    'dijkstra' e 'zero') dão a mesma chave.
+
+    Args:
+        maze: Instância da classe Maze
+        start: Posição inicial
+        goal: Posição final
+        heuristic: Heurística da busca
+        bidirectional: Se a busca é bidirecional
+        weight: Fator de inflação da heurística (ver astar)
+
+    Returns:
+        Optional[str]: Chave, ou None se a consulta não puder ser guardada
+                       (heurística definida por função)
+    """
+    if callable(heuristic):
+        return None
+    name = DEFAULT_HEURISTIC if heuristic is None else heuristic
+    if name == 'dijkstra':
+        name = 'zero'
+    return (f"{maze.fingerprint()}:{start[0]},{start[1]}:{goal[0]},{goal[1]}"
+            f":{name}:{int(bidirectional)}:{float(weight)!r}")
+
+class SolutionCache:
+    """
+    Cache de soluções indexado pelo conteúdo do labirinto.
+
+    Guarda os caminhos mais recentes em memória (LRU limitado pelo número de
+    entradas) e, se path for informado, também em um banco SQLite local, que
+    sobrevive entre execuções e é consultado quando a memória não tem a
+    entrada. Consultas sem solução também são guardadas.
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Número máximo de caminhos em memória
+            path: Arquivo SQLite para persistência (None mantém só em memória)
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0  # Acertos atendidos pelo SQLite (incluídos em hits)
+        self._entries: 'OrderedDict[str, Path]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, path BLOB)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str) -> Union[Path, object]:
+        """
+        Procura um caminho guardado.
+
+        Args:
+            key: Chave de solution_key
+
+        Returns:
+            O caminho (ou None, se a consulta não tinha solução), ou MISSING
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._copy(self._entries[key])
+
+            if self._db is not None:
+                row = self._db.execute("SELECT path FROM solutions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    path = self._decode(row[0])
+                    self._remember(key, path)
+                    return self._copy(path)
+
+            self.misses += 1
+            return MISSING
+
+    def store(self, key: str, path: Path):
+        """Guarda o caminho de uma consulta (em memória e, se houver, no SQLite)"""
+        with self._lock:
+            path = self._copy(path)
+            self._remember(key, path)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                                 (key, self._encode(path)))
+                self._db.commit()
+
+    def get_or_solve(self, key: Optional[str], solve: Callable[[], Path]) -> Path:
+        """
+        Retorna o caminho guardado ou resolve e guarda.
+
+        Args:
+            key: Chave de solution_key (None resolve sem usar o cache)
+            solve: Função sem argumentos que resolve a consulta
+
+        Returns:
+            Path: Caminho da consulta, ou None
+        """
+        if key is None:
+            return solve()
+        path = self.lookup(key)
+        if path is MISSING:
+            path = solve()
+            self.store(key, path)
+        return path
+
+    def clear(self):
+        """Remove todas as entradas, inclusive as do SQLite"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM solutions")
+                self._db.commit()
+
+    def close(self):
+        """Fecha o banco SQLite, se houver"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, path: Path):
+        """Insere na LRU em memória, removendo as entradas menos usadas"""
+        self._entries[key] = path
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _copy(path: Path) -> Path:
+        """Cópia para que quem recebe o caminho não altere a entrada guardada"""
+        return None if path is None else list(path)
+
+    @staticmethod
+    def _encode(path: Path) -> Optional[bytes]:
+        """Caminho como bytes int64 (linha, coluna, linha, coluna, ...)"""
+        return None if path is None else np.array(path, dtype=np.int64).tobytes()
+
+    @staticmethod
+    def _decode(data: Optional[bytes]) -> Path:
+        if data is None:
+            return None
+        return [tuple(pos) for pos in np.frombuffer(data, dtype=np.int64).reshape(-1, 2).tolist()]
+
+# Cache em memória compartilhado, para quem não precisa de um próprio
+default_solution_cache = SolutionCache()
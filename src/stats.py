@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+@dataclass
+class SearchStats:
+    """
+    Contadores de uma busca.
+
+    Os solucionadores aceitam uma instância opcional (parâmetro `stats`) e a
+    preenchem ao final da busca.
+    """
+    nodes_expanded: int = 0  # Nós retirados da fila e expandidos
+    nodes_expanded_forward: int = 0  # Busca bidirecional: expandidos a partir do início
+    nodes_expanded_backward: int = 0  # Busca bidirecional: expandidos a partir do fim
+
+    # Contadores detalhados do A* unidirecional (preenchidos por astar_iter e
+    # por astar quando stats é informado)
+    heap_pushes: int = 0  # Entradas inseridas na fila de prioridade
+    stale_pops: int = 0  # Entradas obsoletas descartadas ao sair da fila
+    reopenings: int = 0  # Células fechadas reabertas por um custo melhor
+    peak_open_size: int = 0  # Maior tamanho da fila de prioridade
+    peak_memory: int = 0  # Estimativa (bytes) dos arrays da busca e da fila no pico
+    neighbor_time: float = 0.0  # Segundos obtendo vizinhos e custos de aresta
+    cost_time: float = 0.0  # Segundos avaliando custos, heurística e inserções
+    total_time: float = 0.0  # Segundos da busca inteira
+
+# Função de progresso aceita pelas buscas (parâmetro `progress`): recebe
+# (nós expandidos, tamanho da fronteira) a cada PROGRESS_INTERVAL expansões e,
+# se devolver False, cancela a busca
+ProgressCallback = Callable[[int, int], Optional[bool]]
+PROGRESS_INTERVAL = 1000
+
+class SearchCancelled(Exception):
+    """A função de progresso pediu o cancelamento da busca"""
+
+class SearchBudgetExceeded(SearchCancelled):
+    """
+    A busca atingiu o limite de expansões ou o prazo.
+
+    Atributos:
+        reason: 'max_expansions' ou 'deadline'
+        partial_path: Caminho do início até a célula expandida mais próxima
+                      do objetivo
+        stats: Contadores até a interrupção
+    """
+
+    def __init__(self, message: str, reason: str,
+                 partial_path: List[Tuple[int, int]], stats: 'SearchStats'):
+        super().__init__(message)
+        self.reason = reason
+        self.partial_path = partial_path
+        self.stats = stats
+
+# Situações de SearchResult
+FOUND = 'found'
+NO_PATH = 'no-path'
+BUDGET_EXCEEDED = 'budget-exceeded'
+
+@dataclass
+class SearchResult:
+    """Resultado estruturado de uma busca com limites (ver astar_search)"""
+    status: str  # FOUND, NO_PATH ou BUDGET_EXCEEDED
+    path: Optional[List[Tuple[int, int]]] = None  # Caminho completo (FOUND)
+    # Do início até a célula expandida mais próxima do objetivo (NO_PATH e
+    # BUDGET_EXCEEDED)
+    partial_path: Optional[List[Tuple[int, int]]] = None
+    stats: SearchStats = field(default_factory=SearchStats)
+    reason: Optional[str] = None  # BUDGET_EXCEEDED: 'max_expansions' ou 'deadline'
+
+    @property
+    def found(self) -> bool:
+        """Se um caminho completo foi encontrado"""
+        return self.status == FOUND
+
+def report_progress(progress: ProgressCallback, expanded: int, frontier: int) -> None:
+    """
+    Repassa o andamento da busca à função de progresso.
+
+    Raises:
+        SearchCancelled: Se a função devolver False
+    """
+    if progress(expanded, frontier) is False:
+        raise SearchCancelled(f"Busca cancelada após {expanded} expansões")
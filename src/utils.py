@@ -1,67 +1,121 @@
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 import numpy as np
 
-def validate_maze(maze: List[List[str]]) -> Tuple[bool, Optional[str]]:
+# Símbolos aceitos no labirinto; o código de terreno (uint8) de uma célula é
+# o índice do seu símbolo nesta tupla
+TERRAIN_SYMBOLS = ('0', '1', '2', '3', 'S', 'E', '#', '*')
+TERRAIN_CODES = {symbol: code for code, symbol in enumerate(TERRAIN_SYMBOLS)}
+START_CODE = TERRAIN_CODES['S']
+END_CODE = TERRAIN_CODES['E']
+WALL_CODE = TERRAIN_CODES['#']
+INVALID_CODE = 255
+
+# Tabela de conversão de caractere ASCII para código de terreno
+_ASCII_TO_CODE = np.full(128, INVALID_CODE, dtype=np.uint8)
+for _symbol, _code in TERRAIN_CODES.items():
+    _ASCII_TO_CODE[ord(_symbol)] = _code
+
+def encode_maze(maze: List[List[str]]) -> np.ndarray:
     """
-    Valida um labirinto.
-    
+    Converte e valida um labirinto em uma única passada vetorizada.
+
     Args:
         maze: Matriz 2D representando o labirinto
-        
+
     Returns:
-        Tuple[bool, Optional[str]]: (True, None) se o labirinto é válido,
-                                   (False, mensagem_erro) caso contrário
+        np.ndarray: Matriz uint8 com o código de terreno de cada célula
+
+    Raises:
+        ValueError: Se o labirinto for inválido (mesmas mensagens de validate_maze)
     """
     # Verifica se o labirinto está vazio
     if not maze or not maze[0]:
-        return False, "Labirinto vazio"
-    
+        raise ValueError("Labirinto vazio")
+
     # Verifica se todas as linhas têm o mesmo tamanho
     width = len(maze[0])
     if not all(len(row) == width for row in maze):
-        return False, "Todas as linhas devem ter o mesmo tamanho"
-    
-    # Conta pontos iniciais e finais
-    start_count = sum(cell == 'S' for row in maze for cell in row)
-    end_count = sum(cell == 'E' for row in maze for cell in row)
-    
-    # Verifica se há exatamente um ponto inicial
-    if start_count != 1:
-        return False, "Deve haver exatamente um ponto inicial (S)"
-    
-    # Verifica se há exatamente um ponto final
-    if end_count != 1:
-        return False, "Deve haver exatamente um ponto final (E)"
-    
-    # Verifica se há caracteres inválidos
-    valid_chars = {'S', 'E', '#', '0', '1', '2', '3', '*'}
-    for i, row in enumerate(maze):
-        for j, cell in enumerate(row):
-            if cell not in valid_chars:
-                return False, f"Caractere inválido '{cell}' na posição ({i}, {j})"
+        raise ValueError("Todas as linhas devem ter o mesmo tamanho")
+
+    chars = np.array(maze, dtype=str)
+    code_points = chars.astype('<U1').view(np.uint32).reshape(chars.shape)
+    terrain = _ASCII_TO_CODE[np.minimum(code_points, 127)]
+    terrain[code_points > 127] = INVALID_CODE
+    if chars.dtype.itemsize != 4:
+        # Alguma célula tem mais de um caractere
+        terrain[np.char.str_len(chars) != 1] = INVALID_CODE
+
+    validate_terrain(terrain, chars)
+    return terrain
+
+def validate_terrain(terrain: np.ndarray, chars: Optional[np.ndarray] = None) -> None:
+    """
+    Valida uma matriz de códigos de terreno.
+
+    Args:
+        terrain: Matriz uint8 com códigos de terreno
+        chars: Matriz de caracteres original, usada apenas nas mensagens de erro
+
+    Raises:
+        ValueError: Se a matriz for vazia, não tiver exatamente um início e um
+                    fim ou contiver códigos inválidos
+    """
+    if terrain.ndim != 2 or terrain.size == 0:
+        raise ValueError("Labirinto vazio")
+
+    # Verifica se há exatamente um ponto inicial e um ponto final
+    if np.count_nonzero(terrain == START_CODE) != 1:
+        raise ValueError("Deve haver exatamente um ponto inicial (S)")
+    if np.count_nonzero(terrain == END_CODE) != 1:
+        raise ValueError("Deve haver exatamente um ponto final (E)")
+
+    # Verifica se há caracteres inválidos (reporta o primeiro em ordem de leitura)
+    invalid = np.flatnonzero(terrain.ravel() >= len(TERRAIN_SYMBOLS))
+    if invalid.size:
+        i, j = divmod(int(invalid[0]), terrain.shape[1])
+        if chars is not None:
+            raise ValueError(f"Caractere inválido '{chars[i, j]}' na posição ({i}, {j})")
+        raise ValueError(f"Código de terreno inválido {terrain[i, j]} na posição ({i}, {j})")
+
+def validate_maze(maze: List[List[str]]) -> Tuple[bool, Optional[str]]:
+    """
+    Valida um labirinto.
     
+    Args:
+        maze: Matriz 2D representando o labirinto
+        
+    Returns:
+        Tuple[bool, Optional[str]]: (True, None) se o labirinto é válido,
+                                   (False, mensagem_erro) caso contrário
+    """
+    try:
+        encode_maze(maze)
+    except ValueError as error:
+        return False, str(error)
     return True, None
 
-def find_points(maze: List[List[str]]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+def find_points(maze: Union[List[List[str]], np.ndarray]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
     """
     Encontra os pontos inicial e final no labirinto.
     
     Args:
-        maze: Matriz 2D representando o labirinto
+        maze: Matriz 2D representando o labirinto, ou matriz uint8 de códigos
+              de terreno
         
     Returns:
         Tuple[Tuple[int, int], Tuple[int, int]]: Posições inicial e final
     """
-    start_pos = end_pos = None
-    
-    for i, row in enumerate(maze):
-        for j, cell in enumerate(row):
-            if cell == 'S':
-                start_pos = (i, j)
-            elif cell == 'E':
-                end_pos = (i, j)
-    
-    return start_pos, end_pos
+    if isinstance(maze, np.ndarray) and maze.dtype == np.uint8:
+        is_start, is_end = maze == START_CODE, maze == END_CODE
+    else:
+        chars = np.array(maze, dtype=str)
+        is_start, is_end = chars == 'S', chars == 'E'
+
+    def first(mask: np.ndarray) -> Optional[Tuple[int, int]]:
+        found = np.flatnonzero(mask)
+        return divmod(int(found[0]), mask.shape[1]) if found.size else None
+
+    return first(is_start), first(is_end)
 
 def manhattan_distance(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> int:
     """
@@ -76,4 +130,4 @@ def manhattan_distance(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> int:
     """
     x1, y1 = pos1
     x2, y2 = pos2
-    return abs(x1 - x2) + abs(y1 - y2) 
\ No newline at end of file
+    return abs(x1 - x2) + abs(y1 - y2)
@@ -0,0 +1,39 @@
+"""
+Funções auxiliares compartilhadas pelos testes.
+"""
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.maze import Maze
+
+def random_maze(seed: Union[int, np.random.Generator], rows: int, cols: Optional[int] = None,
+                walls: float = 0.2, symbols: str = '000123') -> Maze:
+    """
+    Gera um labirinto aleatório com S no canto superior esquerdo e E no inferior direito.
+
+    Args:
+        seed: Semente ou gerador (um gerador continua a mesma sequência entre chamadas)
+        rows: Número de linhas
+        cols: Número de colunas (padrão: igual ao de linhas)
+        walls: Proporção de obstáculos
+        symbols: Terrenos sorteados nas demais células; repetir um símbolo
+                 aumenta a sua frequência
+    """
+    rng = np.random.default_rng(seed)
+    cols = rows if cols is None else cols
+    cells = rng.choice(list(symbols), size=(rows, cols))
+    cells[rng.random((rows, cols)) < walls] = '#'
+    cells[0, 0], cells[-1, -1] = 'S', 'E'
+    return Maze(cells.tolist())
+
+def assert_valid_path(maze: Maze, path: List[Tuple[int, int]],
+                      start: Optional[Tuple[int, int]] = None,
+                      goal: Optional[Tuple[int, int]] = None):
+    """Verifica se o caminho liga start a goal (padrão: S e E) por passos válidos"""
+    assert path[0] == (maze.start_pos if start is None else start)
+    assert path[-1] == (maze.end_pos if goal is None else goal)
+    for pos1, pos2 in zip(path, path[1:]):
+        assert pos2 in maze.get_neighbors(pos1)
+
+def maze_text(cells: Sequence[Sequence[str]]) -> str:
+    """Labirinto em texto, uma linha da grade por linha"""
+    return '\n'.join(' '.join(row) for row in cells)
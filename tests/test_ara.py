@@ -0,0 +1,55 @@
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.ara import ara_star, ara_star_iter
+from src.stats import SearchStats
+from tests.helpers import random_maze
+
+def test_ara_star_improves_to_optimal():
+    """Testa se cada caminho respeita o limite e o último é ótimo"""
+    for seed in range(15):
+        maze = random_maze(seed, 30, walls=0.25)
+        reference = astar(maze)
+        solutions = list(ara_star_iter(maze))
+        if reference is None:
+            assert solutions == []
+            continue
+        optimal = maze.path_cost(reference)
+        for solution in solutions:
+            assert solution.path[0] == maze.start_pos and solution.path[-1] == maze.end_pos
+            for pos1, pos2 in zip(solution.path, solution.path[1:]):
+                assert pos2 in maze.get_neighbors(pos1)
+            assert solution.cost == pytest.approx(maze.path_cost(solution.path))
+            assert 1.0 <= solution.bound <= solution.weight
+            assert solution.cost <= solution.bound * optimal + 1e-9
+        for earlier, later in zip(solutions, solutions[1:]):
+            assert later.cost <= earlier.cost + 1e-9
+            assert later.bound <= earlier.bound
+            assert later.weight < earlier.weight
+            assert later.expanded >= earlier.expanded
+        assert solutions[-1].bound == 1.0
+        assert solutions[-1].cost == pytest.approx(optimal)
+
+def test_ara_star_deadline():
+    """Testa se o prazo interrompe as melhorias mas não o primeiro caminho"""
+    maze = random_maze(3, 80, walls=0.25)
+    first = next(ara_star_iter(maze, initial_weight=5.0))
+    solution = ara_star(maze, initial_weight=5.0, deadline=0.0)
+    assert solution == first._replace(elapsed=solution.elapsed)
+    assert solution.weight == 5.0
+
+    stats = SearchStats()
+    final = ara_star(maze, initial_weight=5.0, stats=stats)
+    assert final.bound == 1.0
+    assert stats.nodes_expanded == final.expanded
+
+def test_ara_star_edge_cases():
+    """Testa labirinto sem solução, início igual ao fim e parâmetros inválidos"""
+    blocked = Maze([['S', '0', '0'], ['#', '#', '#'], ['0', '0', 'E']])
+    assert ara_star(blocked) is None
+    solution = ara_star(blocked, goal=(0, 0))
+    assert solution.path == [(0, 0)] and solution.cost == 0 and solution.bound == 1.0
+    with pytest.raises(ValueError):
+        ara_star(blocked, initial_weight=0.9)
+    with pytest.raises(ValueError):
+        ara_star(blocked, weight_step=0)
@@ -1,6 +1,6 @@
 import pytest
 from src.maze import Maze
-from src.astar import astar, Node
+from src.astar import astar
 
 @pytest.fixture
 def simple_maze():
@@ -30,21 +30,6 @@ def diagonal_maze():
         ['0', '0', '0', 'E']
     ]
 
-def test_node_creation():
-    """Testa a criação de nós"""
-    node = Node((0, 0), 5.0, 3.0)
-    assert node.pos == (0, 0)
-    assert node.g_cost == 5.0
-    assert node.h_cost == 3.0
-    assert node.f_cost == 8.0
-    assert node.parent is None
-
-def test_node_comparison():
-    """Testa a comparação entre nós"""
-    node1 = Node((0, 0), 5.0, 3.0)  # f_cost = 8.0
-    node2 = Node((1, 1), 4.0, 3.0)  # f_cost = 7.0
-    assert node2 < node1  # node2 tem menor f_cost
-
 def test_astar_simple_maze(simple_maze):
     """Testa o algoritmo A* em um labirinto simples"""
     maze = Maze(simple_maze)
@@ -122,4 +107,273 @@ def test_astar_complex_maze():
         pos1 = path[i]
         pos2 = path[i + 1]
         # Verifica se as posições são adjacentes (ortogonal ou diagonal)
-        assert abs(pos1[0] - pos2[0]) <= 1 and abs(pos1[1] - pos2[1]) <= 1 
\ No newline at end of file
+        assert abs(pos1[0] - pos2[0]) <= 1 and abs(pos1[1] - pos2[1]) <= 1 
+
+def _dijkstra_cost(maze):
+    """Custo ótimo de referência calculado com Dijkstra sobre get_neighbors/get_cost"""
+    import heapq
+    dist = {maze.start_pos: 0.0}
+    heap = [(0.0, maze.start_pos)]
+    while heap:
+        d, pos = heapq.heappop(heap)
+        if pos == maze.end_pos:
+            return d
+        if d > dist[pos]:
+            continue
+        for neighbor in maze.get_neighbors(pos):
+            nd = d + maze.get_cost(pos, neighbor)
+            if nd < dist.get(neighbor, float('inf')):
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, neighbor))
+    return None
+
+def test_astar_weighted_maze_cost():
+    """Testa se o A* encontra um caminho de custo mínimo com terrenos variados"""
+    maze_data = [
+        ['S', '3', '3', '0', '0'],
+        ['0', '#', '3', '#', '0'],
+        ['0', '1', '2', '1', '0'],
+        ['2', '#', '#', '3', '0'],
+        ['0', '0', '1', '0', 'E']
+    ]
+    maze = Maze(maze_data)
+    path = astar(maze)
+    assert path is not None
+    assert path[0] == maze.start_pos
+    assert path[-1] == maze.end_pos
+    assert maze.path_cost(path) == pytest.approx(_dijkstra_cost(maze))
+
+def test_astar_bidirectional_matches_unidirectional():
+    """Testa se o A* bidirecional encontra caminhos de mesmo custo"""
+    import numpy as np
+    for seed in range(30):
+        rng = np.random.default_rng(seed)
+        cells = rng.choice(['0', '0', '0', '1', '2', '3'], size=(10, 12))
+        cells[rng.random((10, 12)) < 0.25] = '#'
+        cells[0, 0] = 'S'
+        cells[-1, -1] = 'E'
+        maze = Maze(cells.tolist())
+        reference = astar(maze)
+        for heuristic in (None, 'dijkstra'):
+            path = astar(maze, heuristic=heuristic, bidirectional=True)
+            if reference is None:
+                assert path is None
+                continue
+            assert path[0] == maze.start_pos
+            assert path[-1] == maze.end_pos
+            for pos1, pos2 in zip(path, path[1:]):
+                assert pos2 in maze.get_neighbors(pos1)
+            assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+
+def test_astar_bidirectional_stats(no_solution_maze, diagonal_maze):
+    """Testa a contagem de nós expandidos por cada lado da busca bidirecional"""
+    from src.stats import SearchStats
+    stats = SearchStats()
+    assert astar(Maze(no_solution_maze), bidirectional=True, stats=stats) is None
+
+    stats = SearchStats()
+    path = astar(Maze(diagonal_maze), heuristic='dijkstra', bidirectional=True, stats=stats)
+    assert len(path) == 4
+    assert stats.nodes_expanded_forward > 0
+    assert stats.nodes_expanded_backward > 0
+    assert stats.nodes_expanded == stats.nodes_expanded_forward + stats.nodes_expanded_backward
+
+def test_astar_progress_and_cancel():
+    """Testa a função de progresso e o cancelamento cooperativo"""
+    from src.stats import SearchStats, SearchCancelled, PROGRESS_INTERVAL
+    maze = Maze([['S'] + ['0'] * 59] + [['0'] * 60 for _ in range(58)] + [['0'] * 59 + ['E']])
+    stats = SearchStats()
+    calls = []
+    path = astar(maze, heuristic='dijkstra', stats=stats,
+                 progress=lambda expanded, frontier: calls.append((expanded, frontier)))
+    assert path[-1] == maze.end_pos
+    assert [expanded for expanded, _ in calls] == [
+        PROGRESS_INTERVAL * (i + 1) for i in range(stats.nodes_expanded // PROGRESS_INTERVAL)
+    ]
+    assert all(frontier > 0 for _, frontier in calls)
+
+    for bidirectional in (False, True):
+        calls = []
+        def progress(expanded, frontier):
+            calls.append(expanded)
+            return len(calls) < 2
+        with pytest.raises(SearchCancelled):
+            astar(maze, heuristic='dijkstra', bidirectional=bidirectional, progress=progress)
+        assert calls == [PROGRESS_INTERVAL, 2 * PROGRESS_INTERVAL]
+
+def test_astar_iter_events_and_stats():
+    """Testa os eventos de expansão e os contadores detalhados"""
+    from src.astar import astar_iter
+    from src.stats import SearchStats
+    import numpy as np
+    rng = np.random.default_rng(5)
+    cells = rng.choice(['0', '0', '1', '3'], size=(20, 25))
+    cells[rng.random((20, 25)) < 0.2] = '#'
+    cells[0, 0] = 'S'
+    cells[-1, -1] = 'E'
+    maze = Maze(cells.tolist())
+
+    search = astar_iter(maze)
+    events = list(search)
+    assert search.done
+    assert search.path == astar(maze)
+    stats = search.stats
+    assert [event.expanded for event in events] == list(range(1, stats.nodes_expanded + 1))
+    assert events[0].pos == maze.start_pos and events[0].g_cost == 0.0
+    # Com heurística consistente, f não diminui ao longo das expansões
+    assert all(a.f_cost <= b.f_cost + 1e-9 for a, b in zip(events, events[1:]))
+    assert stats.peak_open_size == max(event.open_size for event in events)
+    assert stats.reopenings == 0
+    # Cada entrada inserida foi expandida, descartada, é o objetivo ou ficou na fila
+    assert stats.heap_pushes >= stats.nodes_expanded + stats.stale_pops
+    assert stats.peak_memory > maze.rows * maze.cols * 17
+    assert 0 < stats.neighbor_time + stats.cost_time <= stats.total_time
+
+    # astar com stats preenche os mesmos contadores
+    other = SearchStats()
+    assert astar(maze, stats=other) == search.path
+    assert (other.nodes_expanded, other.heap_pushes, other.stale_pops) == \
+        (stats.nodes_expanded, stats.heap_pushes, stats.stale_pops)
+
+def test_astar_iter_close_and_reopenings(simple_maze):
+    """Testa a interrupção da iteração e a contagem de reaberturas"""
+    from src.astar import astar_iter
+    search = astar_iter(Maze(simple_maze))
+    next(search)
+    search.close()
+    assert not search.done and search.path is None
+    assert search.stats.nodes_expanded == 1
+
+    # Heurística inconsistente força reaberturas
+    maze = Maze([['S', '0', '0'], ['3', '3', '0'], ['0', '0', 'E']])
+    table = {(0, 0): 20.0, (0, 1): 10.0, (0, 2): 10.0, (1, 0): 0.0, (1, 1): 10.0,
+             (1, 2): 20.0, (2, 0): 10.0, (2, 1): 10.0, (2, 2): 20.0}
+    search = astar_iter(maze, heuristic=lambda pos, goal: table[pos])
+    assert search.run() is not None
+    assert search.stats.reopenings == 2
+
+def test_weighted_astar_bound():
+    """Testa se o Weighted A* respeita o limite de custo e expande menos"""
+    import numpy as np
+    from src.stats import SearchStats
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        cells = rng.choice(['0', '0', '0', '1', '2', '3'], size=(20, 20))
+        cells[rng.random((20, 20)) < 0.25] = '#'
+        cells[0, 0] = 'S'
+        cells[-1, -1] = 'E'
+        maze = Maze(cells.tolist())
+        reference = astar(maze)
+        optimal = None if reference is None else maze.path_cost(reference)
+        for weight in (1.0, 1.1, 1.5, 3.0):
+            for bidirectional in (False, True):
+                stats = SearchStats()
+                path = astar(maze, weight=weight, bidirectional=bidirectional, stats=stats)
+                if reference is None:
+                    assert path is None
+                    continue
+                assert path[0] == maze.start_pos and path[-1] == maze.end_pos
+                assert maze.path_cost(path) <= weight * optimal + 1e-9
+                if not bidirectional:
+                    assert path == astar(maze, weight=weight)
+
+    open_maze = Maze([['S'] + ['0'] * 29] + [['0'] * 30 for _ in range(28)] + [['0'] * 29 + ['E']])
+    optimal_stats, weighted_stats = SearchStats(), SearchStats()
+    astar(open_maze, heuristic='dijkstra', stats=optimal_stats)
+    astar(open_maze, heuristic='dijkstra', stats=weighted_stats, weight=2.0)
+    assert weighted_stats.nodes_expanded == optimal_stats.nodes_expanded  # h = 0
+    astar(open_maze, stats=weighted_stats, weight=2.0)
+    assert weighted_stats.nodes_expanded < optimal_stats.nodes_expanded
+
+def test_weighted_astar_invalid_weight(simple_maze):
+    """Testa se fatores de inflação menores que 1 são rejeitados"""
+    with pytest.raises(ValueError):
+        astar(Maze(simple_maze), weight=0.5)
+
+def test_astar_search_statuses(simple_maze, no_solution_maze):
+    """Testa as situações do resultado estruturado"""
+    from src.astar import astar_search
+    from src.stats import FOUND, NO_PATH
+    result = astar_search(Maze(simple_maze))
+    assert result.status == FOUND and result.found
+    assert result.path == astar(Maze(simple_maze))
+    assert result.partial_path is None and result.stats.nodes_expanded > 0
+
+    result = astar_search(Maze(no_solution_maze))
+    assert result.status == NO_PATH and not result.found
+    assert result.path is None
+    assert result.partial_path == [(0, 0), (0, 1), (0, 2)]  # Mais perto de (2, 2)
+
+def test_astar_budgets():
+    """Testa o limite de expansões e o prazo em um labirinto com desvio longo"""
+    import time
+    from src.astar import astar_search
+    from src.stats import BUDGET_EXCEEDED, SearchBudgetExceeded, SearchCancelled
+    cells = [['0'] * 60 for _ in range(60)]
+    cells[0][59], cells[59][59] = 'S', 'E'
+    cells[57] = ['0'] + ['#'] * 59  # Única passagem na coluna 0
+    maze = Maze(cells)
+
+    result = astar_search(maze, max_expansions=100)
+    assert result.status == BUDGET_EXCEEDED and result.reason == 'max_expansions'
+    assert result.stats.nodes_expanded == 100
+    assert result.partial_path[0] == (0, 59)
+    for pos1, pos2 in zip(result.partial_path, result.partial_path[1:]):
+        assert pos2 in maze.get_neighbors(pos1)
+
+    started = time.perf_counter()
+    result = astar_search(maze, heuristic='dijkstra', deadline=0.0)
+    assert time.perf_counter() - started < 1.0
+    assert result.status == BUDGET_EXCEEDED and result.reason == 'deadline'
+    assert result.partial_path == [(0, 59)]
+
+    with pytest.raises(SearchBudgetExceeded) as raised:
+        astar(maze, max_expansions=10)
+    assert isinstance(raised.value, SearchCancelled)
+    assert raised.value.stats.nodes_expanded == 10
+    assert raised.value.partial_path[0] == (0, 59)
+
+    path = astar(maze, max_expansions=10**6, deadline=60.0)
+    assert path is not None and path[-1] == (59, 59) and (57, 0) in path
+    assert astar(Maze([['S', '0'], ['0', 'E']]), max_expansions=10) == [(0, 0), (1, 1)]
+    with pytest.raises(ValueError):
+        astar(maze, bidirectional=True, max_expansions=10)
+
+def test_astar_bucket_queue():
+    """Testa se a fila de baldes encontra caminhos de custo ótimo"""
+    import numpy as np
+    from src.stats import SearchStats
+    for seed in range(15):
+        rng = np.random.default_rng(seed)
+        cells = rng.choice(['0', '0', '0', '1', '2', '3'], size=(25, 25))
+        cells[rng.random((25, 25)) < 0.3] = '#'
+        cells[0, 0] = 'S'
+        cells[-1, -1] = 'E'
+        maze = Maze(cells.tolist())
+        for heuristic in ('octile', 'euclidean', 'zero'):
+            reference = astar(maze, heuristic, queue='heap')
+            path = astar(maze, heuristic, queue='buckets')
+            if reference is None:
+                assert path is None
+                continue
+            assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+            stats = SearchStats()
+            assert astar(maze, heuristic, stats=stats) == path  # 'auto' escolhe os baldes
+            assert stats.reopenings == 0
+
+def test_astar_queue_selection(simple_maze):
+    """Testa a escolha automática da fila e os erros de queue"""
+    import math
+    maze = Maze(simple_maze)
+    for options in ({'heuristic': 'manhattan'}, {'weight': 1.5}, {'heuristic': lambda pos, goal: 0}):
+        assert astar(maze, **options) == astar(maze, queue='heap', **options)
+        with pytest.raises(ValueError):
+            astar(maze, queue='buckets', **options)
+    irrational = Maze(simple_maze, {'S': 1.0, 'E': 1.0, '0': math.pi, '#': float('inf')})
+    assert astar(irrational) == astar(irrational, queue='heap') is not None
+    with pytest.raises(ValueError):
+        astar(irrational, queue='buckets')
+    with pytest.raises(ValueError):
+        astar(maze, queue='fibonacci')
+    with pytest.raises(ValueError):
+        astar(maze, bidirectional=True, queue='buckets')
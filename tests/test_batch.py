@@ -0,0 +1,124 @@
+from multiprocessing import shared_memory
+import multiprocessing
+import pytest
+from src.maze import Maze
+from src.astar import astar, astar_search
+from src.batch import astar_many, solve_mazes, _init_shared_worker, _size_chunks
+from src.stats import BUDGET_EXCEEDED, FOUND, NO_PATH
+from benchmarks.generators import generate
+from tests.helpers import random_maze
+
+@pytest.fixture
+def open_maze():
+    """Fixture com um labirinto 8x8 com alguns obstáculos e terrenos"""
+    return random_maze(3, 8, symbols='00012')
+
+def free_cells(maze):
+    """Lista as células transitáveis do labirinto"""
+    return [(r, c) for r in range(maze.rows) for c in range(maze.cols) if maze.is_valid_position((r, c))]
+
+def assert_same_results(maze, pairs, results):
+    """Compara cada resultado com uma chamada individual de astar"""
+    assert len(results) == len(pairs)
+    for (start, goal), path in zip(pairs, results):
+        reference = astar(maze, start=start, goal=goal)
+        if reference is None:
+            assert path is None
+        else:
+            assert path[0] == start and path[-1] == goal
+            assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+
+def test_astar_many_shared_starts(open_maze):
+    """Testa consultas que compartilham o início (uma única busca por início)"""
+    cells = free_cells(open_maze)
+    pairs = [(cells[0], goal) for goal in cells[::3]] + [(cells[5], goal) for goal in cells[::7]]
+    assert_same_results(open_maze, pairs, astar_many(open_maze, pairs))
+
+def test_astar_many_independent_and_repeated(open_maze):
+    """Testa consultas independentes e pares repetidos"""
+    cells = free_cells(open_maze)
+    pairs = [(cells[i], cells[-1 - i]) for i in range(6)] + [(cells[0], cells[-1])]
+    results = astar_many(open_maze, pairs)
+    assert_same_results(open_maze, pairs, results)
+    assert results[0] == results[-1] and results[0] is not results[-1]
+
+def test_astar_many_process_pool(open_maze):
+    """Testa a distribuição das consultas independentes em processos"""
+    cells = free_cells(open_maze)
+    pairs = [(cells[i], cells[-1 - i]) for i in range(8)]
+    assert_same_results(open_maze, pairs, astar_many(open_maze, pairs, processes=2))
+
+def test_astar_many_invalid_position(open_maze):
+    """Testa o erro para posições fora do labirinto"""
+    with pytest.raises(ValueError, match="fora do labirinto"):
+        astar_many(open_maze, [((0, 0), (8, 0))])
+
+def test_size_chunks():
+    """Testa lotes maiores primeiro, com os labirintos grandes sozinhos"""
+    sizes = [100, 4, 10000, 4, 6, 2500, 4, 8]
+    chunks = _size_chunks(sizes, processes=2)
+    assert sorted(index for chunk in chunks for index in chunk) == list(range(len(sizes)))
+    assert chunks[0] == [2] and chunks[1] == [5]
+    assert len(chunks[-1]) > 1
+    totals = [sum(sizes[index] for index in chunk) for chunk in chunks]
+    assert totals == sorted(totals, reverse=True)
+
+def test_solve_mazes_in_order():
+    """Testa resultados e contadores na ordem de entrada, com e sem processos"""
+    mazes = [generate('rooms', 48), generate('random', 10, seed=1), generate('noise', 24),
+             Maze([['S', '#'], ['#', 'E']]), generate('corridors', 15, seed=2)]
+    mazes[2].movement_weights = {'orthogonal': 1, 'diagonal': 2}
+    serial = solve_mazes(mazes)
+    parallel = solve_mazes(mazes, processes=2)
+    for maze, result, other in zip(mazes, serial, parallel):
+        reference = astar_search(maze)
+        assert result.status == other.status == reference.status
+        assert result.path == other.path == reference.path
+        assert other.stats.nodes_expanded == reference.stats.nodes_expanded
+    assert parallel[3].status == NO_PATH and parallel[0].status == FOUND
+
+def test_solve_mazes_limits_and_cleanup(monkeypatch):
+    """Testa os limites de busca e a remoção do bloco compartilhado"""
+    created = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get('create'):
+                created.append(self.name)
+
+    monkeypatch.setattr(shared_memory, 'SharedMemory', RecordingSharedMemory)
+    mazes = [generate('rooms', 48), generate('random', 12)]
+    results = solve_mazes(mazes, processes=2, max_expansions=5)
+    assert [result.status for result in results] == [BUDGET_EXCEEDED, BUDGET_EXCEEDED]
+    assert all(result.stats.nodes_expanded == 5 for result in results)
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created[0])
+
+def _attach_and_exit(block_name, closed):
+    """Processo que se conecta ao bloco como um processo do pool e termina"""
+    original = shared_memory.SharedMemory.close
+
+    def close(self):
+        closed.set()
+        original(self)
+
+    shared_memory.SharedMemory.close = close
+    _init_shared_worker(block_name, None, None, None)
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="a troca de SharedMemory.close só vale no processo criado por fork")
+def test_shared_worker_closes_block_on_exit():
+    """Testa se o processo do pool fecha o bloco compartilhado ao terminar"""
+    block = shared_memory.SharedMemory(create=True, size=16)
+    try:
+        closed = multiprocessing.Event()
+        process = multiprocessing.Process(target=_attach_and_exit, args=(block.name, closed))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert closed.is_set()
+    finally:
+        block.close()
+        block.unlink()
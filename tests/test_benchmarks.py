@@ -0,0 +1,66 @@
+import json
+import numpy as np
+import pytest
+from src.astar import astar
+from src.utils import WALL_CODE
+from benchmarks.generators import GENERATORS, generate
+from benchmarks.run import compare, load_case, main, run_benchmarks
+
+@pytest.mark.parametrize("family", list(GENERATORS))
+def test_generators_are_deterministic_and_solvable(family):
+    """Testa formato, reprodutibilidade e solução de cada família"""
+    maze = generate(family, 33, seed=7)
+    assert maze.terrain.shape == (33, 33)
+    assert maze.terrain.dtype == np.uint8
+    assert np.array_equal(maze.terrain, generate(family, 33, seed=7).terrain)
+    assert not np.array_equal(maze.terrain, generate(family, 33, seed=8).terrain)
+    assert astar(maze) is not None
+
+def test_corridors_are_a_perfect_maze():
+    """Testa se o backtracker abre exatamente uma parede por célula alcançada"""
+    maze = generate('corridors', 21)
+    cells = 10 * 10
+    assert np.count_nonzero(maze.terrain != WALL_CODE) == 2 * cells - 1
+
+def test_generate_unknown_family():
+    """Testa o erro para famílias inexistentes"""
+    with pytest.raises(ValueError):
+        generate('spiral', 10)
+
+def test_load_case_uses_cache(tmp_path):
+    """Testa se o labirinto gerado é guardado e recarregado do disco"""
+    first = load_case('rooms', 20, 0, str(tmp_path))
+    assert (tmp_path / 'rooms-20-0.maze').exists()
+    second = load_case('rooms', 20, 0, str(tmp_path))
+    assert isinstance(second.terrain, np.memmap)
+    assert np.array_equal(first.terrain, second.terrain)
+
+def test_run_and_compare():
+    """Testa as medições e a detecção de regressões"""
+    results = run_benchmarks(['noise'], [16], ['astar', 'jps'], repeat=1, cache_dir=None)
+    assert set(results) == {'noise/16/astar', 'noise/16/jps'}
+    for result in results.values():
+        assert result['expansions'] > 0 and result['peak_memory'] > 0 and result['time'] > 0
+    assert results['noise/16/astar']['cost'] == pytest.approx(results['noise/16/jps']['cost'])
+    assert compare(results, results) == []
+
+    baseline = {key: dict(result) for key, result in results.items()}
+    baseline['noise/16/astar']['time'] /= 100
+    baseline['noise/16/astar']['expansions'] -= 1
+    baseline['noise/16/jps']['cost'] += 1
+    regressions = compare(results, baseline, time_floor=0)
+    assert len(regressions) == 3
+    assert compare(results, baseline, time_floor=1e9)[0].startswith('noise/16/astar: expansions')
+
+def test_main_exit_codes(tmp_path):
+    """Testa a gravação da linha de base e o código de saída em regressão"""
+    path = tmp_path / 'baseline.json'
+    argv = ['--families', 'rooms', '--sizes', '12', '--solvers', 'astar',
+            '--repeat', '1', '--no-cache', '--baseline', str(path)]
+    assert main(argv + ['--update-baseline']) == 0
+    assert main(argv) == 0
+
+    baseline = json.loads(path.read_text())
+    baseline['rooms/12/astar']['expansions'] = 0
+    path.write_text(json.dumps(baseline))
+    assert main(argv) == 1
@@ -0,0 +1,129 @@
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import pytest
+from src import cli
+from src.maze_io import load_maze
+from src.cli import ALGORITHMS, STAT_LABELS, iter_maze_files, main, run_batch, solve_file
+
+SOLVABLE = "S 0 1\n0 # 0\n0 0 E\n"
+UNSOLVABLE = "S # 0\n# # 0\n0 0 E\n"
+
+@pytest.fixture
+def maze_dir(tmp_path):
+    """Fixture com uma pasta de labirintos, incluindo um inválido"""
+    (tmp_path / 'a.txt').write_text(SOLVABLE)
+    (tmp_path / 'b.txt').write_text(UNSOLVABLE)
+    (tmp_path / 'c.txt').write_text("S 0 0\n0 X E\n")
+    (tmp_path / 'notas.md').write_text("não é labirinto")
+    return tmp_path
+
+@pytest.mark.parametrize("algorithm", ['astar', 'bidirectional', 'jps', 'jps+', 'hpa'])
+def test_solve_file(maze_dir, algorithm):
+    """Testa o resultado de cada algoritmo"""
+    result = solve_file(str(maze_dir / 'a.txt'), algorithm)
+    assert result['found'] and result['algorithm'] == algorithm
+    assert result['cost'] == pytest.approx(4.0)
+    assert result['path'][0] == [0, 0] and result['path'][-1] == [2, 2]
+    assert result['length'] == len(result['path'])
+    assert result['stats']['nodes_expanded'] > 0
+    json.dumps(result)
+
+def test_solve_file_errors(maze_dir):
+    """Testa se erros de leitura viram o campo 'error'"""
+    assert 'linha 2, coluna 3' in solve_file(str(maze_dir / 'c.txt'))['error']
+    assert 'error' in solve_file(str(maze_dir / 'inexistente.txt'))
+    assert 'path' not in solve_file(str(maze_dir / 'a.txt'), include_path=False)
+
+def test_iter_maze_files(maze_dir):
+    """Testa a listagem por pasta e por manifesto"""
+    assert [path.rsplit('/', 1)[-1] for path in iter_maze_files(str(maze_dir))] == ['a.txt', 'b.txt', 'c.txt']
+    manifest = maze_dir / 'lista.txt'
+    manifest.write_text("# comentário\nb.txt\n\na.txt\n")
+    assert list(iter_maze_files(str(manifest))) == [str(maze_dir / 'b.txt'), str(maze_dir / 'a.txt')]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(maze_dir, tmp_path, workers):
+    """Testa o lote em processo único e em pool de processos"""
+    output = tmp_path / 'out.jsonl'
+    files = (str(maze_dir / name) for name in ['a.txt', 'b.txt', 'c.txt'] * 3)
+    with open(output, 'w') as file:
+        counts = run_batch(files, file, workers=workers, max_pending=2)
+    assert counts == {'solved': 3, 'unsolved': 3, 'errors': 3}
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == 9
+    assert sorted(line['file'].rsplit('/', 1)[-1] for line in lines) == ['a.txt'] * 3 + ['b.txt'] * 3 + ['c.txt'] * 3
+
+def test_solver_errors(maze_dir, monkeypatch):
+    """Testa se uma falha do solucionador vira o campo 'error'"""
+    def broken(maze, heuristic, stats):
+        raise RuntimeError("falhou")
+    monkeypatch.setitem(ALGORITHMS, 'broken', broken)
+    assert solve_file(str(maze_dir / 'a.txt'), 'broken') == {'file': str(maze_dir / 'a.txt'), 'error': 'falhou'}
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="o algoritmo de teste só chega aos processos por fork")
+def test_run_batch_worker_crash(maze_dir, tmp_path, monkeypatch):
+    """Testa se um labirinto que derruba o processo conta só como um erro"""
+    def crash_on_single_row(maze, heuristic, stats):
+        if maze.rows == 1:
+            os._exit(1)
+        return ALGORITHMS['astar'](maze, heuristic, stats)
+    monkeypatch.setitem(ALGORITHMS, 'crash', crash_on_single_row)
+    (maze_dir / 'd.txt').write_text("S 0 E\n")
+    output = tmp_path / 'out.jsonl'
+    files = [str(maze_dir / name) for name in ['a.txt', 'b.txt', 'd.txt', 'a.txt', 'b.txt', 'a.txt']]
+    with open(output, 'w') as file:
+        counts = run_batch(iter(files), file, 'crash', workers=2, max_pending=4)
+    assert counts == {'solved': 3, 'unsolved': 2, 'errors': 1}
+    errors = [line for line in map(json.loads, output.read_text().splitlines()) if 'error' in line]
+    assert [line['file'] for line in errors] == [str(maze_dir / 'd.txt')]
+
+def test_main_solve(maze_dir, capsys):
+    """Testa a saída e os códigos de retorno do comando solve"""
+    assert main(['solve', str(maze_dir / 'a.txt'), '--show-maze']) == 0
+    out = capsys.readouterr().out
+    assert 'custo 4.00' in out and '* * E' in out
+    for label in STAT_LABELS.values():
+        assert label + ':' in out
+
+    assert main(['solve', str(maze_dir / 'b.txt'), '--json']) == 1
+    assert json.loads(capsys.readouterr().out)['found'] is False
+
+    assert main(['solve', str(maze_dir / 'c.txt')]) == 2
+
+def test_show_maze_loads_once(maze_dir, monkeypatch, capsys):
+    """Testa se --show-maze reaproveita o labirinto já carregado"""
+    loads = []
+    monkeypatch.setattr(cli, 'load_maze', lambda path: loads.append(path) or load_maze(path))
+    assert main(['solve', str(maze_dir / 'a.txt'), '--show-maze']) == 0
+    assert loads == [str(maze_dir / 'a.txt')]
+    assert '* * E' in capsys.readouterr().out
+
+def test_main_batch(maze_dir, tmp_path):
+    """Testa o comando batch gravando em arquivo"""
+    output = tmp_path / 'out.jsonl'
+    assert main(['batch', str(maze_dir), '-o', str(output), '-j', '1', '--no-path']) == 2
+    assert len(output.read_text().splitlines()) == 3
+    (maze_dir / 'c.txt').unlink()
+    assert main(['batch', str(maze_dir), '-o', str(output), '-j', '1']) == 0
+
+def test_main_convert(maze_dir, tmp_path, capsys):
+    """Testa a conversão de texto para o formato binário"""
+    output = tmp_path / 'a.maze'
+    assert main(['convert', str(maze_dir / 'a.txt'), str(output)]) == 0
+    assert capsys.readouterr().out.strip() == f"{output}: 3x3"
+    assert load_maze(str(output)).maze == load_maze(str(maze_dir / 'a.txt')).maze
+    assert main(['convert', str(maze_dir / 'c.txt'), str(tmp_path / 'c.maze')]) == 2
+
+def test_cli_does_not_import_tkinter(maze_dir):
+    """Testa se a linha de comando funciona sem carregar o tkinter"""
+    code = ("import sys, runpy; sys.argv = ['src', 'solve', sys.argv[1]]\n"
+            "try:\n    runpy.run_module('src', run_name='__main__')\n"
+            "except SystemExit:\n    pass\n"
+            "assert 'tkinter' not in sys.modules")
+    completed = subprocess.run([sys.executable, '-c', code, str(maze_dir / 'a.txt')],
+                               capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,218 @@
+from collections import deque
+import time
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar, astar_search
+from src.components import label_components
+from src.ara import ara_star
+from src.jps import JumpPointSearch, jps
+from src.hpa import HierarchicalPathfinder
+from src.dstar_lite import DStarLite
+from src.distance_field import DistanceFieldCache, distance_field_path
+from src.batch import astar_many
+from src.contraction import contraction_path
+from src.stats import SearchStats, NO_PATH
+from tests.helpers import random_maze
+
+def _bfs_partition(maze):
+    """Componentes por busca em largura sobre get_neighbors (referência)"""
+    seen = {}
+    for row in range(maze.rows):
+        for col in range(maze.cols):
+            if (row, col) in seen or maze.get_cost((row, col), (row, col)) == np.inf:
+                continue
+            seen[(row, col)] = (row, col)
+            queue = deque([(row, col)])
+            while queue:
+                pos = queue.popleft()
+                for neighbor in maze.get_neighbors(pos):
+                    if neighbor not in seen:
+                        seen[neighbor] = (row, col)
+                        queue.append(neighbor)
+    return seen
+
+def _same_partition(index, reference, rows, cols):
+    """Compara a partição do índice com a de referência"""
+    mapping = {}
+    for row in range(rows):
+        for col in range(cols):
+            label = index.component((row, col))
+            if (row, col) not in reference:
+                if label != -1:
+                    return False
+                continue
+            if mapping.setdefault(label, reference[(row, col)]) != reference[(row, col)]:
+                return False
+    return len(mapping) == len(set(reference.values()))
+
+@pytest.mark.parametrize("density", [0.2, 0.4, 0.6])
+def test_label_components_matches_bfs(density):
+    """Testa a rotulagem contra uma busca em largura com diagonais"""
+    rng = np.random.default_rng(7)
+    for _ in range(10):
+        maze = random_maze(rng, 25, walls=density, symbols='0123')
+        assert _same_partition(maze.get_components(), _bfs_partition(maze), maze.rows, maze.cols)
+
+def test_label_components_values():
+    """Testa o formato dos rótulos: -1 nos obstáculos e o menor índice plano"""
+    passable = np.array([[1, 0, 1],
+                         [1, 0, 1],
+                         [0, 1, 1]], dtype=bool)
+    assert label_components(passable).tolist() == [0, -1, 2, 0, -1, 2, -1, 2, 2]
+    assert (label_components(np.zeros((2, 3), dtype=bool)) == -1).all()
+
+def test_diagonal_does_not_connect_corners():
+    """Testa se uma diagonal entre dois obstáculos não une componentes"""
+    maze = Maze([['S', '#'], ['#', 'E']])
+    assert not maze.connected((0, 0), (1, 1))
+    assert maze.connected((0, 0), (0, 0))
+    assert not maze.connected((0, 0), (0, 1))
+    assert not maze.connected((0, 1), (0, 1))
+
+def test_out_of_range_positions():
+    """Testa se posições fora da grade não pertencem a nenhum componente"""
+    maze = Maze([['S', '0', '0'], ['0', '0', '0'], ['0', '0', 'E']])
+    components = maze.get_components()
+    for pos in [(0, -1), (-1, 0), (3, 0), (0, 3), (5, 5)]:
+        assert components.component(pos) == -1
+        assert not components.connected((0, 0), pos)
+        assert not maze.connected(pos, (0, 0))
+        assert not maze.connected(pos, pos)
+    assert maze.connected((0, 0), (2, 2))
+
+def test_start_equal_to_goal_on_wall():
+    """Testa se todos os solucionadores recusam início igual ao fim num obstáculo"""
+    maze = Maze([['S', '0', '#'], ['0', '0', '0'], ['0', '0', 'E']])
+    wall = (0, 2)
+    assert astar(maze, start=wall, goal=wall) is None
+    assert astar(maze, start=wall, goal=wall, bidirectional=True) is None
+    assert astar_search(maze, start=wall, goal=wall).path is None
+    assert ara_star(maze, start=wall, goal=wall) is None
+    assert JumpPointSearch(maze).find_path(wall, wall) is None
+    assert JumpPointSearch(maze, plus=True).find_path(wall, wall) is None
+    assert HierarchicalPathfinder(maze).find_path(wall, wall) is None
+    planner = DStarLite(maze, start=wall, goal=wall)
+    assert planner.replan() is None and planner.cost == np.inf
+    assert distance_field_path(maze, start=wall, goal=wall, cache=DistanceFieldCache()) is None
+    assert astar_many(maze, [(wall, wall)]) == [None]
+    assert contraction_path(maze, start=wall, goal=wall) is None
+    # Numa célula transitável o caminho continua sendo a própria célula
+    assert astar(maze, start=(1, 1), goal=(1, 1)) == [(1, 1)]
+    assert HierarchicalPathfinder(maze).find_path((1, 1), (1, 1)) == [(1, 1)]
+
+def test_incremental_updates_match_full_labeling():
+    """Testa aberturas e fechamentos sucessivos contra a rotulagem completa"""
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        maze = random_maze(rng, 20, walls=0.35, symbols='0123')
+        maze.get_components()
+        for _ in range(60):
+            pos = tuple(int(value) for value in rng.integers(0, 20, size=2))
+            if pos in (maze.start_pos, maze.end_pos):
+                continue
+            maze.set_cells([(pos, '#' if maze.maze[pos[0]][pos[1]] != '#' else '2')])
+            assert _same_partition(maze.get_components(), _bfs_partition(maze), 20, 20)
+
+def test_split_and_merge():
+    """Testa a divisão de um componente por uma parede e a reunião por uma porta"""
+    cells = [['0'] * 7 for _ in range(5)]
+    cells[0][0], cells[4][6] = 'S', 'E'
+    maze = Maze(cells)
+    assert maze.connected(maze.start_pos, maze.end_pos)
+
+    maze.set_cells([((row, 3), '#') for row in range(5)])
+    assert not maze.connected(maze.start_pos, maze.end_pos)
+    assert maze.connected((0, 0), (4, 2)) and maze.connected((0, 4), (4, 6))
+
+    maze.set_cells([((2, 3), '1')])
+    assert maze.connected(maze.start_pos, maze.end_pos)
+    assert astar(maze) is not None
+
+    # Mudar só o peso não altera os componentes
+    index = maze.get_components()
+    maze.set_cells([((2, 3), '3')])
+    assert maze.get_components() is index and maze.connected(maze.start_pos, maze.end_pos)
+
+def test_component_cells():
+    """Testa a lista de células de um componente, inclusive depois de uniões"""
+    maze = Maze([['S', '#', '0'], ['0', '#', '0'], ['0', '#', 'E']])
+    index = maze.get_components()
+    assert sorted(index.cells((0, 0)).tolist()) == [0, 3, 6]
+    maze.set_cells([((1, 1), '0')])
+    assert sorted(index.cells((2, 2)).tolist()) == [0, 2, 3, 4, 5, 6, 8]
+    assert index.cells((0, 1)).size == 0
+
+def test_component_cells_follow_updates():
+    """Testa as listas de células mantidas ao longo de aberturas e fechamentos"""
+    rng = np.random.default_rng(11)
+    maze = random_maze(rng, 20, walls=0.35, symbols='0123')
+    index = maze.get_components()
+    index.cells(maze.start_pos)  # Monta as listas antes das alterações
+    for _ in range(80):
+        pos = tuple(int(value) for value in rng.integers(0, 20, size=2))
+        if pos in (maze.start_pos, maze.end_pos):
+            continue
+        maze.set_cells([(pos, '#' if maze.maze[pos[0]][pos[1]] != '#' else '1')])
+        reference = _bfs_partition(maze)
+        probe = tuple(int(value) for value in rng.integers(0, 20, size=2))
+        expected = sorted(row * 20 + col for (row, col), root in reference.items()
+                          if probe in reference and root == reference[probe])
+        assert index.cells(probe).tolist() == expected
+
+def test_split_keeps_label_of_larger_piece():
+    """Testa se fechar uma célula só rotula de novo o pedaço que se soltou"""
+    cells = [['0'] * 60 for _ in range(60)]
+    cells[0][0], cells[59][59] = 'S', 'E'
+    cells[2][0] = cells[2][1] = cells[1][2] = '#'
+    maze = Maze(cells)
+    index = maze.get_components()
+    label = index.component(maze.end_pos)
+    before = index.labels.copy()
+    maze.set_cells([((0, 2), '#')])  # Isola o canto com o início
+    assert not maze.connected(maze.start_pos, maze.end_pos)
+    assert index.component(maze.end_pos) == label
+    assert np.flatnonzero(index.labels != before).tolist() == [0, 1, 2, 60, 61]
+    assert index.cells(maze.start_pos).tolist() == [0, 1, 60, 61]
+
+def test_unreachable_goal_skips_search():
+    """Testa se os solucionadores não expandem nada com o objetivo isolado"""
+    cells = [['0'] * 200 for _ in range(200)]
+    cells[0][0], cells[199][199] = 'S', 'E'
+    cells[198][198] = cells[198][199] = cells[199][198] = '#'
+    maze = Maze(cells)
+
+    stats = SearchStats()
+    assert astar(maze, stats=stats) is None
+    assert stats.nodes_expanded == 0
+    assert astar(maze, bidirectional=True) is None
+    assert jps(maze) is None and jps(maze, plus=True) is None
+    assert HierarchicalPathfinder(maze).find_path() is None
+
+    started = time.perf_counter()
+    result = astar_search(maze)
+    assert result.status == NO_PATH and result.stats.nodes_expanded == 0
+    assert time.perf_counter() - started < 1.0
+    assert result.partial_path[0] == (0, 0) and result.partial_path[-1] in ((197, 199), (199, 197))
+
+def test_exhausted_labels_relabel_everything():
+    """Testa a rotulagem completa quando os rótulos novos se esgotam"""
+    cells = [['0'] * 5 for _ in range(5)]
+    cells[0][0], cells[4][4] = 'S', 'E'
+    maze = Maze(cells)
+    index = maze.get_components()
+    index._next_label = np.iinfo(index.labels.dtype).max
+    maze.set_cells([((row, 2), '#') for row in range(5)])  # Divide o componente
+    assert not maze.connected(maze.start_pos, maze.end_pos)
+    assert index.labels.max() < maze.rows * maze.cols and not index._alias
+    maze.set_cells([((2, 2), '0')])
+    assert maze.connected(maze.start_pos, maze.end_pos)
+
+def test_largest_component():
+    """Testa a escolha do maior componente, inclusive depois de uniões"""
+    maze = Maze([['S', '#', '0', '0'], ['0', '#', '0', '0'], ['0', '#', '#', 'E']])
+    index = maze.get_components()
+    assert sorted(index.largest().tolist()) == [2, 3, 6, 7, 11]
+    maze.set_cells([((1, 1), '0')])
+    assert sorted(index.largest().tolist()) == [0, 2, 3, 4, 5, 6, 7, 8, 11]
+    assert Maze([['S', 'E']]).get_components().largest().tolist() == [0, 1]
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.cli import main
+from src.contraction import (
+    build_contraction_hierarchy, contraction_path, get_contraction_hierarchy, hierarchy_file,
+    load_contraction_hierarchy, save_contraction_hierarchy
+)
+from src.maze_io import load_binary_maze, load_maze, save_binary_maze
+from src.stats import SearchStats
+from benchmarks.generators import generate
+from tests.helpers import assert_valid_path, maze_text, random_maze
+
+@pytest.mark.parametrize("seed", range(3))
+def test_paths_match_astar(seed):
+    """Testa custos ótimos e caminhos válidos entre todos os pares de células"""
+    maze = random_maze(seed, 16, walls=0.3, symbols='00123')
+    hierarchy = build_contraction_hierarchy(maze)
+    cells = [(row, col) for row in range(maze.rows) for col in range(maze.cols)
+             if maze.maze[row][col] != '#']
+    rng = np.random.default_rng(seed)
+    for k in rng.choice(len(cells) ** 2, size=150, replace=False):
+        start, goal = cells[k // len(cells)], cells[k % len(cells)]
+        reference = astar(maze, start=start, goal=goal)
+        path = hierarchy.find_path(start, goal)
+        if reference is None:
+            assert path is None
+            assert hierarchy.distance(start, goal) == np.inf
+            continue
+        assert_valid_path(maze, path, start, goal)
+        assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+        assert hierarchy.distance(start, goal) == pytest.approx(maze.path_cost(reference))
+
+def test_contraction_path_defaults_and_edge_cases():
+    """Testa início e fim padrão, início igual ao fim, obstáculos e componentes isolados"""
+    maze = Maze([['S', '0', '#', '0'],
+                 ['0', '0', '#', '0'],
+                 ['#', '#', '#', 'E']])
+    assert contraction_path(maze) is None
+    assert len(contraction_path(maze, goal=(1, 1))) == 2
+    assert contraction_path(maze, start=(1, 0), goal=(1, 0)) == [(1, 0)]
+
+    hierarchy = get_contraction_hierarchy(maze)
+    assert hierarchy.find_path((0, 0), (0, 2)) is None
+    assert hierarchy.find_path((0, 2), (0, 2)) is None
+    assert hierarchy.distance((0, 3), (2, 3)) == pytest.approx(maze.get_cost((0, 3), (1, 3)) * 2)
+    with pytest.raises(ValueError):
+        contraction_path(maze, goal=(5, 5))
+
+def test_search_space_is_small():
+    """Testa se a busca na hierarquia expande bem menos células que o A*"""
+    maze = generate('rooms', 48)
+    astar_stats, ch_stats = SearchStats(), SearchStats()
+    reference = astar(maze, stats=astar_stats)
+    path = contraction_path(maze, stats=ch_stats)
+    assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+    assert ch_stats.nodes_expanded == ch_stats.nodes_expanded_forward + ch_stats.nodes_expanded_backward
+    assert ch_stats.nodes_expanded < astar_stats.nodes_expanded / 4
+
+def test_set_cells_drops_hierarchy():
+    """Testa se alterar o labirinto descarta o índice"""
+    maze = random_maze(4, 16, walls=0.3, symbols='00123')
+    hierarchy = get_contraction_hierarchy(maze)
+    assert get_contraction_hierarchy(maze) is hierarchy
+    maze.set_cells([((3, 3), '#' if maze.maze[3][3] != '#' else '0')])
+    assert get_contraction_hierarchy(maze) is not hierarchy
+    assert not hierarchy.matches(maze)
+    with pytest.raises(ValueError):
+        hierarchy.attach(maze)
+
+def test_save_and_load_alongside_maze(tmp_path):
+    """Testa a gravação ao lado do labirinto e a carga mapeada em memória"""
+    maze = random_maze(5, 16, walls=0.3, symbols='00123')
+    text_path = tmp_path / 'mapa.txt'
+    text_path.write_text(maze_text(maze.maze))
+    binary_path = str(tmp_path / 'mapa.maze')
+    save_binary_maze(maze, binary_path)
+
+    hierarchy = build_contraction_hierarchy(maze)
+    for path in (str(text_path), binary_path):
+        save_contraction_hierarchy(hierarchy, hierarchy_file(path))
+
+    loaded = load_contraction_hierarchy(hierarchy_file(binary_path))
+    assert isinstance(loaded.indices, np.memmap) and isinstance(loaded.order, np.memmap)
+    for name in ('indptr', 'indices', 'costs', 'middle', 'children', 'order'):
+        assert np.array_equal(getattr(loaded, name), getattr(hierarchy, name))
+    assert (len(loaded), loaded.shortcuts) == (len(hierarchy), hierarchy.shortcuts)
+
+    for reloaded in (load_maze(str(text_path)), load_binary_maze(binary_path), load_maze(binary_path)):
+        attached = get_contraction_hierarchy(reloaded)
+        assert isinstance(attached.indices, np.memmap)
+        assert contraction_path(reloaded) == hierarchy.find_path(maze.start_pos, maze.end_pos)
+
+    # Com outros pesos o índice não vale e é reconstruído
+    other = load_maze(str(text_path), {'S': 1.0, 'E': 1.0, '0': 2.0, '1': 2.0, '2': 2.0, '3': 2.0})
+    assert not isinstance(get_contraction_hierarchy(other).indices, np.memmap)
+
+def test_load_errors(tmp_path):
+    """Testa arquivos inválidos e índices de outro labirinto"""
+    path = tmp_path / 'mapa.ch'
+    path.write_bytes(b'nada')
+    with pytest.raises(ValueError):
+        load_contraction_hierarchy(str(path))
+
+    hierarchy = build_contraction_hierarchy(random_maze(6, 8, walls=0.3, symbols='00123'))
+    save_contraction_hierarchy(hierarchy, str(path))
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+        load_contraction_hierarchy(str(path))
+
+    save_contraction_hierarchy(hierarchy, str(path))
+    with pytest.raises(ValueError):
+        load_contraction_hierarchy(str(path), random_maze(7, 8, walls=0.3, symbols='00123'))
+
+def test_cli_contract(tmp_path, capsys):
+    """Testa o comando que grava o índice e a busca com o algoritmo 'ch'"""
+    maze = random_maze(0, 16, walls=0.3, symbols='00123')
+    path = tmp_path / 'mapa.txt'
+    path.write_text(maze_text(maze.maze))
+    assert main(['contract', str(path)]) == 0
+    assert 'atalhos' in capsys.readouterr().out
+    assert len(load_contraction_hierarchy(hierarchy_file(str(path)), maze)) > 0
+    assert main(['solve', str(path), '--algorithm', 'ch']) == 0
+    assert main(['contract', str(tmp_path / 'inexistente.txt')]) == 2
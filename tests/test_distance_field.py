@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.distance_field import DistanceFieldCache, build_distance_field, distance_field_path
+from tests.helpers import random_maze
+
+@pytest.fixture
+def maze():
+    """Fixture com um labirinto 9x9 com obstáculos e terrenos variados"""
+    return random_maze(5, 9)
+
+def test_distance_field_matches_astar(maze):
+    """Testa se os caminhos do campo têm o mesmo custo que os do A*"""
+    field = build_distance_field(maze)
+    for row in range(maze.rows):
+        for col in range(maze.cols):
+            reference = astar(maze, start=(row, col))
+            path = field.path_from((row, col))
+            if reference is None:
+                assert path is None
+                assert field.cost_from((row, col)) == np.inf
+                continue
+            assert path[0] == (row, col) and path[-1] == maze.end_pos
+            for pos1, pos2 in zip(path, path[1:]):
+                assert pos2 in maze.get_neighbors(pos1)
+            assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+            assert field.cost_from((row, col)) == pytest.approx(maze.path_cost(reference))
+
+def test_distance_field_cache_hits(maze):
+    """Testa se consultas repetidas ao mesmo objetivo reaproveitam o campo"""
+    cache = DistanceFieldCache()
+    distance_field_path(maze, cache=cache)
+    distance_field_path(maze, start=(0, 1), cache=cache)
+    # Outra instância com o mesmo conteúdo compartilha o campo
+    distance_field_path(Maze(maze.maze), cache=cache)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_distance_field_cache_byte_budget(maze):
+    """Testa a remoção LRU quando o orçamento de bytes é excedido"""
+    field_bytes = build_distance_field(maze).nbytes
+    cache = DistanceFieldCache(max_bytes=2 * field_bytes)
+    goals = [(8, 8), (0, 0), (4, 4)]
+    for goal in goals[:2]:
+        cache.get(maze, goal)
+    cache.get(maze, goals[0])  # (8, 8) passa a ser o mais recente
+    cache.get(maze, goals[2])  # Remove (0, 0), o menos usado
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.current_bytes <= cache.max_bytes
+    cache.get(maze, goals[0])
+    assert cache.hits == 2
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.dstar_lite import DStarLite
+from src.stats import SearchStats
+from tests.helpers import assert_valid_path, random_maze
+
+def assert_matches_astar(maze, path, start=None):
+    """Verifica se o caminho é válido e tem o custo do A*"""
+    start = maze.start_pos if start is None else start
+    reference = astar(maze, start=start)
+    assert (path is None) == (reference is None)
+    if path is not None:
+        assert_valid_path(maze, path, start)
+        assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+
+@pytest.mark.parametrize("seed", range(15))
+def test_dstar_lite_replans_optimally(seed):
+    """Testa se após cada lote de alterações o caminho tem o custo ótimo"""
+    maze = random_maze(seed, 15, 18)
+    planner = DStarLite(maze)
+    assert_matches_astar(maze, planner.replan())
+
+    rng = np.random.default_rng(seed + 100)
+    for _ in range(6):
+        changes = []
+        for row, col in rng.integers(0, [15, 18], size=(3, 2)).tolist():
+            if (row, col) not in (maze.start_pos, maze.end_pos):
+                changes.append(((row, col), str(rng.choice(['0', '1', '3', '#']))))
+        planner.update_cells(changes)
+        assert_matches_astar(maze, planner.replan())
+
+def test_dstar_lite_moving_start():
+    """Testa o replanejamento quando o início anda pelo caminho"""
+    maze = random_maze(4, 20, walls=0.15)
+    planner = DStarLite(maze)
+    path = planner.replan()
+    assert_matches_astar(maze, path)
+    for step in range(1, 4):
+        start = path[1]
+        # Um obstáculo aparece logo à frente do agente
+        ahead = path[2] if len(path) > 2 else None
+        if ahead is not None and ahead != maze.end_pos:
+            planner.update_cells([(ahead, '#')])
+        path = planner.replan(start=start)
+        assert_matches_astar(maze, path, start)
+        if path is None or len(path) < 3:
+            break
+
+def test_dstar_lite_small_edit_is_cheap():
+    """Testa se uma alteração longe do caminho custa poucas expansões"""
+    maze = Maze([['S'] + ['0'] * 29] + [['0'] * 30 for _ in range(28)] + [['0'] * 29 + ['E']])
+    planner = DStarLite(maze)
+    stats = SearchStats()
+    planner.replan(stats=stats)
+    initial = stats.nodes_expanded
+
+    planner.update_cells([((29, 0), '#')])
+    path = planner.replan(stats=stats)
+    assert stats.nodes_expanded < initial / 5
+    assert_matches_astar(maze, path)
+
+    # Sem alterações, nada é expandido
+    planner.replan(stats=stats)
+    assert stats.nodes_expanded == 0
+
+def test_dstar_lite_blocked_and_reopened():
+    """Testa o fechamento e a reabertura da única passagem"""
+    maze = Maze([
+        ['S', '0', '#', '0', '0'],
+        ['0', '0', '0', '0', '0'],
+        ['0', '0', '#', '0', 'E'],
+    ])
+    planner = DStarLite(maze)
+    assert_matches_astar(maze, planner.replan())
+    planner.update_cells([((1, 2), '#')])
+    assert planner.replan() is None
+    assert planner.cost == float('inf')
+    planner.update_cells([((1, 2), '2')])
+    assert_matches_astar(maze, planner.replan())
+    assert planner.cost == pytest.approx(maze.path_cost(planner.replan()))
+
+def test_dstar_lite_cancel_and_resume():
+    """Testa se um replan cancelado é retomado pelo próximo"""
+    from src.stats import SearchCancelled
+    maze = random_maze(7, 60, walls=0.1)
+    planner = DStarLite(maze, heuristic='dijkstra')
+    calls = []
+    with pytest.raises(SearchCancelled):
+        planner.replan(progress=lambda expanded, frontier: calls.append(expanded) or False)
+    assert len(calls) == 1
+
+    stats = SearchStats()
+    assert_matches_astar(maze, planner.replan(stats=stats))
+    full = SearchStats()
+    DStarLite(maze, heuristic='dijkstra').replan(stats=full)
+    assert stats.nodes_expanded < full.nodes_expanded
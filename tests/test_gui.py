@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.gui import PathFinderGUI, build_palette, fit_scale, render_viewport, cell_box, ppm_image, ZOOM_LEVELS
+from src.utils import TERRAIN_SYMBOLS
+
+@pytest.fixture
+def palette():
+    """Fixture com uma cor distinta para cada código de terreno"""
+    return build_palette({symbol: '#%02X%02X%02X' % (code, 0, 255 - code)
+                          for code, symbol in enumerate(TERRAIN_SYMBOLS)})
+
+@pytest.fixture
+def terrain():
+    """Fixture com uma grade 30x20 de códigos variados"""
+    rng = np.random.default_rng(1)
+    return rng.integers(0, len(TERRAIN_SYMBOLS), size=(30, 20), dtype=np.uint8)
+
+def test_build_palette():
+    """Testa a conversão das cores '#RRGGBB' para RGB"""
+    colors = {symbol: '#000000' for symbol in TERRAIN_SYMBOLS}
+    colors['#'] = '#12AB7F'
+    palette = build_palette(colors)
+    assert palette.shape == (len(TERRAIN_SYMBOLS), 3)
+    assert palette[TERRAIN_SYMBOLS.index('#')].tolist() == [0x12, 0xAB, 0x7F]
+
+def test_fit_scale():
+    """Testa a escala inicial que mostra a grade inteira"""
+    assert fit_scale(10, 10) == 40
+    assert fit_scale(1000, 1000) == 1 / 2
+    assert fit_scale(100000, 10) == ZOOM_LEVELS[0]
+
+@pytest.mark.parametrize("rows,cols,expected", [(10, 10, False), (50, 50, False), (51, 50, True),
+                                                (3, 801, True), (801, 1, True), (1, 800, False)])
+def test_image_mode(rows, cols, expected):
+    """Testa que grades grandes ou com um lado maior que o viewport viram imagem"""
+    assert PathFinderGUI.image_mode.fget(SimpleNamespace(rows=rows, cols=cols)) == expected
+
+@pytest.mark.parametrize("scale,top,left", [(4, 0, 0), (3, 5, 7), (1, 2, 1), (1 / 2, 0, 0), (1 / 4, 3, 1)])
+def test_render_viewport_matches_cell_box(palette, terrain, scale, top, left):
+    """Testa se cada célula visível aparece com sua cor no retângulo de cell_box"""
+    image = render_viewport(terrain, palette, top, left, scale, width=50, height=45)
+    assert image.dtype == np.uint8
+    assert image.shape[0] <= 45 and image.shape[1] <= 50
+
+    seen = 0
+    for row in range(terrain.shape[0]):
+        for col in range(terrain.shape[1]):
+            box = cell_box(row, col, top, left, scale)
+            if box is None or box[0] >= image.shape[1] or box[1] >= image.shape[0]:
+                continue
+            x1, y1, x2, y2 = box
+            assert (image[y1:y2, x1:x2] == palette[terrain[row, col]]).all()
+            seen += 1
+    assert seen > 0
+    assert cell_box(top - 1, left, top, left, scale) is None
+
+def test_ppm_image(palette, terrain):
+    """Testa o cabeçalho e o tamanho da imagem PPM"""
+    image = render_viewport(terrain, palette, 0, 0, 2, width=40, height=60)
+    data = ppm_image(image)
+    assert data.startswith(b'P6 40 60 255\n')
+    assert len(data) == len(b'P6 40 60 255\n') + 40 * 60 * 3
@@ -0,0 +1,60 @@
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.heuristics import make_heuristic, movement_scales, HEURISTICS
+from src.stats import SearchStats
+from src.utils import manhattan_distance
+from tests.helpers import random_maze
+
+def test_movement_scales():
+    """Testa os custos mínimos de passo ortogonal e diagonal"""
+    maze = Maze([['S', '1'], ['2', 'E']], {'S': 2.0, 'E': 2.0, '1': 3.0, '2': 4.0})
+    assert movement_scales(maze) == (2.0, 2.8)
+
+def test_octile_expansions_on_open_grid():
+    """Testa quantos nós cada heurística expande em um mapa aberto com diagonais"""
+    n = 20
+    maze = Maze([['S' if (r, c) == (0, 0) else 'E' if (r, c) == (n - 1, n - 1) else '0'
+                  for c in range(n)] for r in range(n)])
+    goal = (6, n - 1)
+    expanded = {}
+    for name in ('manhattan', 'octile', 'euclidean', 'zero'):
+        stats = SearchStats()
+        path = astar(maze, name, stats, goal=goal)
+        assert maze.path_cost(path) == pytest.approx(21.4)  # 6 diagonais + 13 ortogonais
+        expanded[name] = stats.nodes_expanded
+    # A octile é exata em mapa aberto: só expande as células do caminho
+    assert expanded['octile'] == n - 1
+    assert expanded['octile'] <= expanded['manhattan']
+    assert expanded['octile'] < expanded['euclidean'] < expanded['zero']
+
+def test_default_heuristic_is_admissible():
+    """Testa se a heurística padrão nunca superestima em um mapa aberto com diagonais"""
+    maze = Maze([['S', '0', '0', '0'], ['0', '0', '0', '0'], ['0', '0', '0', 'E']])
+    path = astar(maze, heuristic='dijkstra')
+    h = make_heuristic(maze)
+    assert h(0) <= maze.path_cost(path) + 1e-9
+    assert h(0) == pytest.approx(maze.path_cost(path))  # Exata em mapa aberto
+
+@pytest.mark.parametrize('seed', range(20))
+def test_default_heuristic_optimal_paths(seed):
+    """Testa se a heurística padrão produz caminhos de custo ótimo"""
+    maze = random_maze(seed, 12, walls=0.25)
+    reference = astar(maze, heuristic='zero')
+    path = astar(maze)
+    if reference is None:
+        assert path is None
+    else:
+        assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+
+def test_callable_heuristic():
+    """Testa o uso de uma função (posição, objetivo) como heurística"""
+    maze = random_maze(1, 12, walls=0.25)
+    path = astar(maze, heuristic=manhattan_distance)
+    assert path is None or (path[0] == maze.start_pos and path[-1] == maze.end_pos)
+
+def test_unknown_heuristic():
+    """Testa o erro para nomes de heurística desconhecidos"""
+    maze = random_maze(2, 12, walls=0.25)
+    with pytest.raises(ValueError, match="Heurística desconhecida"):
+        astar(maze, heuristic='chebyshev')
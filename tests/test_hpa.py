@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.hpa import HierarchicalPathfinder
+from tests.helpers import assert_valid_path, random_maze
+
+@pytest.mark.parametrize("seed", range(20))
+def test_hpa_finds_valid_paths(seed):
+    """Testa se o HPA* encontra caminhos válidos sempre que o A* encontra"""
+    maze = random_maze(seed, 25, 30)
+    hpa = HierarchicalPathfinder(maze, cluster_size=6)
+    path = hpa.find_path()
+    reference = astar(maze)
+    assert (path is None) == (reference is None)
+    if path is not None:
+        assert_valid_path(maze, path)
+        assert hpa.deviation() >= -1e-9
+
+def test_hpa_deviation_on_open_grid():
+    """Testa se em uma grade sem obstáculos o custo fica próximo do ótimo"""
+    maze = Maze([['S'] + ['0'] * 19] + [['0'] * 20 for _ in range(18)] + [['0'] * 19 + ['E']])
+    small = HierarchicalPathfinder(maze, cluster_size=5).deviation()
+    assert 0.0 <= small < 0.15
+    # Clusters maiores têm entradas longas, com transições nas duas pontas
+    assert 0.0 <= HierarchicalPathfinder(maze, cluster_size=10).deviation() < small
+
+def test_hpa_same_cluster_and_custom_endpoints():
+    """Testa consultas dentro de um único cluster e entre posições arbitrárias"""
+    maze = random_maze(3, 20, walls=0.1)
+    hpa = HierarchicalPathfinder(maze, cluster_size=8)
+    for start, goal in [((1, 1), (2, 3)), ((0, 0), (0, 0)), ((5, 17), (18, 2))]:
+        if not (maze.is_valid_position(start) and maze.is_valid_position(goal)):
+            continue
+        path = hpa.find_path(start, goal)
+        assert (path is None) == (astar(maze, start=start, goal=goal) is None)
+        if path is not None:
+            assert_valid_path(maze, path, start, goal)
+
+def test_hpa_no_path():
+    """Testa o caso em que o objetivo está isolado"""
+    maze = Maze([
+        ['S', '0', '0', '#', '0', '0'],
+        ['0', '0', '0', '#', '0', '0'],
+        ['0', '0', '0', '#', '0', 'E'],
+    ])
+    assert HierarchicalPathfinder(maze, cluster_size=2).find_path() is None
+
+def test_hpa_update_rebuilds_only_affected_clusters():
+    """Testa se alterar células reconstrói apenas os clusters envolvidos"""
+    maze = random_maze(7, 32, walls=0.1)
+    hpa = HierarchicalPathfinder(maze, cluster_size=8)
+
+    # Célula no interior do cluster (1, 1): nenhuma fronteira muda
+    symbol = '0' if maze.maze[12][12] == '#' else '#'
+    assert hpa.update_cells([((12, 12), symbol)]) == {(1, 1)}
+    # Repetir a mesma alteração não muda nada
+    assert hpa.update_cells([((12, 12), symbol)]) == set()
+
+    # Bloqueia toda a fronteira entre os clusters (0, 0) e (0, 1)
+    rebuilt = hpa.update_cells([((row, 7), '#') for row in range(8)])
+    assert (0, 0) in rebuilt and (0, 1) in rebuilt
+    assert (3, 3) not in rebuilt
+
+    path = hpa.find_path()
+    reference = astar(maze)
+    assert (path is None) == (reference is None)
+    if path is not None:
+        assert_valid_path(maze, path)
+        assert all(maze.is_valid_position(pos) for pos in path)
+
+def test_hpa_matches_fresh_build_after_updates():
+    """Testa se após atualizações o resultado é igual ao de um pré-processamento novo"""
+    maze = random_maze(11, 24, walls=0.15)
+    hpa = HierarchicalPathfinder(maze, cluster_size=6)
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        changes = [((int(r), int(c)), str(rng.choice(['0', '2', '#'])))
+                   for r, c in rng.integers(1, 23, size=(6, 2))]
+        hpa.update_cells(changes)
+        fresh = HierarchicalPathfinder(maze, cluster_size=6)
+        assert hpa._graph == fresh._graph
+        assert hpa.find_path() == fresh.find_path()
+
+def test_hpa_update_patches_graph(monkeypatch):
+    """Testa se a atualização troca só as arestas dos clusters afetados"""
+    maze = random_maze(2, 40, walls=0.1)
+    hpa = HierarchicalPathfinder(maze, cluster_size=8)
+    untouched = {node: dict(edges) for node, edges in hpa._graph.items()
+                 if hpa.cluster_of(node)[0] >= 2}
+    monkeypatch.setattr(hpa, '_build_graph', lambda: pytest.fail("grafo reconstruído inteiro"))
+    rebuilt = hpa.update_cells([((row, 3), '#') for row in range(8)] + [((4, 9), '3')])
+    assert rebuilt and all(cluster[0] <= 1 for cluster in rebuilt)
+    for node, edges in untouched.items():
+        assert hpa._graph[node] == edges
+    assert hpa._graph == HierarchicalPathfinder(maze, cluster_size=8)._graph
+
+def test_hpa_invalid_cluster_size():
+    """Testa a validação do tamanho do cluster"""
+    with pytest.raises(ValueError):
+        HierarchicalPathfinder(random_maze(0, 5), cluster_size=1)
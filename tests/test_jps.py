@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.jps import jps, JumpPointSearch
+from src.stats import SearchStats
+from tests.helpers import assert_valid_path, random_maze
+
+@pytest.mark.parametrize('plus', [False, True])
+@pytest.mark.parametrize('seed', range(40))
+def test_jps_matches_astar_cost(seed, plus):
+    """Testa se JPS/JPS+ encontram caminhos de custo ótimo em mapas mistos"""
+    maze = random_maze(seed, 14, walls=[0.0, 0.1, 0.25, 0.35][seed % 4],
+                       symbols='000000123' if seed % 3 else '000000')
+    reference = astar(maze, heuristic='dijkstra')
+    path = JumpPointSearch(maze, plus=plus).find_path()
+    if reference is None:
+        assert path is None
+    else:
+        assert_valid_path(maze, path)
+        assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+
+def test_jps_example_mazes():
+    """Testa JPS nos labirintos das fixtures do A*"""
+    no_solution = Maze([['S', '0', '0'], ['#', '#', '#'], ['0', '0', 'E']])
+    assert jps(no_solution) is None
+    assert jps(no_solution, plus=True) is None
+
+    maze = Maze([
+        ['S', '0', '0', '0', '0'],
+        ['#', '#', '0', '#', '0'],
+        ['0', '0', '0', '0', '0'],
+        ['0', '#', '#', 'E', '0']
+    ])
+    path = jps(maze)
+    assert_valid_path(maze, path)
+    assert maze.path_cost(path) == pytest.approx(maze.path_cost(astar(maze)))
+
+@pytest.mark.parametrize('plus', [False, True])
+def test_jps_open_map_expansions(plus):
+    """Testa se JPS expande muito menos nós que o A* em mapas abertos"""
+    cells = np.full((60, 60), '0')
+    cells[20:40, 30] = '#'
+    cells[3, 2] = 'S'
+    cells[55, 57] = 'E'
+    maze = Maze(cells.tolist())
+
+    astar_stats, jps_stats = SearchStats(), SearchStats()
+    reference = astar(maze, stats=astar_stats)
+    path = jps(maze, plus=plus, stats=jps_stats)
+    assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+    assert jps_stats.nodes_expanded * 10 <= astar_stats.nodes_expanded
+
+@pytest.mark.parametrize('plus', [False, True])
+def test_jps_rejects_positions_outside(plus):
+    """Testa se início e fim fora do labirinto geram erro, como em astar"""
+    maze = random_maze(1, 14, walls=0.0, symbols='000000123')
+    solver = JumpPointSearch(maze, plus=plus)
+    for start, goal in (((-1, -1), None), (None, (0, 14)), ((14, 0), (2, 2))):
+        with pytest.raises(ValueError):
+            solver.find_path(start=start, goal=goal)
+    assert solver.find_path(start=(np.int64(0), np.int64(0)))[0] == (0, 0)
+
+def test_jps_reuses_preprocessing():
+    """Testa se o pré-processamento fica guardado no labirinto"""
+    maze = random_maze(0, 14, symbols='000000123')
+    jps(maze, plus=True)
+    solver = maze.cached('jps+', lambda: None)
+    assert isinstance(solver, JumpPointSearch)
+    assert solver.plus
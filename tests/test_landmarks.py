@@ -0,0 +1,164 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.cli import main
+from src.distance_field import build_distance_field
+from src.dstar_lite import DStarLite
+from src.heuristics import make_heuristic
+from src.landmarks import (
+    distances_from, get_landmarks, landmarks_path, load_landmarks, save_landmarks, select_landmarks
+)
+from src.maze_io import load_binary_maze, load_maze, save_binary_maze
+from src.stats import SearchStats
+from tests.helpers import maze_text, random_maze
+
+def _serpentine(size=21):
+    """Labirinto em serpentina: paredes alternadas com passagem em lados opostos"""
+    cells = [['0'] * size for _ in range(size)]
+    for row in range(1, size - 1, 2):
+        gap = size - 1 if row % 4 == 1 else 0
+        cells[row] = ['#'] * size
+        cells[row][gap] = '1'
+    cells[0][0], cells[-1][0] = 'S', 'E'
+    return cells
+
+def _long_wall(size=30):
+    """Início e fim lado a lado, separados por uma parede com passagem no fundo"""
+    cells = [['0'] * size for _ in range(size)]
+    for row in range(size - 2):
+        cells[row][size // 2] = '#'
+    cells[0][size // 2 - 1], cells[0][size // 2 + 1] = 'S', 'E'
+    return cells
+
+def test_distances_from_matches_distance_field():
+    """Testa o Dijkstra das tabelas contra o campo de distâncias"""
+    maze = random_maze(0, 24, walls=0.3, symbols='00123')
+    expected = build_distance_field(maze, maze.start_pos).distance.ravel()
+    assert np.allclose(distances_from(maze, maze.start_pos), expected)
+
+def test_select_landmarks():
+    """Testa a seleção no maior componente e o formato das tabelas"""
+    maze = random_maze(1, 24, walls=0.3, symbols='00123')
+    landmarks = select_landmarks(maze, 4)
+    largest = set(maze.get_components().largest().tolist())
+    assert len(landmarks) == 4 and len(set(landmarks.positions)) == 4
+    assert all(row * maze.cols + col in largest for row, col in landmarks.positions)
+    assert landmarks.distances.shape == (4, maze.rows * maze.cols)
+    assert landmarks.distances.dtype == np.float32
+    assert landmarks.matches(maze)
+
+    # O segundo landmark é o mais distante do primeiro
+    first = distances_from(maze, landmarks.positions[0])
+    second = landmarks.positions[1]
+    assert first[second[0] * maze.cols + second[1]] == first[first < np.inf].max()
+
+    tiny = Maze([['S', 'E']])
+    assert len(select_landmarks(tiny, 8)) == 2
+    assert len(select_landmarks(Maze([['S', '#'], ['#', 'E']]), 0)) == 0
+
+def test_alt_heuristic_is_admissible_and_consistent():
+    """Testa h <= distância real e |h(u) - h(v)| <= custo da aresta (a menos do float32)"""
+    for seed in range(3):
+        maze = random_maze(seed, 24, walls=0.3, symbols='00123')
+        goal = maze.end_pos
+        h = make_heuristic(maze, 'alt', goal)
+        truth = distances_from(maze, goal)
+        adjacency = maze.get_adjacency()
+        for idx in range(maze.rows * maze.cols):
+            if truth[idx] == np.inf:
+                continue
+            assert h(idx) <= truth[idx] + 1e-9
+            for k in range(adjacency.indptr[idx], adjacency.indptr[idx + 1]):
+                assert abs(h(idx) - h(int(adjacency.indices[k]))) <= adjacency.costs[k] + 1e-4
+
+def test_alt_search_expands_less():
+    """Testa o mesmo custo da octile com menos expansões atrás de uma parede"""
+    maze = Maze(_long_wall())
+    octile_stats, alt_stats = SearchStats(), SearchStats()
+    reference = astar(maze, 'octile', stats=octile_stats)
+    path = astar(maze, 'alt', stats=alt_stats)
+    assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+    assert alt_stats.nodes_expanded < octile_stats.nodes_expanded / 2
+    assert astar(maze, 'alt', queue='heap') is not None
+    assert astar(maze, 'alt', bidirectional=True) is not None
+
+    for seed in range(5):
+        maze = random_maze(seed, 24, walls=0.3, symbols='00123')
+        reference = astar(maze, 'octile')
+        path = astar(maze, 'alt')
+        if reference is None:
+            assert path is None
+        else:
+            assert maze.path_cost(path) == pytest.approx(maze.path_cost(reference))
+
+def test_set_cells_drops_landmarks():
+    """Testa se alterar o labirinto descarta as tabelas"""
+    maze = Maze(_serpentine())
+    landmarks = get_landmarks(maze)
+    assert get_landmarks(maze) is landmarks
+    maze.set_cells([((1, 5), '0')])
+    assert get_landmarks(maze) is not landmarks
+    assert not landmarks.matches(maze)
+    with pytest.raises(ValueError):
+        landmarks.attach(maze)
+
+def test_save_and_load_alongside_maze(tmp_path):
+    """Testa a gravação ao lado do labirinto e a carga automática"""
+    maze = Maze(_serpentine())
+    text_path = tmp_path / 'serpentina.txt'
+    text_path.write_text(maze_text(_serpentine()))
+    binary_path = str(tmp_path / 'serpentina.maze')
+    save_binary_maze(maze, binary_path)
+
+    landmarks = select_landmarks(maze, 3)
+    for path in (str(text_path), binary_path):
+        save_landmarks(landmarks, landmarks_path(path))
+
+    loaded = load_landmarks(landmarks_path(binary_path))
+    assert loaded.positions == landmarks.positions
+    assert isinstance(loaded.distances, np.memmap)
+    assert np.array_equal(loaded.distances, landmarks.distances)
+    assert np.array_equal(loaded.slack, landmarks.slack)
+
+    for reloaded in (load_maze(str(text_path)), load_binary_maze(binary_path), load_maze(binary_path)):
+        attached = get_landmarks(reloaded)
+        assert attached.positions == landmarks.positions
+        assert isinstance(attached.distances, np.memmap)
+        assert astar(reloaded, 'alt') == astar(maze, 'alt')
+
+    # Com outros pesos as tabelas não valem e são recalculadas
+    other = load_maze(str(text_path), {'S': 1.0, 'E': 1.0, '0': 2.0, '1': 2.0})
+    assert not isinstance(get_landmarks(other).distances, np.memmap)
+
+def test_load_landmarks_errors(tmp_path):
+    """Testa arquivos inválidos e tabelas de outro labirinto"""
+    path = tmp_path / 'tabelas.alt'
+    path.write_bytes(b'nada')
+    with pytest.raises(ValueError):
+        load_landmarks(str(path))
+
+    landmarks = select_landmarks(Maze(_serpentine()), 2)
+    save_landmarks(landmarks, str(path))
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+        load_landmarks(str(path))
+
+    save_landmarks(landmarks, str(path))
+    with pytest.raises(ValueError):
+        load_landmarks(str(path), random_maze(0, 24, walls=0.3, symbols='00123'))
+
+def test_dstar_lite_rejects_alt():
+    """Testa se o D* Lite recusa tabelas que não acompanham as alterações"""
+    with pytest.raises(ValueError):
+        DStarLite(Maze(_serpentine()), heuristic='alt')
+
+def test_cli_landmarks(tmp_path, capsys):
+    """Testa o comando que grava as tabelas e a busca com a heurística 'alt'"""
+    path = tmp_path / 'serpentina.txt'
+    path.write_text(maze_text(_serpentine()))
+    assert main(['landmarks', str(path), '--count', '3']) == 0
+    assert '3 landmarks' in capsys.readouterr().out
+    assert len(load_landmarks(landmarks_path(str(path)))) == 3
+    assert main(['solve', str(path), '--heuristic', 'alt']) == 0
+    assert main(['landmarks', str(tmp_path / 'inexistente.txt')]) == 2
@@ -1,5 +1,8 @@
+import math
+import numpy as np
 import pytest
 from src.maze import Maze
+from src.utils import encode_maze
 
 @pytest.fixture
 def valid_maze():
@@ -139,6 +142,11 @@ def test_get_cost_weighted(weighted_maze):
     assert maze.get_cost((0, 0), (1, 1)) == float('inf')  # S -> # (obstáculo)
     assert maze.get_cost((2, 1), (3, 2)) == 5.6  # 3 -> 0 (média: (7 + 1) * 1.4)
 
+    # Custo de um caminho: soma dos passos
+    assert maze.path_cost([(0, 0), (0, 1)]) == 2.0
+    assert maze.path_cost([(1, 0), (2, 0), (2, 1)]) == pytest.approx(3.0 + 4.0)
+    assert maze.path_cost([(0, 0)]) == 0
+
 def test_mark_path(valid_maze):
     """Testa a marcação do caminho no labirinto"""
     maze = Maze(valid_maze)
@@ -156,4 +164,116 @@ def test_str_representation(valid_maze):
     """Testa a representação em string do labirinto"""
     maze = Maze(valid_maze)
     expected = "S 0 #\n0 # 0\n0 0 E"
-    assert str(maze) == expected 
\ No newline at end of file
+    assert str(maze) == expected 
+
+def test_get_adjacency_matches_neighbors(weighted_maze):
+    """Testa se a tabela CSR reproduz get_neighbors e get_cost em todas as células"""
+    maze = Maze(weighted_maze)
+    adjacency = maze.get_adjacency()
+    assert maze.get_adjacency() is adjacency  # Construída uma única vez
+
+    for row in range(maze.rows):
+        for col in range(maze.cols):
+            idx = row * maze.cols + col
+            begin, end = adjacency.indptr[idx], adjacency.indptr[idx + 1]
+            neighbors = [divmod(int(i), maze.cols) for i in adjacency.indices[begin:end]]
+            if not maze.is_valid_position((row, col)):
+                assert neighbors == []
+                continue
+            assert neighbors == maze.get_neighbors((row, col))
+            for neighbor, cost in zip(neighbors, adjacency.costs[begin:end]):
+                assert cost == maze.get_cost((row, col), neighbor)
+
+
+def test_terrain_and_cost_arrays(weighted_maze):
+    """Testa as matrizes de terreno (uint8) e de custo (float32)"""
+    maze = Maze(weighted_maze)
+    assert maze.terrain.dtype == np.uint8
+    assert maze.cost_array.dtype == np.float32
+    assert maze.cost_array[0, 1] == 2.0
+    assert maze.cost_array[1, 1] == np.inf
+    assert maze.maze_array[3, 3] == 'E'
+
+def test_from_terrain(valid_maze):
+    """Testa a criação do labirinto a partir da matriz de códigos, sem cópia"""
+    terrain = encode_maze(valid_maze)
+    maze = Maze.from_terrain(terrain)
+    assert maze.terrain is terrain
+    assert maze.start_pos == (0, 0)
+    assert maze.end_pos == (2, 2)
+    assert maze.maze == valid_maze
+    assert str(maze) == str(Maze(valid_maze))
+
+    with pytest.raises(ValueError):
+        Maze.from_terrain(np.zeros((3, 3), dtype=np.uint8))
+
+def test_from_terrain_copies_on_write(valid_maze):
+    """Testa se set_cells não altera a matriz recebida, a menos que pedido"""
+    terrain = encode_maze(valid_maze)
+    original = terrain.copy()
+    maze = Maze.from_terrain(terrain)
+    maze.set_cells([((0, 1), '#')])
+    assert maze.terrain is not terrain and np.array_equal(terrain, original)
+    assert maze.maze[0][1] == '#'
+
+    terrain.flags.writeable = False
+    maze = Maze.from_terrain(terrain)
+    assert maze.set_cells([((0, 1), '#')]) == [(0, 1)]
+    with pytest.raises(ValueError, match='gravável'):
+        Maze.from_terrain(terrain, write_through=True)
+
+    terrain = encode_maze(valid_maze)
+    maze = Maze.from_terrain(terrain, write_through=True)
+    maze.set_cells([((0, 1), '#')])
+    assert maze.terrain is terrain and terrain[0, 1] == original[1, 1]
+
+def test_set_cells(weighted_maze):
+    """Testa a alteração de células e o descarte das estruturas derivadas"""
+    maze = Maze(weighted_maze)
+    maze.get_adjacency()
+    fingerprint = maze.fingerprint()
+    # (0, 3) já é '0', então só (0, 2) muda
+    assert maze.set_cells([((0, 2), '#'), ((0, 3), '0')]) == [(0, 2)]
+    assert not maze.is_valid_position((0, 2))
+    assert maze.cell_weight((0, 2)) == float('inf')
+    assert maze.cell_weight((0, 1)) == 2.0
+    assert maze.maze[0][2] == '#'
+    assert weighted_maze[0][2] == '0'
+    assert maze.fingerprint() != fingerprint
+    assert (0, 2) not in maze.get_neighbors((0, 1))
+    adjacency = maze.get_adjacency()
+    assert 2 not in adjacency.indices[adjacency.indptr[1]:adjacency.indptr[2]]
+    with pytest.raises(ValueError):
+        maze.set_cells([(maze.start_pos, '#')])
+    with pytest.raises(ValueError):
+        maze.set_cells([((0, 1), 'X')])
+    with pytest.raises(ValueError):
+        maze.set_cells([((4, 0), '0')])
+
+def test_integer_cost_scale(valid_maze):
+    """Testa o fator que torna inteiros os custos de aresta"""
+    assert Maze(valid_maze).integer_cost_scale() == 10  # 1.4 * (1 + 2) / 2 = 2.1
+    weights = {'S': 1.0, 'E': 1.0, '0': 1.5, '#': float('inf')}
+    assert Maze(valid_maze, weights).integer_cost_scale() == 20  # 1.4 * 1.25 = 1.75
+    weights = {'S': 1.0, 'E': 1.0, '0': math.pi, '#': float('inf')}
+    assert Maze(valid_maze, weights).integer_cost_scale() is None
+
+def test_replacing_weights_invalidates_derived_data():
+    """Testa que trocar os pesos descarta a adjacência e os caches antigos"""
+    from src.astar import astar
+    maze = Maze([['S', '0', '0'], ['0', '0', '0'], ['0', '0', 'E']])
+    assert maze.path_cost(astar(maze)) == pytest.approx(2.8)
+    fingerprint = maze.fingerprint()
+    with pytest.raises(TypeError):
+        maze.movement_weights['diagonal'] = 100
+    maze.movement_weights = {'orthogonal': 1, 'diagonal': 100}
+    path = astar(maze)
+    assert len(path) == 5
+    assert maze.path_cost(path) == pytest.approx(4.0)
+    assert maze.fingerprint() != fingerprint
+
+    maze.cell_weights = {'S': 1.0, 'E': 1.0, '0': 3.0, '#': float('inf')}
+    adjacency = maze.get_adjacency()
+    row = slice(adjacency.indptr[0], adjacency.indptr[1])
+    for index, cost in zip(adjacency.indices[row], adjacency.costs[row]):
+        assert maze.get_cost((0, 0), divmod(int(index), maze.cols)) == pytest.approx(cost)
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.maze_io import (
+    BINARY_HEADER_SIZE, load_maze, save_binary_maze, load_binary_maze, convert_text_maze
+)
+
+@pytest.fixture
+def weighted_maze():
+    """Fixture com um labirinto com terrenos de pesos diferentes"""
+    return [
+        ['S', '1', '0', '0'],
+        ['0', '#', '3', '0'],
+        ['2', '0', '#', '0'],
+        ['0', '0', '0', 'E'],
+    ]
+
+def test_binary_round_trip(tmp_path, weighted_maze):
+    """Testa se o labirinto gravado em binário é carregado igual"""
+    path = str(tmp_path / 'maze.maze')
+    weights = dict(Maze(weighted_maze).cell_weights, **{'1': 7.5})
+    del weights['3']
+    original = Maze(weighted_maze, weights)
+    save_binary_maze(original, path)
+    assert (tmp_path / 'maze.maze').stat().st_size == BINARY_HEADER_SIZE + 16
+
+    loaded = load_binary_maze(path)
+    assert isinstance(loaded.terrain, np.memmap)
+    assert np.array_equal(loaded.terrain, original.terrain)
+    assert (loaded.start_pos, loaded.end_pos) == ((0, 0), (3, 3))
+    assert loaded.cell_weights == weights
+    assert loaded.fingerprint() == original.fingerprint()
+    assert astar(loaded) == astar(original)
+
+def test_binary_load_without_validation(tmp_path, weighted_maze):
+    """Testa o carregamento que confia no cabeçalho sem percorrer o terreno"""
+    path = str(tmp_path / 'maze.maze')
+    save_binary_maze(Maze(weighted_maze), path)
+    maze = load_binary_maze(path, validate=False)
+    assert (maze.start_pos, maze.end_pos) == ((0, 0), (3, 3))
+    assert maze.maze == weighted_maze
+
+def test_binary_copy_on_write(tmp_path, weighted_maze):
+    """Testa se alterações no modo padrão não são gravadas no arquivo"""
+    path = str(tmp_path / 'maze.maze')
+    save_binary_maze(Maze(weighted_maze), path)
+    maze = load_binary_maze(path)
+    maze.set_cells([((0, 2), '#')])
+    assert maze.maze[0][2] == '#'
+    assert load_binary_maze(path).maze[0][2] == '0'
+
+    # Somente leitura: a alteração copia o terreno em vez de falhar
+    readonly = load_binary_maze(path, mode='r')
+    readonly.set_cells([((0, 2), '#')])
+    assert readonly.maze[0][2] == '#'
+    assert load_binary_maze(path).maze[0][2] == '0'
+
+    edited = load_binary_maze(path, mode='r+')
+    edited.set_cells([((0, 2), '#')])
+    edited.terrain.flush()
+    assert load_binary_maze(path).maze[0][2] == '#'
+
+def test_binary_invalid_files(tmp_path, weighted_maze):
+    """Testa arquivos que não estão no formato binário"""
+    text = tmp_path / 'maze.txt'
+    text.write_text('\n'.join(' '.join(row) for row in weighted_maze))
+    with pytest.raises(ValueError):
+        load_binary_maze(str(text))
+
+    path = str(tmp_path / 'maze.maze')
+    save_binary_maze(Maze(weighted_maze), path)
+    data = bytearray((tmp_path / 'maze.maze').read_bytes())
+    data[BINARY_HEADER_SIZE] = 0  # Apaga o 'S' indicado no cabeçalho
+    (tmp_path / 'maze.maze').write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        load_binary_maze(path)
+
+def test_convert_text_maze(tmp_path, weighted_maze):
+    """Testa a conversão de um labirinto em texto para binário"""
+    text = tmp_path / 'maze.txt'
+    text.write_text('\n'.join(' '.join(row) for row in weighted_maze) + '\n\n')
+    path = str(tmp_path / 'maze.maze')
+    converted = convert_text_maze(str(text), path)
+    assert converted.maze == weighted_maze
+    assert load_binary_maze(path).maze == weighted_maze
+
+def test_load_maze_text_formats(tmp_path, weighted_maze):
+    """Testa a leitura dos formatos com e sem espaços, de qualquer tamanho"""
+    spaced = tmp_path / 'spaced.txt'
+    spaced.write_text('\n' + '\n'.join('  '.join(row) + ' \r' for row in weighted_maze) + '\n\n')
+    compact = tmp_path / 'compact.txt'
+    compact.write_text('\n'.join(''.join(row) for row in weighted_maze))
+    for path in (spaced, compact):
+        maze = load_maze(str(path))
+        assert maze.terrain.dtype == np.uint8
+        assert maze.maze == weighted_maze
+        assert (maze.start_pos, maze.end_pos) == ((0, 0), (3, 3))
+
+    wide = tmp_path / 'wide.txt'
+    wide.write_text('S' + '0' * 30 + '\n' + '#' * 30 + 'E\n')
+    maze = load_maze(str(wide))
+    assert (maze.rows, maze.cols) == (2, 31)
+    assert maze.end_pos == (1, 30)
+
+def test_load_maze_binary(tmp_path, weighted_maze):
+    """Testa se load_maze reconhece arquivos binários"""
+    path = str(tmp_path / 'maze.maze')
+    save_binary_maze(Maze(weighted_maze), path)
+    assert load_maze(path).maze == weighted_maze
+    assert load_maze(path, {'S': 1.0, 'E': 1.0, '0': 1.0}).cell_weight((0, 1)) == float('inf')
+
+@pytest.mark.parametrize("content,message", [
+    ("", "Labirinto vazio"),
+    ("S 0\n0 0 E\n", "Linha 2 tem 3 células, esperadas 2"),
+    ("S 0 0\n0 X E\n", "linha 2, coluna 3"),
+    ("S0E\n\n0X0\n", "linha 3, coluna 2"),
+    ("S 00 E\n", "linha 1, coluna 3"),
+    ("S 0 S\n0 0 E\n", "linha 1, coluna 5"),
+    ("S 0 0\nE 0 E\n", "linha 2, coluna 5"),
+    ("0 0\n0 E\n", "ponto inicial"),
+    ("S 0\n0 0\n", "ponto final"),
+])
+def test_load_maze_errors(tmp_path, content, message):
+    """Testa se os erros indicam linha e coluna do arquivo"""
+    path = tmp_path / 'invalid.txt'
+    path.write_text(content)
+    with pytest.raises(ValueError, match=message):
+        load_maze(str(path))
@@ -0,0 +1,115 @@
+import pytest
+from src.maze import Maze
+from src.astar import astar
+from src.batch import astar_many
+from src.stats import SearchStats
+from src.solution_cache import MISSING, SolutionCache, solution_key
+
+@pytest.fixture
+def maze_data():
+    """Fixture com um labirinto pequeno com obstáculos e pesos"""
+    return [
+        ['S', '0', '1', '0'],
+        ['0', '#', '2', '0'],
+        ['0', '0', '#', '0'],
+        ['3', '0', '0', 'E'],
+    ]
+
+def test_astar_cache_hits_and_misses(maze_data):
+    """Testa se uma consulta repetida é atendida pelo cache sem nova busca"""
+    cache = SolutionCache()
+    path = astar(Maze(maze_data), cache=cache)
+    assert path == astar(Maze(maze_data))
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Outra instância com o mesmo conteúdo: acerto, sem expandir nós
+    stats = SearchStats()
+    assert astar(Maze(maze_data), stats=stats, cache=cache) == path
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert stats.nodes_expanded == 0
+
+    # Nomear a heurística padrão é a mesma consulta
+    assert astar(Maze(maze_data), heuristic='octile', cache=cache) == path
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # O caminho devolvido é uma cópia
+    path.append((9, 9))
+    assert astar(Maze(maze_data), cache=cache)[-1] == (3, 3)
+
+def test_cache_key_covers_content(maze_data):
+    """Testa se terreno, pesos, movimentos e extremos mudam a chave"""
+    maze = Maze(maze_data)
+    key = solution_key(maze, maze.start_pos, maze.end_pos)
+    assert key == solution_key(Maze(maze_data), (0, 0), (3, 3))
+    assert key != solution_key(maze, (0, 1), (3, 3))
+    assert key != solution_key(maze, maze.start_pos, maze.end_pos, 'zero')
+    assert key == solution_key(maze, maze.start_pos, maze.end_pos, 'octile')
+    assert (solution_key(maze, maze.start_pos, maze.end_pos, 'dijkstra')
+            == solution_key(maze, maze.start_pos, maze.end_pos, 'zero'))
+    assert key != solution_key(maze, maze.start_pos, maze.end_pos, bidirectional=True)
+    assert key == solution_key(maze, maze.start_pos, maze.end_pos, weight=1.0)
+    assert key != solution_key(maze, maze.start_pos, maze.end_pos, weight=1.5)
+
+    changed = [row[:] for row in maze_data]
+    changed[0][1] = '1'
+    assert key != solution_key(Maze(changed), (0, 0), (3, 3))
+
+    weights = dict(maze.cell_weights, **{'1': 5.0})
+    assert key != solution_key(Maze(maze_data, weights), (0, 0), (3, 3))
+
+    diagonal = Maze(maze_data)
+    diagonal.movement_weights = {'orthogonal': 1, 'diagonal': 2}
+    assert key != solution_key(diagonal, (0, 0), (3, 3))
+
+    assert solution_key(maze, (0, 0), (3, 3), lambda pos, goal: 0.0) is None
+
+def test_cache_no_solution(maze_data):
+    """Testa se consultas sem solução também são guardadas"""
+    blocked = [row[:] for row in maze_data]
+    blocked[2][3] = '#'
+    blocked[3][2] = '#'
+    blocked[2][2] = '#'
+    cache = SolutionCache()
+    assert astar(Maze(blocked), cache=cache) is None
+    assert astar(Maze(blocked), cache=cache) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cache_lru_eviction():
+    """Testa a remoção da entrada menos usada quando o limite é atingido"""
+    cache = SolutionCache(max_entries=2)
+    cache.store('a', [(0, 0)])
+    cache.store('b', [(0, 1)])
+    assert cache.lookup('a') == [(0, 0)]  # 'a' passa a ser a mais recente
+    cache.store('c', [(0, 2)])  # Remove 'b'
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.lookup('b') is MISSING
+    assert cache.lookup('c') == [(0, 2)]
+
+def test_cache_sqlite_persistence(tmp_path, maze_data):
+    """Testa se as soluções guardadas no SQLite sobrevivem a um novo cache"""
+    db = str(tmp_path / 'solutions.sqlite')
+    first = SolutionCache(path=db)
+    path = astar(Maze(maze_data), cache=first)
+    first.close()
+
+    second = SolutionCache(max_entries=1, path=db)
+    assert astar(Maze(maze_data), cache=second) == path
+    assert (second.hits, second.disk_hits, second.misses) == (1, 1, 0)
+    # Depois de lido do disco, fica também em memória
+    assert astar(Maze(maze_data), cache=second) == path
+    assert second.disk_hits == 1
+    second.clear()
+    assert second.lookup(solution_key(Maze(maze_data), (0, 0), (3, 3))) is MISSING
+    second.close()
+
+def test_astar_many_uses_cache(maze_data):
+    """Testa se astar_many reaproveita e preenche o cache"""
+    maze = Maze(maze_data)
+    cache = SolutionCache()
+    pairs = [((0, 0), (3, 3)), ((0, 3), (3, 0))]
+    first = astar_many(maze, pairs, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert astar_many(maze, pairs + pairs, cache=cache) == first + first
+    assert cache.hits == 2
+    assert astar(maze, start=(0, 3), goal=(3, 0), cache=cache) == first[1]
@@ -1,5 +1,6 @@
+import numpy as np
 import pytest
-from src.utils import validate_maze, find_points, manhattan_distance
+from src.utils import validate_maze, find_points, manhattan_distance, encode_maze, TERRAIN_CODES
 
 def test_validate_maze_empty():
     """Testa validação de labirinto vazio"""
@@ -79,4 +80,38 @@ def test_manhattan_distance():
     pos1 = (0, 0)
     pos2 = (3, 4)
     distance = manhattan_distance(pos1, pos2)
-    assert distance == 7  # |3-0| + |4-0| = 3 + 4 = 7 
\ No newline at end of file
+    assert distance == 7  # |3-0| + |4-0| = 3 + 4 = 7 
+
+def test_validate_maze_invalid_char_position():
+    """Testa se a mensagem aponta o primeiro caractere inválido, inclusive tokens longos"""
+    maze = [
+        ['S', '0', '1'],
+        ['0', '10', 'X'],
+        ['0', '0', 'E']
+    ]
+    is_valid, error_msg = validate_maze(maze)
+    assert not is_valid
+    assert error_msg == "Caractere inválido '10' na posição (1, 1)"
+
+def test_encode_maze():
+    """Testa a conversão vetorizada para códigos de terreno"""
+    maze = [
+        ['S', '#', '1'],
+        ['2', '3', 'E']
+    ]
+    terrain = encode_maze(maze)
+    assert terrain.dtype == np.uint8
+    assert terrain.shape == (2, 3)
+    assert terrain[0, 0] == TERRAIN_CODES['S']
+    assert terrain[0, 1] == TERRAIN_CODES['#']
+    assert terrain[1, 2] == TERRAIN_CODES['E']
+    with pytest.raises(ValueError, match="ponto final"):
+        encode_maze([['S', '0']])
+
+def test_find_points_terrain_array():
+    """Testa a busca de pontos diretamente na matriz de códigos"""
+    terrain = encode_maze([
+        ['0', '0', 'E'],
+        ['S', '0', '0']
+    ])
+    assert find_points(terrain) == ((1, 0), (0, 2))